@@ -1,12 +1,38 @@
 import abc
 from typing import Any
 
+import instrumentation
+from persistence import run_io
+
 
 class Tool(abc.ABC):
+    def __init_subclass__(cls, **kwargs):
+        # Every tool's invoke (and ainvoke, when overridden) reports to the
+        # instrumentation sinks, if any.
+        super().__init_subclass__(**kwargs)
+        invoke = cls.__dict__.get("invoke")
+        if isinstance(invoke, staticmethod):
+            cls.invoke = staticmethod(instrumentation.instrument(cls, invoke.__func__))
+        ainvoke = cls.__dict__.get("ainvoke")
+        if isinstance(ainvoke, classmethod):
+            cls.ainvoke = classmethod(instrumentation.instrument_async(cls, ainvoke.__func__))
+
     @staticmethod
     def invoke(*args, **kwargs):
         raise NotImplementedError
 
+    @classmethod
+    async def ainvoke(cls, data: Any, *args, **kwargs) -> str:
+        """
+        invoke() for asyncio callers. In-memory calls run on the event loop;
+        tools with long results override this to yield to it while they
+        encode them. File-backed calls (data=None) run on the file I/O
+        thread (persistence.run_io), so the loop never waits on the disk.
+        """
+        if data is None:
+            return await run_io(cls.invoke, None, *args, **kwargs)
+        return cls.invoke(data, *args, **kwargs)
+
     @staticmethod
     def get_info() -> dict[str, Any]:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Throughput and per-worker memory of EpisodeRunner.
+
+A database of about --rows rows per table is generated into a temporary
+directory with seed_stream.py and loaded once as the shared base. For each
+--processes value a runner is started on it and --episodes episodes are
+run, each --calls tool calls drawn from a fixed mix of reads and writes
+(arguments as in tool_latency.py). Reported per run: episodes and calls
+per second, and, from /proc, the parent's resident set and each worker's
+unique (private) and proportional set size after the run. The unique size
+is what a worker costs on top of the shared base.
+
+Usage:
+    python benchmarks/episode_runner.py [--rows 100000] [--processes 1 2 4 8] [--episodes 400] [--calls 20]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tool_latency import Ids, cases, scale_args  # noqa: E402
+
+MIX = (
+    "get_invoice", "get_employee", "get_vendor", "get_payment", "get_audit_entries_for_entity",
+    "update_invoice", "update_payment", "create_invoice", "create_payment", "query_table",
+)
+
+
+def memory_kib(pid: int) -> Dict[str, int]:
+    """Rss, Pss and unique (Private_Clean + Private_Dirty) size of `pid`, in KiB."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {"rss": fields.get("Rss", 0), "pss": fields.get("Pss", 0), "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)}
+
+
+def episodes(ids: Ids, count: int, calls: int) -> List[List[dict]]:
+    args = cases(ids)
+    out = []
+    for e in range(count):
+        episode = []
+        for c in range(calls):
+            tool = MIX[(e + c) % len(MIX)]
+            episode.append({"tool": tool, "args": list(args[tool](e * calls + c))})
+        out.append(episode)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the process-pool episode runner.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--episodes", type=int, default=400)
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--compact", action="store_true", help="load the base as compact records")
+    args = parser.parse_args()
+
+    from episode_runner import EpisodeRunner, load_base
+    from seed_stream import Scale, generate_streaming
+
+    prefixes = {
+        "departments": "dept", "onboarding_requests": "onb", "employees": "emp", "vendors": "vend",
+        "payroll_runs": "prun", "employee_pays": "epay", "orders": "ord", "invoices": "inv",
+        "payments": "pay", "approvals": "app", "disputes": "disp", "offboarding_requests": "off",
+        "audit_logs": "audit",
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        counts = {prefixes[name]: n for name, n, _ in generate_streaming(tmp, Scale(**scale_args(args.rows)))}
+        start = time.perf_counter()
+        base = load_base(tmp, compact=args.compact)
+        print(f"{args.rows} rows per table: base loaded in {time.perf_counter() - start:.1f}s, parent rss {memory_kib(os.getpid())['rss'] / 1024:.0f} MiB")
+    work = episodes(Ids(counts), args.episodes, args.calls)
+
+    for processes in args.processes:
+        with EpisodeRunner(base, processes=processes) as runner:
+            start = time.perf_counter()
+            for _ in runner.run(work, keep=()):
+                pass
+            elapsed = time.perf_counter() - start
+            workers = [memory_kib(p.pid) for p in multiprocessing.active_children()]
+        uss = sum(w["uss"] for w in workers) / max(1, len(workers)) / 1024
+        pss = sum(w["pss"] for w in workers) / max(1, len(workers)) / 1024
+        print(f"{processes:>3} processes: {len(work) / elapsed:>8.1f} episodes/s {len(work) * args.calls / elapsed:>9.0f} calls/s"
+              f"  worker uss {uss:>7.1f} MiB  pss {pss:>7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
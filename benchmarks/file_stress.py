@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Several processes writing the same data/ directory through the file-backed
+tools, to check that no update is lost and to measure write throughput.
+
+A throwaway copy of the repository is made (with a copy of data/) and
+--processes worker processes are started in it with TOOL_STORE_SHARED=1,
+so every FileStore runs in shared mode (per-table locks, write-through).
+Each worker makes --ops calls, alternating between
+
+    create_invoice  amount encodes (worker, call), so every invoice can be
+                    traced back to the call that created it
+    update_payment  sets the field stress_w<worker> of one of --payments
+                    payments to the call number
+
+and reports what it did. Once all workers have exited the parent reloads
+the tables from disk and checks that
+
+    - every invoice a worker created exists once, with its own amount, and
+      no two calls were given the same invoice id
+    - every payment field holds the last call number its worker wrote
+    - audit_log has one entry per successful call
+
+Any mismatch is a lost update; the script exits with status 1. --unshared
+runs the same workload without shared mode, to show the races it prevents.
+
+Usage:
+    python benchmarks/file_stress.py [--processes 8] [--ops 200] [--payments 4] [--unshared]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def run_worker(args: argparse.Namespace) -> None:
+    sys.path.insert(0, ROOT)
+    from interface.create_invoice import CreateInvoice
+    from interface.update_payment import UpdatePayment
+    from persistence import DATA_DIR, FileStore
+
+    worker = args.worker
+    payments = args.payment_ids.split(",")
+    created: Dict[str, int] = {}
+    updated: Dict[str, int] = {}
+    updates = 0
+    errors: List[str] = []
+    start = time.perf_counter()
+    for n in range(args.ops):
+        if n % 2 == 0:
+            out = json.loads(CreateInvoice.invoke(None, {"vendor_id": "vend_001", "amount": worker * 1_000_000 + n + 1}))
+            if out.get("success"):
+                created[out["invoice"]["invoice_id"]] = n
+            else:
+                errors.append(out.get("details") or out.get("error"))
+        else:
+            pay_id = payments[(n // 2) % len(payments)]
+            out = json.loads(UpdatePayment.invoke(None, pay_id, {f"stress_w{worker}": n}))
+            if out.get("success"):
+                updated[pay_id] = n
+                updates += 1
+            else:
+                errors.append(out.get("details") or out.get("error"))
+    FileStore.at(DATA_DIR).commit()
+    json.dump({"worker": worker, "seconds": time.perf_counter() - start, "created": created, "updated": updated, "updates": updates, "errors": errors}, sys.stdout)
+
+
+def check(data_dir: str, reports: List[Dict[str, Any]], audit_before: int) -> List[str]:
+    """Compare the tables on disk with what the workers reported; return the problems found."""
+    sys.path.insert(0, ROOT)
+    from serialization import load_file
+
+    invoices = load_file(os.path.join(data_dir, "invoices.json"))
+    rows = list(invoices.values()) if isinstance(invoices, dict) else invoices
+    payments = load_file(os.path.join(data_dir, "payments.json"))
+    audit_path = os.path.join(data_dir, "audit_log.json")
+    audit = load_file(audit_path) if os.path.exists(audit_path) else []
+
+    problems = []
+    by_id: Dict[str, List[Dict[str, Any]]] = {}
+    for inv in rows:
+        by_id.setdefault(inv["invoice_id"], []).append(inv)
+    claimed: Dict[str, int] = {}
+    for r in reports:
+        for inv_id, n in r["created"].items():
+            if inv_id in claimed:
+                problems.append(f"{inv_id} was returned to workers {claimed[inv_id]} and {r['worker']}")
+            claimed[inv_id] = r["worker"]
+            found = by_id.get(inv_id, [])
+            amount = r["worker"] * 1_000_000 + n + 1
+            if len(found) != 1 or found[0].get("amount") != amount:
+                problems.append(f"{inv_id} of worker {r['worker']} call {n}: found {[i.get('amount') for i in found]}")
+    for inv_id, found in by_id.items():
+        if len(found) > 1:
+            problems.append(f"{inv_id} stored {len(found)} times")
+    for r in reports:
+        for pay_id, n in r["updated"].items():
+            got = payments[pay_id].get(f"stress_w{r['worker']}")
+            if got != n:
+                problems.append(f"{pay_id}.stress_w{r['worker']} is {got}, expected {n}")
+    calls = sum(len(r["created"]) + r["updates"] for r in reports)
+    if len(audit) - audit_before != calls:
+        problems.append(f"audit_log gained {len(audit) - audit_before} entries for {calls} successful calls")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hammer the file-backed tools from several processes.")
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=200, help="calls per process")
+    parser.add_argument("--payments", type=int, default=4, help="payments the update calls spread over")
+    parser.add_argument("--unshared", action="store_true", help="run without shared mode")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--payment-ids", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker is not None:
+        run_worker(args)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workspace = os.path.join(tmp, "repo")
+        shutil.copytree(ROOT, workspace, ignore=shutil.ignore_patterns(".git", "__pycache__", "*.jsonl", "*.snap", ".*.lock"))
+        data_dir = os.path.join(workspace, "data")
+        sys.path.insert(0, ROOT)
+        from serialization import load_file
+
+        audit_path = os.path.join(data_dir, "audit_log.json")
+        audit_before = len(load_file(audit_path)) if os.path.exists(audit_path) else 0
+        payment_ids = sorted(load_file(os.path.join(data_dir, "payments.json")))[: args.payments]
+        env = dict(os.environ, TOOL_STORE_SHARED="0" if args.unshared else "1")
+        cmd = [sys.executable, os.path.join(workspace, "benchmarks", "file_stress.py"), "--ops", str(args.ops), "--payment-ids", ",".join(payment_ids)]
+        start = time.perf_counter()
+        procs = [subprocess.Popen(cmd + ["--worker", str(w)], cwd=workspace, env=env, stdout=subprocess.PIPE) for w in range(args.processes)]
+        reports = []
+        for p in procs:
+            out, _ = p.communicate()
+            if p.returncode != 0:
+                sys.exit(f"worker exited with status {p.returncode}")
+            reports.append(json.loads(out))
+        elapsed = time.perf_counter() - start
+        problems = check(data_dir, reports, audit_before)
+
+    ok = sum(args.ops - len(r["errors"]) for r in reports)
+    errors = sum(len(r["errors"]) for r in reports)
+    print(f"{args.processes} processes x {args.ops} calls ({'unshared' if args.unshared else 'shared'}): "
+          f"{ok} ok, {errors} failed in {elapsed:.2f}s, {ok / elapsed:.0f} calls/s")
+    for r in sorted(reports, key=lambda r: r["worker"]):
+        print(f"  worker {r['worker']:>3}: {args.ops / r['seconds']:>8.0f} calls/s" + (f", first error: {r['errors'][0]}" if r["errors"] else ""))
+    if problems:
+        print(f"{len(problems)} lost or duplicated updates:")
+        for p in problems[:20]:
+            print(f"  {p}")
+        sys.exit(1)
+    print("no lost updates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Memory of the dict-of-dicts layout versus compact records (compact.py).
+
+Each table is grown to N rows by cloning the records of data/<table>.json
+with fresh ids, serialized and parsed back with json.loads so that, as
+with real data files, no strings are shared between rows. The resident
+size of the parsed table and of its compact_table() form is measured with
+tracemalloc.
+
+Usage: python benchmarks/memory.py [rows]
+"""
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from compact import compact_table  # noqa: E402
+from table_store import PRIMARY_KEYS  # noqa: E402
+
+TABLES = ("employees", "invoices", "payments", "audit_logs")
+
+
+def scaled_json(name: str, rows: int) -> str:
+    with open(os.path.join(ROOT, "data", f"{name}.json"), "r", encoding="utf-8") as f:
+        base = list(json.load(f).values())
+    pk = PRIMARY_KEYS[name]
+    table = {}
+    for n in range(rows):
+        rec = dict(base[n % len(base)])
+        rec[pk] = f"{name[:3]}_{n:07d}"
+        table[rec[pk]] = rec
+    return json.dumps(table)
+
+
+def measure(build) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{rows} rows per table; bytes per row")
+    print(f"{'table':<14}{'dicts':>10}{'compact':>10}{'saved':>8}")
+    for name in TABLES:
+        raw = scaled_json(name, rows)
+        plain, plain_size = measure(lambda: json.loads(raw))
+        del plain
+        compact, compact_size = measure(lambda: compact_table(json.loads(raw)))
+        del compact
+        print(f"{name:<14}{plain_size / rows:>10.0f}{compact_size / rows:>10.0f}{1 - compact_size / plain_size:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Encode/decode microbenchmark over the real data/*.json payloads.
+
+For every table, times a tool-style result ({"success": true, "<table>":
+[rows]}) through json.dumps, serialization.dumps in its default
+(json.dumps-compatible) and compact modes, and decoding of the table file
+with json.loads and serialization.loads. orjson is used by the compact
+and decode paths when it is installed.
+
+Usage: python benchmarks/serialization.py [repeat]
+"""
+import glob
+import json
+import os
+import sys
+import timeit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import serialization  # noqa: E402
+
+
+def best(fn, repeat: int) -> float:
+    number = 20
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"backend: {serialization.BACKEND}; best of {repeat}, microseconds per call")
+    print(f"{'table':<22}{'bytes':>9}{'json.dumps':>12}{'default':>10}{'compact':>10}{'json.loads':>12}{'loads':>10}")
+    for path in sorted(glob.glob(os.path.join(ROOT, "data", "*.json"))):
+        name = os.path.basename(path)[:-len(".json")]
+        with open(path, "rb") as f:
+            raw = f.read()
+        table = json.loads(raw)
+        rows = list(table.values()) if isinstance(table, dict) else table
+        result = {"success": True, name: rows}
+        assert serialization.dumps(result) == json.dumps(result)
+        serialization.configure(compact=False)
+        t_json = best(lambda: json.dumps(result), repeat)
+        t_default = best(lambda: serialization.dumps(result), repeat)
+        serialization.configure(compact=True)
+        t_compact = best(lambda: serialization.dumps(result), repeat)
+        serialization.configure(compact=False)
+        t_json_loads = best(lambda: json.loads(raw), repeat)
+        t_loads = best(lambda: serialization.loads(raw), repeat)
+        print(f"{name:<22}{len(raw):>9}{t_json:>12.1f}{t_default:>10.1f}{t_compact:>10.1f}{t_json_loads:>12.1f}{t_loads:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Cold table access with JSON files versus binary snapshots (snapfile.py).
+
+For each size, writes an invoices table of N rows as JSON and as a
+snapshot, then times a fresh LazyDatabase that fetches one record, with
+and without the snapshot present.
+
+Usage: python benchmarks/snapshot_load.py [rows ...]
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from persistence import LazyDatabase  # noqa: E402
+from snapfile import SUFFIX, write_snapshot  # noqa: E402
+
+
+def make_table(rows: int) -> dict:
+    with open(os.path.join(ROOT, "data", "invoices.json"), "r", encoding="utf-8") as f:
+        base = list(json.load(f).values())
+    table = {}
+    for n in range(rows):
+        rec = dict(base[n % len(base)])
+        rec["invoice_id"] = f"inv_{n:07d}"
+        table[rec["invoice_id"]] = rec
+    return table
+
+
+def first_access(data_dir: str, key: str) -> float:
+    start = time.perf_counter()
+    db = LazyDatabase(data_dir)
+    db["invoices"][key]
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    sizes = [int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    print(f"{'rows':>9}{'json ms':>10}{'snap ms':>10}")
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            table = make_table(rows)
+            json_dir = os.path.join(tmp, "json")
+            snap_dir = os.path.join(tmp, "snap")
+            os.makedirs(json_dir)
+            with open(os.path.join(json_dir, "invoices.json"), "w", encoding="utf-8") as f:
+                json.dump(table, f, indent=2)
+            shutil.copytree(json_dir, snap_dir)
+            write_snapshot(os.path.join(snap_dir, "invoices" + SUFFIX), table)
+            key = f"inv_{rows // 2:07d}"
+            print(f"{rows:>9}{first_access(json_dir, key):>10.2f}{first_access(snap_dir, key):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Cold-start cost of importing tools.interface_1..5 with eager and lazy
+__init__ files.
+
+Copies the repository to a temp dir twice, generates eager and lazy
+__init__ files with generate_init.py and times fresh interpreters that
+import all five interfaces and resolve one tool (get_invoice) from each.
+
+Usage: python benchmarks/startup.py [runs]
+"""
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from generate_init import generate_init_file, snake_to_pascal  # noqa: E402
+
+IMPORT_ONLY = "import tools.interface_1, tools.interface_2, tools.interface_3, tools.interface_4, tools.interface_5"
+# Resolve the get_invoice tool of every interface, by its interface-specific name.
+with open(os.path.join(ROOT, "tool_names_map.json"), "r", encoding="utf-8") as f:
+    FIRST_TOOL = IMPORT_ONLY + "".join(
+        f"\ntools.interface_{i}.{snake_to_pascal(name)}" for i, name in enumerate(json.load(f)["get_invoice"], 1)
+    )
+
+
+def make_tree(dest: str, lazy: bool) -> None:
+    shutil.copytree(ROOT, dest, ignore=shutil.ignore_patterns("data", ".git", "__pycache__", "benchmarks"))
+    for i in range(1, 6):
+        generate_init_file(os.path.join(dest, "tools", f"interface_{i}"), lazy=lazy)
+    # Byte-compile once so every run measures imports, not compilation.
+    subprocess.run([sys.executable, "-m", "compileall", "-q", dest], check=True)
+
+
+def time_import(cwd: str, code: str, runs: int) -> float:
+    script = f"import time\nt = time.perf_counter()\n{code}\nprint(time.perf_counter() - t)"
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", script], cwd=cwd, capture_output=True, text=True, check=True)
+        samples.append(float(out.stdout))
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with tempfile.TemporaryDirectory() as tmp:
+        trees = {"eager": os.path.join(tmp, "eager"), "lazy": os.path.join(tmp, "lazy")}
+        for mode, dest in trees.items():
+            make_tree(dest, lazy=mode == "lazy")
+        print(f"median of {runs} cold interpreters, ms")
+        print(f"{'mode':<8}{'import':>10}{'+1 tool':>10}")
+        for mode, dest in trees.items():
+            print(f"{mode:<8}{time_import(dest, IMPORT_ONLY, runs):>10.2f}{time_import(dest, FIRST_TOOL, runs):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
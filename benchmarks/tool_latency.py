@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Latency, allocation and throughput of every tool, at several database sizes.
+
+For each scale a throwaway copy of the repository is made, a database of
+about that many rows per table is generated into its data/ directory with
+seed_stream.py, and a child process running in the copy times every tool
+of interface/ and tools/interface_1..5:
+
+    memory  invoke(data, ...) on the tables loaded as dicts, in one
+            TableStore kept for the run as a harness would
+    plain   the same with a plain dict as data, which every call wraps
+            anew: no index or id sequence outlives a call
+    file    invoke(None, ...) through the file-backed branch (FileStore);
+            the approval tools have no file-backed branch and are skipped
+
+Each tool is called --calls times with arguments that walk over the ids
+of the generated tables (the bulk_create_* tools get BULK records per
+call). The first call is reported separately (cold_ms:
+it includes loading tables in file mode), then p50/p90/p99/max latency,
+throughput, and the peak memory allocated per call measured with
+tracemalloc over a separate --alloc-calls calls. Write tools change the
+tables they are timed on; every tool sees the changes of those run
+before it. A tool whose every call failed is reported with valid: false,
+left out of --compare, and makes the run exit with an error: its timings
+are of the error path.
+
+Results are saved as JSON (--out) with the commit and environment they
+were measured on; --compare BASE.json prints the p50 ratio of every
+(scale, interface, mode, tool) against an earlier result file.
+
+Usage:
+    python benchmarks/tool_latency.py [--scales 1000 100000 1000000] [--interfaces canonical 1 2 3 4 5]
+        [--modes memory plain file] [--tools get_invoice ...] [--calls 200] [--out results.json]
+    python benchmarks/tool_latency.py --compare base.json [--out results.json]
+
+The 1M scale generates about ten million records and needs several GB of
+memory; run it on a load-test machine.
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+SCALES = (1_000, 100_000, 1_000_000)
+INTERFACES = ("canonical", "1", "2", "3", "4", "5")
+MODES = ("memory", "plain", "file")
+# Records per call of the bulk_create_* tools.
+BULK = 50
+# Tools that only work on an in-memory database.
+MEMORY_ONLY = frozenset({"create_approval_request", "get_approval_request", "get_pending_approvals", "submit_approval_decision"})
+
+
+def scale_args(rows: int) -> Dict[str, int]:
+    """seed_stream.Scale arguments for about `rows` rows in each table."""
+    runs = max(20, rows // 1000)
+    return {
+        # Six onboarding requests per employee (and per vendor).
+        "employees": max(1, rows // 6),
+        "vendors": max(1, rows // 6),
+        "payroll_runs": runs,
+        "orders": rows,
+        "max_pays_per_run": max(1, -(-rows // runs)),
+    }
+
+
+class Ids:
+    """Ids of the generated tables, spread over the table by call number."""
+
+    def __init__(self, counts: Dict[str, int]):
+        self.counts = counts
+
+    def __call__(self, prefix: str, n: int) -> str:
+        count = max(1, self.counts[prefix])
+        return f"{prefix}_{1 + (n * 7919) % count:03d}"
+
+
+def cases(ids: Ids) -> Dict[str, Callable[[int], tuple]]:
+    """Arguments (after data) of call n of each canonical tool."""
+    return {
+        "add_audit_logs_entry": lambda n: ({"audit_id": f"bench_{n}", "entity_type": "invoice", "entity_id": ids("inv", n), "action_performed": "updated"},),
+        "bulk_create_employees": lambda n: ([{"name": f"Bench {n}.{i}", "role": "Analyst", "salary": 90000, "tax_id": f"BULK-{n}-{i}", "bank_account_number": f"BB{n:08d}{i:02d}", "bank_routing_number": "100000001", "department_id": "dept_001"} for i in range(BULK)],),
+        "bulk_create_invoices": lambda n: ([{"vendor_id": ids("vend", n + i), "amount": 1000 + i} for i in range(BULK)],),
+        "bulk_create_payments": lambda n: ([{"amount": 100 + i, "method": "bank_transfer"} for i in range(BULK)],),
+        "bulk_create_vendors": lambda n: ([{"name": f"Bench Vendor {n}.{i}", "tax_id": f"BULKV-{n}-{i}", "bank_account_number": f"BV{n:08d}{i:02d}", "bank_routing_number": "100000002"} for i in range(BULK)],),
+        "create_approval_request": lambda n: ({"entity_type": "invoice", "entity_id": ids("inv", n), "approver_id": ids("emp", n), "level": 1},),
+        "create_dispute": lambda n: ({"dispute_type": "invoice", "entity_id": ids("inv", n), "description": "benchmark"},),
+        "create_employee": lambda n: ({"name": f"Bench {n}", "role": "Analyst", "salary": 90000, "tax_id": f"BENCH-{n}", "bank_account_number": f"B{n:010d}", "bank_routing_number": "100000001", "department_id": "dept_001"},),
+        "create_invoice": lambda n: ({"vendor_id": ids("vend", n), "amount": 1000 + n},),
+        "create_offboarding_request": lambda n: ({"employee_id": ids("emp", n), "reason": "benchmark"},),
+        "create_payment": lambda n: ({"amount": 100 + n, "method": "bank_transfer"},),
+        "create_payroll_run": lambda n: ({"payroll_period_start": "2025-01-01", "payroll_period_end": "2025-01-15", "gross_total": 1000},),
+        "create_vendor": lambda n: ({"name": f"Bench Vendor {n}", "tax_id": f"BENCHV-{n}", "bank_account_number": f"V{n:010d}", "bank_routing_number": "100000002"},),
+        "execute_external_payment": lambda n: ({"payment_id": ids("pay", n)},),
+        "generate_employee_pays": lambda n: (ids("prun", n),),
+        "get_approval_request": lambda n: (ids("app", n),),
+        "get_audit_entries_for_entity": lambda n: ("invoice", ids("inv", n)),
+        "get_department": lambda n: (ids("dept", n),),
+        "get_dispute": lambda n: (ids("disp", n),),
+        "get_employee": lambda n: (ids("emp", n),),
+        "get_employee_pay": lambda n: (ids("epay", n),),
+        "get_invoice": lambda n: (ids("inv", n),),
+        "get_offboarding_request": lambda n: (ids("off", n),),
+        "get_onboarding_request": lambda n: (ids("onb", n),),
+        "get_order": lambda n: (ids("ord", n),),
+        "get_payment": lambda n: (ids("pay", n),),
+        "get_payroll_run": lambda n: (ids("prun", n),),
+        "get_pending_approvals": lambda n: (ids("emp", n), 50),
+        "get_vendor": lambda n: (ids("vend", n),),
+        "query_table": lambda n: ("invoices", {"vendor_id": ids("vend", n), "status": "approved"}, None, None, False, 50),
+        "resolve_dispute": lambda n: (ids("disp", n), {"resolution": "benchmark"}),
+        "submit_approval_decision": lambda n: (ids("app", n), "approved", "benchmark", ids("emp", n)),
+        "update_dispute_status": lambda n: (ids("disp", n), "under_review"),
+        "update_employee": lambda n: (ids("emp", n), {"role": f"Analyst {n % 3}"}),
+        "update_employee_pay": lambda n: (ids("epay", n), {"status": "paid"}),
+        "update_invoice": lambda n: (ids("inv", n), {"status": "approved"}),
+        "update_offboarding_request": lambda n: (ids("off", n), {"status": "approved"}),
+        "update_onboarding_request": lambda n: (ids("onb", n), {"status": "approved"}),
+        "update_payment": lambda n: (ids("pay", n), {"status": "completed"}),
+        "update_vendor": lambda n: (ids("vend", n), {"service": f"Service {n % 3}"}),
+    }
+
+
+# --- child process: runs inside the copy, with its data/ generated ------------
+
+def load_tools(interface: str, names_map: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Canonical tool name -> tool class of `interface`."""
+    tools = {}
+    if interface == "canonical":
+        for canon in names_map:
+            module = importlib.import_module(f"interface.{canon}")
+            tools[canon] = getattr(module, "".join(part.title() for part in canon.split("_")))
+        return tools
+    from registry import registry
+
+    for canon in names_map:
+        tools[canon] = registry().tool_class(canon, int(interface))
+    return tools
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def time_tool(invoke: Callable[..., str], data: Optional[dict], args: Callable[[int], tuple], calls: int, alloc_calls: int, first_call: int = 0) -> Dict[str, Any]:
+    """Time calls first_call, first_call + 1, ... of a tool; see cases() for what n selects."""
+    from serialization import failed
+
+    start = time.perf_counter()
+    first = invoke(data, *args(first_call))
+    cold = time.perf_counter() - start
+    errors = int(failed(first))
+    latencies = []
+    total_start = time.perf_counter()
+    for n in range(first_call + 1, first_call + calls + 1):
+        a = args(n)
+        start = time.perf_counter()
+        out = invoke(data, *a)
+        latencies.append(time.perf_counter() - start)
+        if failed(out):
+            errors += 1
+    total = time.perf_counter() - total_start
+    peaks = []
+    tracemalloc.start()
+    for n in range(first_call + calls + 1, first_call + calls + 1 + alloc_calls):
+        a = args(n)
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        invoke(data, *a)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    latencies.sort()
+    return {
+        "calls": calls,
+        "errors": errors,
+        # Every call failed: the timings are of the error path, not of the tool.
+        "valid": errors < calls + 1,
+        "cold_ms": round(cold * 1000, 3),
+        "p50_us": round(percentile(latencies, 0.50) * 1e6, 1),
+        "p90_us": round(percentile(latencies, 0.90) * 1e6, 1),
+        "p99_us": round(percentile(latencies, 0.99) * 1e6, 1),
+        "max_us": round((latencies[-1] if latencies else 0) * 1e6, 1),
+        "ops_per_s": round(calls / total, 1) if total else None,
+        "peak_alloc_kib": round(sum(peaks) / len(peaks) / 1024, 1) if peaks else None,
+    }
+
+
+def run_worker(args: argparse.Namespace) -> None:
+    sys.path.insert(0, ROOT)
+    from persistence import DATA_DIR, FileStore
+    from serialization import load_file
+    from table_store import TableStore
+
+    with open(os.path.join(ROOT, "tool_names_map.json"), "r", encoding="utf-8") as f:
+        names_map = json.load(f)
+    if args.tools:
+        names_map = {k: v for k, v in names_map.items() if k in args.tools}
+    with open(os.path.join(DATA_DIR, "_counts.json"), "r", encoding="utf-8") as f:
+        ids = Ids(json.load(f))
+    calls = cases(ids)
+
+    results = []
+    for mode in args.modes:
+        data = None
+        if mode in ("memory", "plain"):
+            start = time.perf_counter()
+            data = {name[:-5]: load_file(os.path.join(DATA_DIR, name)) for name in sorted(os.listdir(DATA_DIR)) if name.endswith(".json") and not name.startswith("_")}
+            if mode == "memory":
+                data = TableStore(data)
+            results.append({"scale": args.worker, "interface": None, "mode": mode, "tool": "<load>", "cold_ms": round((time.perf_counter() - start) * 1000, 3)})
+        for i, interface in enumerate(args.interfaces):
+            tools = load_tools(interface, names_map)
+            # Each interface runs on the tables the previous ones wrote to; new
+            # call numbers keep created records unique (tax ids, bank accounts).
+            first_call = i * (args.calls + 1 + args.alloc_calls)
+            for canon, cls in tools.items():
+                if mode == "file" and canon in MEMORY_ONLY:
+                    continue
+                stats = time_tool(cls.invoke, data, calls[canon], args.calls, args.alloc_calls, first_call)
+                results.append({"scale": args.worker, "interface": interface, "mode": mode, "tool": canon, **stats})
+                flag = "" if stats["valid"] else "  INVALID: every call failed"
+                print(f"{args.worker:>9} {interface:>9} {mode:>6} {canon:<30} p50 {stats['p50_us']:>10.1f}us  p99 {stats['p99_us']:>10.1f}us  {stats['ops_per_s'] or 0:>10.0f}/s{flag}", file=sys.stderr)
+        if mode == "file":
+            FileStore.at(DATA_DIR).commit()
+    json.dump(results, sys.stdout)
+
+
+# --- parent process -----------------------------------------------------------
+
+def make_workspace(tmp: str, rows: int) -> str:
+    """Copy the repository into `tmp` and generate its data/ at `rows` rows per table."""
+    workspace = os.path.join(tmp, "repo")
+    shutil.copytree(ROOT, workspace, ignore=shutil.ignore_patterns(".git", "data", "__pycache__", "*.jsonl", "*.snap"))
+    data_dir = os.path.join(workspace, "data")
+    sys.path.insert(0, ROOT)
+    from seed_stream import Scale, generate_streaming
+
+    scale = Scale(**scale_args(rows))
+    counts = {}
+    prefixes = {
+        "departments": "dept", "onboarding_requests": "onb", "employees": "emp", "vendors": "vend",
+        "payroll_runs": "prun", "employee_pays": "epay", "orders": "ord", "invoices": "inv",
+        "payments": "pay", "approvals": "app", "disputes": "disp", "offboarding_requests": "off",
+        "audit_logs": "audit",
+    }
+    for name, count, _ in generate_streaming(data_dir, scale):
+        counts[prefixes[name]] = count
+    with open(os.path.join(data_dir, "_counts.json"), "w", encoding="utf-8") as f:
+        json.dump(counts, f)
+    # tools/interface_N resolve their file-backed data directory to tools/data.
+    os.symlink(data_dir, os.path.join(workspace, "tools", "data"))
+    return workspace
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def compare(base_path: str, results: List[Dict[str, Any]]) -> None:
+    with open(base_path, "r", encoding="utf-8") as f:
+        base = json.load(f)
+
+    def key(r: Dict[str, Any]) -> Tuple:
+        return (r["scale"], r["interface"], r["mode"], r["tool"])
+
+    before = {key(r): r for r in base["results"] if "p50_us" in r and r.get("valid", True)}
+    print(f"{'scale':>9} {'interface':>9} {'mode':>6} {'tool':<30}{'base p50':>12}{'p50':>12}{'ratio':>8}")
+    for r in results:
+        old = before.get(key(r))
+        if old is None or "p50_us" not in r or not r["valid"] or not old["p50_us"]:
+            continue
+        ratio = r["p50_us"] / old["p50_us"]
+        flag = "  <-- slower" if ratio > 1.25 else ""
+        print(f"{r['scale']:>9} {r['interface']:>9} {r['mode']:>6} {r['tool']:<30}{old['p50_us']:>12.1f}{r['p50_us']:>12.1f}{ratio:>8.2f}{flag}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark every tool at several database sizes.")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES))
+    parser.add_argument("--interfaces", nargs="+", default=list(INTERFACES), choices=INTERFACES)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--tools", nargs="+")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--alloc-calls", type=int, default=20)
+    parser.add_argument("--out", default="tool_benchmarks.json")
+    parser.add_argument("--compare", metavar="BASE")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker is not None:
+        run_worker(args)
+        return
+
+    results: List[Dict[str, Any]] = []
+    for rows in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            workspace = make_workspace(tmp, rows)
+            print(f"scale {rows}: generated in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+            cmd = [sys.executable, os.path.join(workspace, "benchmarks", "tool_latency.py"), "--worker", str(rows),
+                   "--interfaces", *args.interfaces, "--modes", *args.modes,
+                   "--calls", str(args.calls), "--alloc-calls", str(args.alloc_calls)]
+            if args.tools:
+                cmd += ["--tools", *args.tools]
+            out = subprocess.run(cmd, cwd=workspace, stdout=subprocess.PIPE, check=True)
+            results.extend(json.loads(out.stdout))
+
+    report = {
+        "commit": git_commit(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scales": args.scales,
+        "calls": args.calls,
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {len(results)} results to {args.out}", file=sys.stderr)
+    if args.compare:
+        compare(args.compare, results)
+    invalid = sorted({f"{r['tool']} ({r['mode']})" for r in results if not r.get("valid", True)})
+    if invalid:
+        sys.exit(f"every call failed, timings are invalid: {', '.join(invalid)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Compile data/*.json into binary <table>.snap snapshots (see snapfile.py).
+
+LazyDatabase memory-maps a snapshot instead of parsing the JSON file as
+long as the snapshot is at least as new; rerun this after regenerating
+the data with seed_data.py.
+
+Usage: python build_snapshots.py [data_dir] [out_dir]
+"""
+import glob
+import os
+import sys
+import time
+
+from serialization import load_file
+from snapfile import SUFFIX, write_snapshot
+
+
+def build_snapshots(data_dir: str, out_dir: str) -> None:
+    os.makedirs(out_dir, exist_ok=True)
+    for path in sorted(glob.glob(os.path.join(data_dir, "*.json"))):
+        name = os.path.basename(path)[:-len(".json")]
+        rows = load_file(path)
+        if not isinstance(rows, (dict, list)):
+            print(f"Skipping {path}: not a table")
+            continue
+        start = time.perf_counter()
+        out = os.path.join(out_dir, name + SUFFIX)
+        write_snapshot(out, rows)
+        print(f"{name}: {len(rows)} records -> {out} ({os.path.getsize(out)} bytes, {time.perf_counter() - start:.3f}s)")
+
+
+if __name__ == "__main__":
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+    out_dir = sys.argv[2] if len(sys.argv) > 2 else data_dir
+    build_snapshots(data_dir, out_dir)
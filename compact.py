@@ -0,0 +1,196 @@
+"""
+Memory-compact records for large tables.
+
+compact_table() replaces the dict records of a table with instances of a
+per-schema __slots__ class (see record_class). Field names live once on
+the class instead of in every row, and the values of INTERNED_FIELDS are
+interned so rows that share a status or a foreign key share one string.
+The records are MutableMappings and keep dict semantics, including key
+order, so the tools, Table and the serialization layer work on them
+unchanged.
+"""
+import sys
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# Enum-like and low-cardinality fields whose string values are interned.
+INTERNED_FIELDS = frozenset({
+    "action_performed", "approver_id", "created_at", "decision", "department_id",
+    "dispute_type", "employee_id", "entity_type", "method", "order_type",
+    "payroll_run_id", "performed_by", "raised_by", "requested_by", "role",
+    "service", "status", "updated_at", "vendor_id",
+})
+
+_classes: Dict[Tuple[str, ...], type] = {}
+
+
+class CompactRecord(MutableMapping):
+    """
+    Base of the generated record classes.
+
+    Every schema field has a slot; a field that is absent from the record
+    leaves its slot unset. Keys outside the schema, and schema keys set
+    after construction while their slot is unset, go to an overflow dict
+    so iteration order always matches what a dict would have.
+    """
+
+    __slots__ = ("_extra",)
+    _fields: Tuple[str, ...] = ()
+    _slots: Dict[str, Any] = {}
+
+    def __init__(self, items: Any = ()):
+        slots = self._slots
+        for key, value in (items.items() if isinstance(items, Mapping) else items):
+            if type(value) is str and key in INTERNED_FIELDS:
+                value = sys.intern(value)
+            slot = slots.get(key)
+            if slot is None:
+                self._set_extra(key, value)
+            else:
+                slot.__set__(self, value)
+
+    def _set_extra(self, key: str, value: Any) -> None:
+        try:
+            self._extra[key] = value
+        except AttributeError:
+            self._extra = {key: value}
+
+    def __getitem__(self, key: str) -> Any:
+        slot = self._slots.get(key)
+        if slot is not None:
+            try:
+                return slot.__get__(self)
+            except AttributeError:
+                pass
+        try:
+            return self._extra[key]
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        slot = self._slots.get(key)
+        if slot is not None:
+            try:
+                return slot.__get__(self)
+            except AttributeError:
+                pass
+        try:
+            return self._extra.get(key, default)
+        except AttributeError:
+            return default
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if type(value) is str and key in INTERNED_FIELDS:
+            value = sys.intern(value)
+        slot = self._slots.get(key)
+        if slot is not None:
+            try:
+                slot.__get__(self)
+            except AttributeError:
+                pass
+            else:
+                slot.__set__(self, value)
+                return
+        self._set_extra(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        slot = self._slots.get(key)
+        if slot is not None:
+            try:
+                slot.__delete__(self)
+                return
+            except AttributeError:
+                pass
+        try:
+            del self._extra[key]
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._fields:
+            try:
+                self._slots[key].__get__(self)
+            except AttributeError:
+                continue
+            yield key
+        try:
+            yield from self._extra
+        except AttributeError:
+            pass
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        sentinel = object()
+        return self.get(key, sentinel) is not sentinel  # type: ignore[arg-type]
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def __reduce__(self):
+        return _restore, (self._fields, dict(self))
+
+
+def record_class(fields: Tuple[str, ...]) -> type:
+    """Return the (cached) CompactRecord subclass with one slot per field."""
+    cls = _classes.get(fields)
+    if cls is None:
+        slot_names = tuple(f"_{i}" for i in range(len(fields)))
+        cls = type("Record", (CompactRecord,), {"__slots__": slot_names, "_fields": fields})
+        cls._slots = {field: cls.__dict__[name] for field, name in zip(fields, slot_names)}
+        _classes[fields] = cls
+    return cls
+
+
+def _restore(fields: Tuple[str, ...], items: Dict[str, Any]) -> MutableMapping:
+    return to_record(items, record_class(fields))
+
+
+def _in_order(keys: Any, fields: Tuple[str, ...]) -> bool:
+    """True when `keys` is a subsequence of `fields`."""
+    it = iter(fields)
+    return all(key in it for key in keys)
+
+
+def to_record(rec: Mapping, cls: type) -> MutableMapping:
+    """Convert one record; records whose key order the schema cannot keep stay dicts."""
+    if isinstance(rec, CompactRecord) or not _in_order(rec, cls._fields):
+        return rec  # type: ignore[return-value]
+    return cls(rec)
+
+
+def compact_table(rows: Any, fields: Optional[Tuple[str, ...]] = None) -> Any:
+    """
+    Return `rows` (a dict keyed by id or a list) with its records converted
+    to compact records of one schema: `fields`, or the keys of the first
+    record followed by any key first seen on a later one.
+    """
+    records = rows.values() if isinstance(rows, dict) else rows
+    if fields is None:
+        seen: Dict[str, None] = {}
+        for rec in records:
+            seen.update(dict.fromkeys(rec))
+        fields = tuple(seen)
+    cls = record_class(fields)
+    if isinstance(rows, dict):
+        return {key: to_record(rec, cls) for key, rec in rows.items()}
+    return [to_record(rec, cls) for rec in rows]
+
+
+def record_converter(sample: Mapping) -> Callable[[Mapping], MutableMapping]:
+    """
+    to_record() over the schema of `sample`, for tables whose records are
+    decoded one at a time (snapshot files) and cannot be scanned up front.
+    """
+    cls = record_class(tuple(sample))
+    return lambda rec: to_record(rec, cls)
+
+
+def compact_database(data: MutableMapping, tables: Optional[Any] = None) -> MutableMapping:
+    """Compact `tables` (default: every table) of `data` in place and return it."""
+    for name in list(tables if tables is not None else data):
+        rows = data.get(name)
+        if isinstance(rows, (dict, list)):
+            data[name] = compact_table(rows)
+    return data
@@ -0,0 +1,128 @@
+"""
+Process pool that runs episodes against one shared, read-only base database.
+
+The parent loads the base tables once, builds their declared indexes and
+forks the workers, so every worker reads the same copy-on-write pages
+instead of loading data/ again. An episode is a list of tool calls in the
+execute_batch format ({"tool", "args", "kwargs"}); each one runs in a
+worker on a fresh Snapshot of the base, so its writes go to a private
+overlay that is dropped when the episode ends. Per-worker memory then
+follows the overlays and whatever the tools touch, not the dataset:
+
+    with EpisodeRunner(processes=8) as runner:
+        for results in runner.run(episodes):
+            ...
+
+gc.freeze() is called before forking so that the garbage collector of a
+worker never writes to the base objects; reference counting still copies
+the pages of records a worker reads. Where fork is not available, each
+worker loads its own copy of the base instead.
+"""
+import gc
+import multiprocessing
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from persistence import DATA_DIR, LazyDatabase
+from registry import registry
+from snapshot import Snapshot
+from table_store import PRIMARY_KEYS, TableStore
+
+Episode = Sequence[Dict[str, Any]]
+
+# Base database and interface of the worker processes.
+_base: Optional[TableStore] = None
+_interface = 1
+
+
+def load_base(data_dir: str = DATA_DIR, compact: bool = False) -> TableStore:
+    """
+    Read every table of `data_dir` and build its declared indexes. Only
+    the table files are read (see LazyDatabase): commit a FileStore on
+    the directory first.
+    """
+    lazy = LazyDatabase(data_dir, compact=compact)
+    base = TableStore({name: lazy[name] for name in lazy})
+    for name in base:
+        if name in PRIMARY_KEYS:
+            base.table(name).build_indexes()
+    return base
+
+
+def _init_worker(data_dir: str, compact: bool, interface: int) -> None:
+    global _base, _interface
+    if _base is None:
+        _base = load_base(data_dir, compact)
+    _interface = interface
+
+
+def run_episode(calls: Episode, keep: Optional[Iterable[int]] = None) -> List[Optional[str]]:
+    """Run one episode on a fresh overlay of the worker's base database."""
+    return registry().execute_batch(list(calls), _interface, Snapshot(_base), keep)
+
+
+def _run_job(job: tuple) -> List[Optional[str]]:
+    return run_episode(*job)
+
+
+class EpisodeRunner:
+    """
+    Pool of worker processes sharing a read-only base database.
+
+    `base` is a TableStore (or plain data dict) to share; by default the
+    tables of `data_dir` are loaded, as compact records with compact=True.
+    run() and map() return the results of every call of each episode, as
+    execute_batch does; `keep` limits which calls' results are encoded.
+    """
+
+    def __init__(
+        self,
+        base: Optional[Any] = None,
+        data_dir: str = DATA_DIR,
+        processes: Optional[int] = None,
+        interface: int = 1,
+        compact: bool = False,
+    ):
+        global _base, _interface
+        self.processes = processes or os.cpu_count() or 1
+        self.interface = interface
+        if "fork" in multiprocessing.get_all_start_methods():
+            ctx = multiprocessing.get_context("fork")
+            if base is None:
+                base = load_base(data_dir, compact)
+            elif not isinstance(base, TableStore):
+                base = TableStore(base)
+            _base, _interface = base, interface
+            # Import the tools before forking so the workers share them too.
+            registry().dispatch(interface)
+            gc.collect()
+            gc.freeze()
+            try:
+                self._pool = ctx.Pool(self.processes)
+            finally:
+                gc.unfreeze()
+        else:
+            if base is not None:
+                raise RuntimeError("sharing an in-memory base needs the fork start method; pass data_dir instead")
+            self._pool = multiprocessing.get_context("spawn").Pool(
+                self.processes, initializer=_init_worker, initargs=(data_dir, compact, interface)
+            )
+        self.base = _base
+
+    def run(self, episodes: Iterable[Episode], keep: Optional[Iterable[int]] = None, chunksize: int = 1) -> Iterator[List[Optional[str]]]:
+        """Yield the results of each episode, in order, as the workers finish them."""
+        keep = None if keep is None else list(keep)
+        return self._pool.imap(_run_job, ((list(calls), keep) for calls in episodes), chunksize)
+
+    def map(self, episodes: Iterable[Episode], keep: Optional[Iterable[int]] = None, chunksize: int = 1) -> List[List[Optional[str]]]:
+        return list(self.run(episodes, keep, chunksize))
+
+    def close(self) -> None:
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self) -> "EpisodeRunner":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
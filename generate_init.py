@@ -6,10 +6,43 @@ def snake_to_pascal(name: str) -> str:
     """Converts snake_case to PascalCase."""
     return "".join(word.capitalize() for word in name.split('_'))
 
-def generate_init_file(directory_path: str):
+def render_lazy_init(tools_list, list_name: str) -> str:
+    """
+    Renders an __init__.py that imports a tool module only when its class
+    is first accessed (PEP 562 module __getattr__). Accessing the tools
+    list imports every module, as the eager __init__ does.
+    """
+    lines = ["import importlib", "", "_TOOLS = {"]
+    lines += [f'    "{class_name}": "{module_name}",' for module_name, class_name in tools_list]
+    lines += [
+        "}",
+        "",
+        f'__all__ = list(_TOOLS) + ["{list_name}"]',
+        "",
+        "",
+        "def __getattr__(name):",
+        "    module = _TOOLS.get(name)",
+        "    if module is not None:",
+        "        value = getattr(importlib.import_module(f\".{module}\", __name__), name)",
+        f'    elif name == "{list_name}":',
+        "        value = [__getattr__(class_name) for class_name in _TOOLS]",
+        "    else:",
+        "        raise AttributeError(f\"module {__name__!r} has no attribute {name!r}\")",
+        "    globals()[name] = value",
+        "    return value",
+        "",
+        "",
+        "def __dir__():",
+        "    return __all__",
+        "",
+    ]
+    return "\n".join(lines)
+
+def generate_init_file(directory_path: str, lazy: bool = False):
     """
     Traverses a directory to find Python files, extracts class names,
     and generates an __init__.py file with the correct imports and list.
+    With lazy=True the tool modules are imported on first access instead.
     """
     if not os.path.isdir(directory_path):
         print(f"Error: Directory not found at '{directory_path}'")
@@ -39,11 +72,14 @@ def generate_init_file(directory_path: str):
     else:
         list_name = "ALL_TOOLS"
 
-    init_content = "\n".join(imports)
-    init_content += "\n\n"
-    init_content += f"{list_name} = [\n"
-    init_content += ",\n".join(f"    {class_name}" for class_name in class_names)
-    init_content += "\n]\n"
+    if lazy:
+        init_content = render_lazy_init(tools_list, list_name)
+    else:
+        init_content = "\n".join(imports)
+        init_content += "\n\n"
+        init_content += f"{list_name} = [\n"
+        init_content += ",\n".join(f"    {class_name}" for class_name in class_names)
+        init_content += "\n]\n"
     
     # Write to __init__.py in the specified directory
     init_file_path = os.path.join(directory_path, '__init__.py')
@@ -56,9 +92,13 @@ def generate_init_file(directory_path: str):
         sys.exit(1)
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python generate_init.py <directory_path>")
+    args = sys.argv[1:]
+    lazy = "--lazy" in args
+    if lazy:
+        args.remove("--lazy")
+    if len(args) < 1:
+        print("Usage: python generate_init.py [--lazy] <directory_path>")
         sys.exit(1)
     
-    target_directory = sys.argv[1]
-    generate_init_file(target_directory)
\ No newline at end of file
+    target_directory = args[0]
+    generate_init_file(target_directory, lazy=lazy)
\ No newline at end of file
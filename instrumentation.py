@@ -0,0 +1,377 @@
+"""
+Per-call instrumentation of tool invocations.
+
+Every Tool subclass's invoke, and its ainvoke if it defines one, is
+wrapped (see base.Tool). While no sink is
+registered the wrapper only forwards the call. Once a sink is added with
+add_sink(), each call is measured into a CallStats, handed to every sink
+when the call returns:
+
+    tool            name from the tool's get_info()
+    seconds         wall time of invoke
+    input_size      length of the JSON encoding of the arguments after `data`
+    output_size     length of the returned JSON string
+    rows_scanned    records examined by Table lookups, index builds and scans
+    tables_read     tables looked up or scanned
+    tables_written  tables inserted into or updated
+    error           True when the call raised or returned "success": false
+
+Sinks: MemorySink (per-tool counters), PrometheusSink (text exposition
+format, optionally served over HTTP) and JsonlSink (one line per call).
+Setting TOOL_METRICS_JSONL=<path> registers a JsonlSink at import.
+"""
+import atexit
+import functools
+import os
+import threading
+import time
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from serialization import encode_compact, failed
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+_active: ContextVar[Optional["CallStats"]] = ContextVar("tool_call_stats", default=None)
+_sinks: List["Sink"] = []
+_names: Dict[type, str] = {}
+
+
+class CallStats:
+    """Measurements of one tool call."""
+
+    __slots__ = ("tool", "started", "seconds", "input_size", "output_size", "rows_scanned", "tables_read", "tables_written", "error")
+
+    def __init__(self, tool: str):
+        self.tool = tool
+        self.started = time.time()
+        self.seconds = 0.0
+        self.input_size: Optional[int] = None
+        self.output_size: Optional[int] = None
+        self.rows_scanned = 0
+        self.tables_read: Set[str] = set()
+        self.tables_written: Set[str] = set()
+        self.error = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tool": self.tool,
+            "started": self.started,
+            "seconds": self.seconds,
+            "input_size": self.input_size,
+            "output_size": self.output_size,
+            "rows_scanned": self.rows_scanned,
+            "tables_read": sorted(self.tables_read),
+            "tables_written": sorted(self.tables_written),
+            "error": self.error,
+        }
+
+
+def scanned(table: str, rows: int) -> None:
+    """Record that `rows` records of `table` were examined by the current call."""
+    stats = _active.get()
+    if stats is not None:
+        stats.tables_read.add(table)
+        stats.rows_scanned += rows
+
+
+def written(table: str) -> None:
+    stats = _active.get()
+    if stats is not None:
+        stats.tables_written.add(table)
+
+
+class Sink:
+    """Receives the CallStats of every instrumented call."""
+
+    def record(self, stats: CallStats) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+def add_sink(sink: Sink) -> Sink:
+    if sink not in _sinks:
+        _sinks.append(sink)
+    return sink
+
+
+def remove_sink(sink: Sink) -> None:
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+
+def sinks() -> List[Sink]:
+    return list(_sinks)
+
+
+def tool_name(cls: type) -> str:
+    name = _names.get(cls)
+    if name is None:
+        try:
+            name = cls.get_info()["function"]["name"]
+        except Exception:
+            name = cls.__name__
+        _names[cls] = name
+    return name
+
+
+def _start(cls: type, args: tuple, kwargs: Dict[str, Any]) -> CallStats:
+    """Stats of a call of `cls` with `args` (data first) and `kwargs`."""
+    stats = CallStats(tool_name(cls))
+    kwargs_in = {k: v for k, v in kwargs.items() if k != "data"}
+    try:
+        stats.input_size = len(encode_compact([list(args[1:]), kwargs_in]))
+    except TypeError:
+        pass
+    return stats
+
+
+def _finish(stats: CallStats, result: Any) -> Any:
+    stats.error = failed(result)
+    if isinstance(result, str):
+        stats.output_size = len(result)
+    return result
+
+
+def instrument(cls: type, invoke: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap the invoke function of tool class `cls`. A call made while another
+    one is being measured (ainvoke running invoke) is not measured again.
+    """
+
+    @functools.wraps(invoke)
+    def wrapper(*args, **kwargs):
+        if not _sinks or _active.get() is not None:
+            return invoke(*args, **kwargs)
+        stats = _start(cls, args, kwargs)
+        token = _active.set(stats)
+        start = time.perf_counter()
+        try:
+            return _finish(stats, invoke(*args, **kwargs))
+        except BaseException:
+            stats.error = True
+            raise
+        finally:
+            stats.seconds = time.perf_counter() - start
+            _active.reset(token)
+            for sink in list(_sinks):
+                sink.record(stats)
+
+    wrapper.__wrapped_invoke__ = invoke  # type: ignore[attr-defined]
+    return wrapper
+
+
+def instrument_async(cls: type, ainvoke: Callable[..., Any]) -> Callable[..., Any]:
+    """instrument() for the coroutine function ainvoke of tool class `cls`."""
+
+    @functools.wraps(ainvoke)
+    async def wrapper(*args, **kwargs):
+        if not _sinks or _active.get() is not None:
+            return await ainvoke(*args, **kwargs)
+        stats = _start(cls, args[1:], kwargs)  # args[0] is the class
+        token = _active.set(stats)
+        start = time.perf_counter()
+        try:
+            return _finish(stats, await ainvoke(*args, **kwargs))
+        except BaseException:
+            stats.error = True
+            raise
+        finally:
+            stats.seconds = time.perf_counter() - start
+            _active.reset(token)
+            for sink in list(_sinks):
+                sink.record(stats)
+
+    return wrapper
+
+
+class _Totals:
+    __slots__ = ("calls", "errors", "seconds", "max_seconds", "input_size", "output_size", "rows_scanned", "buckets", "reads", "writes")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.input_size = 0
+        self.output_size = 0
+        self.rows_scanned = 0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.reads: Dict[str, int] = {}
+        self.writes: Dict[str, int] = {}
+
+    def add(self, stats: CallStats) -> None:
+        self.calls += 1
+        self.errors += stats.error
+        self.seconds += stats.seconds
+        self.max_seconds = max(self.max_seconds, stats.seconds)
+        self.input_size += stats.input_size or 0
+        self.output_size += stats.output_size or 0
+        self.rows_scanned += stats.rows_scanned
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if stats.seconds <= bound:
+                self.buckets[i] += 1
+                break
+        for table in stats.tables_read:
+            self.reads[table] = self.reads.get(table, 0) + 1
+        for table in stats.tables_written:
+            self.writes[table] = self.writes.get(table, 0) + 1
+
+
+class MemorySink(Sink):
+    """In-memory counters per tool; snapshot() returns them as plain dicts."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tools: Dict[str, _Totals] = {}
+
+    def record(self, stats: CallStats) -> None:
+        with self._lock:
+            totals = self._tools.get(stats.tool)
+            if totals is None:
+                totals = self._tools[stats.tool] = _Totals()
+            totals.add(stats)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                tool: {
+                    "calls": t.calls,
+                    "errors": t.errors,
+                    "seconds": t.seconds,
+                    "mean_seconds": t.seconds / t.calls if t.calls else 0.0,
+                    "max_seconds": t.max_seconds,
+                    "input_size": t.input_size,
+                    "output_size": t.output_size,
+                    "rows_scanned": t.rows_scanned,
+                    "tables_read": dict(t.reads),
+                    "tables_written": dict(t.writes),
+                }
+                for tool, t in self._tools.items()
+            }
+
+    def totals(self) -> List[Tuple[str, _Totals]]:
+        with self._lock:
+            return list(self._tools.items())
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tools.clear()
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class PrometheusSink(MemorySink):
+    """
+    MemorySink rendered in the Prometheus text exposition format. render()
+    returns the metrics page; serve(port) exposes it at /metrics from a
+    daemon thread.
+    """
+
+    def __init__(self, prefix: str = "tool"):
+        super().__init__()
+        self.prefix = prefix
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def render(self) -> str:
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_call_seconds Wall time of tool invocations.",
+            f"# TYPE {p}_call_seconds histogram",
+        ]
+        totals = self.totals()
+        for tool, t in totals:
+            label = f'tool="{_label(tool)}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, t.buckets):
+                cumulative += count
+                lines.append(f'{p}_call_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{p}_call_seconds_bucket{{{label},le="+Inf"}} {t.calls}')
+            lines.append(f"{p}_call_seconds_sum{{{label}}} {t.seconds}")
+            lines.append(f"{p}_call_seconds_count{{{label}}} {t.calls}")
+        for metric, help_text, attr in (
+            ("errors_total", "Tool calls that raised or returned success false.", "errors"),
+            ("input_size_total", "JSON length of tool arguments.", "input_size"),
+            ("output_size_total", "JSON length of tool results.", "output_size"),
+            ("rows_scanned_total", "Records examined by tool calls.", "rows_scanned"),
+        ):
+            lines.append(f"# HELP {p}_{metric} {help_text}")
+            lines.append(f"# TYPE {p}_{metric} counter")
+            for tool, t in totals:
+                lines.append(f'{p}_{metric}{{tool="{_label(tool)}"}} {getattr(t, attr)}')
+        for metric, help_text, attr in (
+            ("table_reads_total", "Tool calls that read a table.", "reads"),
+            ("table_writes_total", "Tool calls that wrote a table.", "writes"),
+        ):
+            lines.append(f"# HELP {p}_{metric} {help_text}")
+            lines.append(f"# TYPE {p}_{metric} counter")
+            for tool, t in totals:
+                for table, count in sorted(getattr(t, attr).items()):
+                    lines.append(f'{p}_{metric}{{tool="{_label(tool)}",table="{_label(table)}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve render() at http://host:port/metrics until close()."""
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = sink.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class JsonlSink(Sink):
+    """Appends CallStats.to_dict() of every call to `path`, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+        atexit.register(self.close)
+
+    def record(self, stats: CallStats) -> None:
+        line = encode_compact(stats.to_dict()) + "\n"
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+if os.environ.get("TOOL_METRICS_JSONL"):
+    add_sink(JsonlSink(os.environ["TOOL_METRICS_JSONL"]))
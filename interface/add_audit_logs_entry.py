@@ -1,7 +1,9 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
 
 
 class AddAuditLogsEntry(Tool):
@@ -31,36 +33,24 @@ class AddAuditLogsEntry(Tool):
         }
 
         if db is not None:
-            db.setdefault("audit_logs", {})[audit_id] = entry
+            TableStore.of(db).table("audit_logs", create=dict).insert(entry)
             return {"success": True, "audit_entry": entry}
 
         workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
         data_dir = os.path.join(workspace_root, "data")
-        path = os.path.join(data_dir, "audit_logs.json")
 
-        try:
-            if os.path.exists(path):
-                with open(path, "r", encoding="utf-8") as f:
-                    raw = json.load(f)
-            else:
-                raw = {}
-        except Exception as e:
-            return {"success": False, "error": "read_error", "details": str(e)}
+        store = FileStore.at(data_dir)
+        with store.transaction():
+            try:
+                audits = store.table("audit_logs", create=dict)
+            except Exception as e:
+                return {"success": False, "error": "read_error", "details": str(e)}
 
-        if isinstance(raw, dict):
-            table = raw
-        else:
-            table = {}
-
-        table[audit_id] = entry
-        try:
-            tmp = path + ".tmp"
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(table, f, indent=2)
-            os.replace(tmp, path)
-        except Exception as e:
-            return {"success": False, "error": "write_error", "details": str(e)}
+            try:
+                audits.insert(entry)
+            except Exception as e:
+                store.abort()
+                return {"success": False, "error": "write_error", "details": str(e)}
 
         return {"success": True, "audit_entry": entry}
 
@@ -77,8 +67,8 @@ class AddAuditLogsEntry(Tool):
                 payload = entry
             res = AddAuditLogsEntry._invoke_internal(payload, db=data)
         except Exception as e:
-            return json.dumps({"success": False, "error": "internal_error", "details": str(e)})
-        return json.dumps(res)
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
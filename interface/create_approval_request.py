@@ -1,32 +1,25 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from datetime import datetime, timezone
 from base import Tool
+from serialization import dumps
+from table_store import TableStore
 
 
 
-class CreateApprovalRequest:
+class CreateApprovalRequest(Tool):
     @staticmethod
     def invoke(data: Dict[str, Any], data_record: Dict[str, Any]) -> str:
         """
         Creates a new approval request record.
         """
-        approvals = data.get("approvals", {})
+        approvals = TableStore.of(data).table("approvals", create=dict)
         
         required_fields = ["entity_type", "entity_id", "approver_id", "level"]
         if not all(field in data_record for field in required_fields):
-            return json.dumps({"success": False, "error": "Invalid or Missing Inputs"})
+            return dumps({"success": False, "error": "Invalid or Missing Inputs"})
             
-        def generate_id(table: Dict[str, Any]) -> str:
-            if not table:
-                return "app_001"
-            last_key = max(table.keys(), key=lambda k: int(k.split('_')[1]))
-            last_number = int(last_key.split('_')[1])
-            new_number = last_number + 1
-            return f"app_{new_number:03d}"
-            
-        new_approval_id = generate_id(approvals)
+        new_approval_id = approvals.next_id("app")
         
         record_to_create = {
             "approval_id": new_approval_id,
@@ -36,10 +29,12 @@ class CreateApprovalRequest:
             "updated_at": datetime.now(timezone.utc).isoformat()
         }
         record_to_create.update(data_record)
+        # The id is always generated; a caller-supplied one would replace an existing approval.
+        record_to_create["approval_id"] = new_approval_id
         
-        approvals[new_approval_id] = record_to_create
+        approvals.insert(record_to_create)
         
-        return json.dumps({"success": True, "created_approval_request": record_to_create})
+        return dumps({"success": True, "created_approval_request": record_to_create})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
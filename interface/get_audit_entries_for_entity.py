@@ -1,7 +1,11 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from base import Tool
+from pagination import Page, fingerprint
+from persistence import FileStore
+from query import Query
+from serialization import adumps, dumps
+from table_store import TableStore
 
 
 class GetAuditEntriesForEntity(Tool):
@@ -11,38 +15,46 @@ class GetAuditEntriesForEntity(Tool):
         entity_id = payload.get("entity_id")
 
         if db is not None:
-            audits = db.get("audit_logs", [])
+            audits = TableStore.of(db).table("audit_logs")
         else:
             workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
             data_dir = os.path.join(workspace_root, "data")
-            path = os.path.join(data_dir, "audit_logs.json")
             try:
-                if os.path.exists(path):
-                    with open(path, "r", encoding="utf-8") as f:
-                        raw = json.load(f)
-                else:
-                    raw = []
+                audits = FileStore.at(data_dir).table("audit_logs")
             except Exception as e:
                 return {"success": False, "error": "read_error", "details": str(e)}
 
-            if isinstance(raw, list):
-                audits = raw
-            elif isinstance(raw, dict):
-                audits = list(raw.values())
-            else:
-                audits = []
-
-        results = [a for a in audits if (not entity_type or a.get("entity_type") == entity_type) and (not entity_id or a.get("entity_id") == entity_id)]
-        return {"success": True, "audit_entries": results}
+        criteria = {}
+        if entity_type:
+            criteria["entity_type"] = entity_type
+        if entity_id:
+            criteria["entity_id"] = entity_id
+        # Streamed, so that a scan (e.g. on entity_type alone) runs while the page is encoded.
+        try:
+            page = Page(audits, Query(criteria), payload.get("page_size"), payload.get("cursor"), fingerprint("get_audit_entries_for_entity", criteria))
+        except ValueError as e:
+            return {"success": False, "error": "invalid_pagination", "details": str(e)}
+        return {"success": True, "audit_entries": page}
 
     @staticmethod
-    def invoke(data: Dict[str, Any], entity_type: str | None = None, entity_id: str | None = None) -> str:
+    def invoke(data: Dict[str, Any], entity_type: str | None = None, entity_id: str | None = None, page_size: int | None = None, cursor: str | None = None) -> str:
+        try:
+            res = GetAuditEntriesForEntity._invoke_internal({"entity_type": entity_type, "entity_id": entity_id, "page_size": page_size, "cursor": cursor}, db=data)
+            return dumps(res)
+        except Exception as e:
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+
+    @classmethod
+    async def ainvoke(cls, data: Dict[str, Any], entity_type: str | None = None, entity_id: str | None = None, page_size: int | None = None, cursor: str | None = None) -> str:
+        # the scan runs while the page is encoded; adumps yields to the event loop meanwhile
+        if data is None:
+            return await super().ainvoke(data, entity_type, entity_id, page_size, cursor)
         try:
-            res = GetAuditEntriesForEntity._invoke_internal({"entity_type": entity_type, "entity_id": entity_id}, db=data)
+            res = GetAuditEntriesForEntity._invoke_internal({"entity_type": entity_type, "entity_id": entity_id, "page_size": page_size, "cursor": cursor}, db=data)
+            return await adumps(res)
         except Exception as e:
-            return json.dumps({"success": False, "error": "internal_error", "details": str(e)})
-        return json.dumps(res)
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
-        return {"type": "function", "function": {"name": "get_audit_entries_for_entity", "description": "Return audit entries for an entity.", "parameters": {"type": "object", "properties": {"data": {"type": "dict"}, "entity_type": {"type": ["string","null"]}, "entity_id": {"type": ["string","null"]}}, "required": ["data"]}}}
+        return {"type": "function", "function": {"name": "get_audit_entries_for_entity", "description": "Return audit entries for an entity.", "parameters": {"type": "object", "properties": {"data": {"type": "dict"}, "entity_type": {"type": ["string","null"]}, "entity_id": {"type": ["string","null"]}, "page_size": {"type": ["integer","null"], "description": "Maximum entries per page; the response then carries next_cursor."}, "cursor": {"type": ["string","null"], "description": "next_cursor from the previous page."}}, "required": ["data"]}}}
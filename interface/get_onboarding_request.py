@@ -1,7 +1,9 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
 
 
 class GetOnboardingRequest(Tool):
@@ -12,30 +14,18 @@ class GetOnboardingRequest(Tool):
             return {"success": False, "error": "missing_request_id"}
 
         if db is not None:
-            reqs = db.get("onboarding_requests", [])
+            reqs = TableStore.of(db).table("onboarding_requests")
         else:
             workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
             data_dir = os.path.join(workspace_root, "data")
-            path = os.path.join(data_dir, "onboarding_requests.json")
             try:
-                if os.path.exists(path):
-                    with open(path, "r", encoding="utf-8") as f:
-                        raw = json.load(f)
-                else:
-                    raw = []
+                reqs = FileStore.at(data_dir).table("onboarding_requests")
             except Exception as e:
                 return {"success": False, "error": "read_error", "details": str(e)}
 
-            if isinstance(raw, list):
-                reqs = raw
-            elif isinstance(raw, dict):
-                reqs = list(raw.values())
-            else:
-                reqs = []
-
-        for r in reqs:
-            if r.get("request_id") == request_id:
-                return {"success": True, "onboarding_request": r}
+        r = reqs.get(request_id)
+        if r is not None:
+            return {"success": True, "onboarding_request": r}
         return {"success": False, "error": "not_found"}
 
     @staticmethod
@@ -43,8 +33,8 @@ class GetOnboardingRequest(Tool):
         try:
             res = GetOnboardingRequest._invoke_internal({"request_id": request_id}, db=data)
         except Exception as e:
-            return json.dumps({"success": False, "error": "internal_error", "details": str(e)})
-        return json.dumps(res)
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
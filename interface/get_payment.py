@@ -1,7 +1,9 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
 
 
 class GetPayment(Tool):
@@ -12,30 +14,18 @@ class GetPayment(Tool):
             return {"success": False, "error": "missing_payment_id"}
 
         if db is not None:
-            payments = db.get("payments", [])
+            payments = TableStore.of(db).table("payments")
         else:
             workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
             data_dir = os.path.join(workspace_root, "data")
-            path = os.path.join(data_dir, "payments.json")
             try:
-                if os.path.exists(path):
-                    with open(path, "r", encoding="utf-8") as f:
-                        raw = json.load(f)
-                else:
-                    raw = []
+                payments = FileStore.at(data_dir).table("payments")
             except Exception as e:
                 return {"success": False, "error": "read_error", "details": str(e)}
 
-            if isinstance(raw, list):
-                payments = raw
-            elif isinstance(raw, dict):
-                payments = list(raw.values())
-            else:
-                payments = []
-
-        for p in payments:
-            if p.get("payment_id") == payment_id:
-                return {"success": True, "payment": p}
+        p = payments.get(payment_id)
+        if p is not None:
+            return {"success": True, "payment": p}
         return {"success": False, "error": "not_found"}
 
     @staticmethod
@@ -43,8 +33,8 @@ class GetPayment(Tool):
         try:
             res = GetPayment._invoke_internal({"payment_id": payment_id}, db=data)
         except Exception as e:
-            return json.dumps({"success": False, "error": "internal_error", "details": str(e)})
-        return json.dumps(res)
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
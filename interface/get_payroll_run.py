@@ -1,7 +1,9 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
 
 
 class GetPayrollRun(Tool):
@@ -12,30 +14,18 @@ class GetPayrollRun(Tool):
             return {"success": False, "error": "missing_payroll_run_id"}
 
         if db is not None:
-            runs = db.get("payroll_runs", [])
+            runs = TableStore.of(db).table("payroll_runs")
         else:
             workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
             data_dir = os.path.join(workspace_root, "data")
-            path = os.path.join(data_dir, "payroll_runs.json")
             try:
-                if os.path.exists(path):
-                    with open(path, "r", encoding="utf-8") as f:
-                        raw = json.load(f)
-                else:
-                    raw = []
+                runs = FileStore.at(data_dir).table("payroll_runs")
             except Exception as e:
                 return {"success": False, "error": "read_error", "details": str(e)}
 
-            if isinstance(raw, list):
-                runs = raw
-            elif isinstance(raw, dict):
-                runs = list(raw.values())
-            else:
-                runs = []
-
-        for r in runs:
-            if r.get("payroll_run_id") == payroll_run_id:
-                return {"success": True, "payroll_run": r}
+        r = runs.get(payroll_run_id)
+        if r is not None:
+            return {"success": True, "payroll_run": r}
         return {"success": False, "error": "not_found"}
 
     @staticmethod
@@ -43,8 +33,8 @@ class GetPayrollRun(Tool):
         try:
             res = GetPayrollRun._invoke_internal({"payroll_run_id": payroll_run_id}, db=data)
         except Exception as e:
-            return json.dumps({"success": False, "error": "internal_error", "details": str(e)})
-        return json.dumps(res)
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
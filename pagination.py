@@ -0,0 +1,90 @@
+import base64
+import hashlib
+import json
+from typing import Any, Iterator, List, Optional
+
+# Upper bound on page_size; larger requests are clamped.
+MAX_PAGE_SIZE = 1000
+
+
+def fingerprint(*parts: Any) -> str:
+    """Short digest of the query a cursor belongs to."""
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(position: List[Any], query: str) -> str:
+    raw = json.dumps({"p": position, "q": query}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, query: str) -> Any:
+    """Return the position stored in `cursor`; ValueError if it is not a cursor for `query`."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        state = json.loads(raw)
+        position = state["p"]
+        ok = state["q"] == query
+    except (ValueError, TypeError, KeyError):
+        ok = False
+    if not ok:
+        raise ValueError("invalid_cursor")
+    return position
+
+
+class Page:
+    """
+    One page of a query's result rows, produced lazily.
+
+    Without a page_size or cursor every row of query.run(table) is yielded,
+    as the tools did before pagination. With one, at most page_size rows
+    following the cursor are yielded and `next_cursor` is set once the page
+    has been consumed: an opaque token for the following page, or None on
+    the last page.
+
+    Cursors are keyset cursors: they hold the position of the last row of
+    the page (see Query.resume), not a row offset, so a deep page is read
+    from where the previous one stopped, through the same index, and rows
+    inserted between calls do not shift the pages after them. Cursors are
+    bound to the query (see fingerprint) and rejected for any other query.
+    """
+
+    def __init__(
+        self,
+        table: Any,
+        query: Any,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+        scope: str = "",
+    ):
+        if page_size is not None and (not isinstance(page_size, int) or page_size < 1):
+            raise ValueError("page_size must be a positive integer")
+        self.page_size = None if page_size is None else min(page_size, MAX_PAGE_SIZE)
+        self.scope = scope
+        self.paginated = page_size is not None or cursor is not None
+        self.table = table
+        self.query = query
+        self.next_cursor: Optional[str] = None
+        self._rows = None
+        if self.paginated:
+            after = decode_cursor(cursor, scope) if cursor else None
+            # One row past the page tells whether there is a next page.
+            count = None if self.page_size is None else self.page_size + 1
+            self._rows = query.resume(table, after, count)
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._rows is None:
+            yield from self.query.run(self.table)
+            return
+        last = None
+        more = False
+        for n, (position, row) in enumerate(self._rows):
+            if n == self.page_size:
+                more = True
+                break
+            last = position
+            yield row
+        self.next_cursor = encode_cursor(last, self.scope) if more else None
+
+    def tolist(self) -> List[Any]:
+        return list(self)
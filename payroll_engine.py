@@ -0,0 +1,106 @@
+"""
+Columnar payroll computation.
+
+Gross pay, deductions and net pay for a whole payroll run are computed in
+integer cents in one pass: with NumPy, as vectorized array operations;
+without it, with the same integer arithmetic in a Python loop. Both paths
+round half to even on exact cent values and produce identical results.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure Python path is used instead.
+    np = None
+
+PAY_PERIODS_PER_YEAR = 24
+DEDUCTION_RATE_BPS = 2000  # 20% of gross, in basis points
+# Runs with at least this many employees use the vectorized engine.
+VECTORIZE_THRESHOLD = 1000
+
+
+def _round_div(num, den):
+    """num / den rounded half to even; works on ints and int64 arrays."""
+    q, r = divmod(num, den)
+    return q + ((2 * r > den) | ((2 * r == den) & (q % 2 == 1)))
+
+
+def to_cents(salary: Any) -> int:
+    return int(round(float(salary or 0) * 100))
+
+
+def compute_pay_cents(salary_cents):
+    """
+    Return (gross, deductions, net) in cents for one period. Accepts a
+    single int or an int64 array of annual salaries.
+    """
+    gross = _round_div(salary_cents, PAY_PERIODS_PER_YEAR)
+    deductions = _round_div(gross * DEDUCTION_RATE_BPS, 10000)
+    return gross, deductions, gross - deductions
+
+
+def compute_pay(salary: Any) -> Tuple[float, float, float]:
+    """Scalar (gross_pay, deductions, net_pay) in currency units."""
+    gross, deductions, net = compute_pay_cents(to_cents(salary))
+    return gross / 100, deductions / 100, net / 100
+
+
+class PayrollColumns:
+    """Employee columns needed by a payroll run, as parallel arrays."""
+
+    def __init__(self, employee_ids: List[Any], salaries: Sequence[Any], statuses: List[Any], department_ids: List[Any]):
+        self.employee_ids = employee_ids
+        self.salaries = list(salaries)
+        self.statuses = statuses
+        self.department_ids = department_ids
+        if np is not None:
+            self.salary_cents = np.rint(np.asarray([float(s or 0) for s in salaries], dtype=np.float64) * 100).astype(np.int64)
+            self.statuses = np.asarray(statuses, dtype=object)
+            self.department_ids = np.asarray(department_ids, dtype=object)
+        else:
+            self.salary_cents = [to_cents(s) for s in salaries]
+
+    def __len__(self) -> int:
+        return len(self.employee_ids)
+
+    @classmethod
+    def from_records(cls, employees: Iterable[Dict[str, Any]]) -> "PayrollColumns":
+        ids, salaries, statuses, departments = [], [], [], []
+        for e in employees:
+            ids.append(e.get("employee_id"))
+            salaries.append(e.get("salary", 0))
+            statuses.append(e.get("status"))
+            departments.append(e.get("department_id"))
+        return cls(ids, salaries, statuses, departments)
+
+    def compute(self) -> Tuple[List[float], List[float], List[float]]:
+        """Return gross, deductions and net for every employee, in currency units."""
+        if np is not None:
+            gross, deductions, net = compute_pay_cents(self.salary_cents)
+            return (gross / 100).tolist(), (deductions / 100).tolist(), (net / 100).tolist()
+        gross, deductions, net = [], [], []
+        for cents in self.salary_cents:
+            g, d, n = compute_pay_cents(cents)
+            gross.append(g / 100)
+            deductions.append(d / 100)
+            net.append(n / 100)
+        return gross, deductions, net
+
+
+def generate_pays(
+    employees: Iterable[Dict[str, Any]],
+    run_id: str,
+    created_at: str,
+    columns: Optional[PayrollColumns] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Build the employee_pays records of a payroll run in bulk, in the same
+    shape and id sequence as GenerateEmployeePays.
+    """
+    cols = columns if columns is not None else PayrollColumns.from_records(employees)
+    gross, deductions, net = cols.compute()
+    pays = []
+    for n, (emp_id, amount, g, d, p) in enumerate(zip(cols.employee_ids, cols.salaries, gross, deductions, net), 1):
+        pay_id = f"ep_{run_id}_{n:03d}"
+        pays.append({"employee_pay_id": pay_id, "pay_id": pay_id, "employee_id": emp_id, "payroll_run_id": run_id, "amount": amount, "gross_pay": g, "deductions": d, "net_pay": p, "created_at": created_at})
+    return pays
@@ -0,0 +1,673 @@
+import asyncio
+import atexit
+import contextvars
+import functools
+import os
+import tempfile
+import threading
+import time
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from compact import compact_table, record_converter
+from serialization import dump_file, encode_compact, load_file, loads
+from snapfile import SUFFIX as SNAPSHOT_SUFFIX, SnapshotDict, SnapshotList, open_snapshot
+from table_store import Table, TableStore
+
+try:
+    import fcntl
+except ImportError:  # advisory locks are POSIX only; shared mode is unavailable.
+    fcntl = None
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Pending writes a table may accumulate before it is flushed: at least
+# MIN_PENDING_WRITES, growing with the table so that a stream of N inserts
+# rewrites the file O(log N) times and writes O(N) bytes in total.
+MIN_PENDING_WRITES = 64
+FLUSH_RATIO = 0.5
+# Group commit: the write-ahead log is fsynced every SYNC_EVERY transactions
+# or once the oldest unsynced one is FLUSH_INTERVAL seconds old, by a timer
+# thread if no further write comes.
+SYNC_EVERY = 64
+FLUSH_INTERVAL = 1.0
+# Transactions the log may hold before every table is checkpointed.
+CHECKPOINT_ENTRIES = 4096
+WAL_NAME = "_wal.jsonl"
+# Shared mode (several processes on one data directory): seconds to wait for
+# a table lock before the transaction fails. TOOL_STORE_SHARED=1 makes
+# FileStore.at() open stores in shared mode.
+LOCK_TIMEOUT = 30.0
+SHARED = os.environ.get("TOOL_STORE_SHARED", "") not in ("", "0")
+
+_io_executor: Optional[ThreadPoolExecutor] = None
+_stores: Dict[str, "FileStore"] = {}
+
+
+def atomic_write_json(path: str, obj: Any, pretty: bool = False, durable: bool = False) -> None:
+    """
+    Write `obj` to `path` through a temp file and os.replace; fsync first
+    when `durable`. The temp file name is unique, so concurrent writers
+    never share one.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        dump_file(tmp, obj, pretty=pretty)
+        if durable:
+            with open(tmp, "rb") as f:
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _stamp(path: str) -> Optional[tuple]:
+    """Identity of the file at `path`; it changes whenever the file is replaced or rewritten."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class LazyDatabase(MutableMapping):
+    """
+    Tool database whose tables are read from <data_dir>/<table>.json the
+    first time they are accessed.
+
+    Table names are discovered from the directory listing, so `in`, len()
+    and iteration never parse a file. A <table>.snap binary snapshot (see
+    snapfile.py) that is at least as new as the JSON file is memory-mapped
+    instead of parsing the JSON, and its records are decoded on access.
+    `used_tables` reports every table the session read or wrote,
+    `loaded_tables` the ones actually parsed.
+
+    With compact=True JSON tables are converted to compact records on
+    load. Snapshot tables stay lazy: each record is converted as it is
+    decoded, to the schema of the table's first record, and records that
+    do not fit it stay dicts.
+
+    Only the table files are read. Writes still in a FileStore's
+    write-ahead log (_wal.jsonl) are not applied; commit() the FileStore
+    first, or open the directory with a FileStore instead.
+    """
+
+    def __init__(self, data_dir: str = DATA_DIR, compact: bool = False):
+        self.data_dir = data_dir
+        self.compact = compact
+        self._tables: Dict[str, Any] = {}
+        self._names: Set[str] = set()
+        if os.path.isdir(data_dir):
+            self._names = {
+                os.path.splitext(f)[0] for f in os.listdir(data_dir) if f.endswith((".json", SNAPSHOT_SUFFIX))
+            }
+        self._used: Set[str] = set()
+
+    @property
+    def used_tables(self) -> List[str]:
+        return sorted(self._used)
+
+    @property
+    def loaded_tables(self) -> List[str]:
+        return sorted(self._tables)
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._names:
+            raise KeyError(name)
+        self._used.add(name)
+        rows = self._tables.get(name)
+        if rows is None:
+            rows = self._load(name)
+            if self.compact and isinstance(rows, (dict, list)):
+                rows = compact_table(rows)
+            elif self.compact and isinstance(rows, (SnapshotDict, SnapshotList)) and rows.snapshot.count:
+                rows.convert = record_converter(rows.snapshot.record(0))
+            self._tables[name] = rows
+        return rows
+
+    def _load(self, name: str) -> Any:
+        path = os.path.join(self.data_dir, f"{name}.json")
+        snap = os.path.join(self.data_dir, name + SNAPSHOT_SUFFIX)
+        if os.path.exists(snap) and (not os.path.exists(path) or os.path.getmtime(snap) >= os.path.getmtime(path)):
+            return open_snapshot(snap)
+        return load_file(path)
+
+    def __setitem__(self, name: str, rows: Any) -> None:
+        self._used.add(name)
+        self._names.add(name)
+        self._tables[name] = rows
+
+    def __delitem__(self, name: str) -> None:
+        self._names.remove(name)
+        self._tables.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(sorted(self._names))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+class WriteAheadLog:
+    """
+    Append-only, line-delimited JSON log of a FileStore's transactions.
+
+    Each append writes a single line, so logging a transaction costs O(1)
+    I/O regardless of the table sizes. The store truncates the log once
+    every table it touches has been checkpointed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = None
+        self._entries: Optional[int] = None
+
+    def __len__(self) -> int:
+        if self._entries is None:
+            self._entries = sum(1 for _ in self.read())
+        return self._entries
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        if self._fh is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._drop_torn_tail()
+            self._fh = open(self.path, "a", encoding="utf-8")
+        self._fh.write(encode_compact(entry) + "\n")
+        self._fh.flush()
+        if self._entries is not None:
+            self._entries += 1
+
+    def read(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield logged entries in append order, one line at a time. A torn
+        last line, left by a crash in the middle of an append, is ignored.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                yield loads(line)
+
+    def _drop_torn_tail(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b"\n":
+                return
+            f.seek(0)
+            f.truncate(f.read().rfind(b"\n") + 1)
+
+    def sync(self) -> None:
+        """fsync appended lines to stable storage."""
+        if self._fh is not None:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    def truncate(self) -> None:
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._entries = 0
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class Transaction:
+    """Writes made inside FileStore.transaction(), logged when it commits."""
+
+    def __init__(self):
+        self.ops: List[list] = []
+        self.tables: Set[str] = set()
+        self.locks: Dict[str, int] = {}
+        self.failed = False
+
+
+class FileStore(TableStore):
+    """
+    Write-behind TableStore over a directory of <table>.json files, with a
+    write-ahead log.
+
+    Tables are read from disk the first time a tool touches them and then
+    served from memory. Every write is appended to the write-ahead log
+    (<data_dir>/_wal.jsonl) as part of a transaction: the writes made
+    inside `with store.transaction():` are logged together as one line
+    when the block exits, and a write made outside any transaction is
+    logged on its own. If the block raises, nothing is logged and the
+    tables it wrote are reloaded from disk and the log, so either every
+    write of a transaction survives or none does.
+
+    The log is fsynced every `sync_every` transactions, when the oldest
+    unsynced one is `flush_interval` seconds old, on sync() and on
+    commit(), so many tool calls share one fsync (group commit). The age
+    check runs on the next write and on a daemon timer armed by the first
+    unsynced transaction, so an idle store still syncs its last batch
+    within `flush_interval`; the timer only fsyncs the log, and tables
+    are checkpointed by writes, commit() and at exit as below. A store
+    opened on a directory with a log replays it onto each table as the
+    table is loaded, streaming the log and keeping only that table's
+    writes; a torn last line is an uncommitted transaction and is ignored.
+
+    Table snapshots are rewritten (checkpointed) on commit(), when the
+    number of records written to a table since its last checkpoint passes
+    its size threshold, when the log holds CHECKPOINT_ENTRIES
+    transactions, and at interpreter exit. The log is
+    truncated once every table it touches has been checkpointed. Every
+    checkpoint goes through atomic_write_json, so the file on disk is
+    always either the old or the new complete table.
+
+    Snapshots are written compact; pass pretty=True for indented files.
+
+    With shared=True several processes can work on the same directory.
+    There is no write-ahead log: a transaction takes an exclusive advisory
+    lock on every table it touches (held until it ends, so the tables it
+    read cannot change under it), reloads any table another process has
+    replaced since it was cached, and rewrites the tables it wrote before
+    releasing the locks. Reads outside a transaction reload stale tables
+    but take no lock; atomic replaces make every read see a whole file.
+    Writes outside a transaction lock the table for that write only and
+    fail if another process changed it since it was read. Locks live in
+    <data_dir>/.<table>.lock.
+    """
+
+    def __init__(
+        self,
+        data_dir: str,
+        min_pending: int = MIN_PENDING_WRITES,
+        flush_ratio: float = FLUSH_RATIO,
+        flush_interval: float = FLUSH_INTERVAL,
+        pretty: bool = False,
+        sync_every: int = SYNC_EVERY,
+        shared: bool = False,
+    ):
+        super().__init__({})
+        self.data_dir = data_dir
+        self.min_pending = min_pending
+        self.flush_ratio = flush_ratio
+        self.flush_interval = flush_interval
+        self.pretty = pretty
+        self.sync_every = sync_every
+        # Records written per table since its last checkpoint.
+        self._pending: Dict[str, int] = {}
+        self.wal = WriteAheadLog(os.path.join(data_dir, WAL_NAME))
+        # Tables with logged writes not yet replayed; None until the log is read.
+        self._replay: Optional[Set[str]] = None
+        # Position of each record of a list table, built on its first update.
+        self._positions: Dict[str, Dict[int, int]] = {}
+        self._txn: Optional[Transaction] = None
+        self._unsynced = 0
+        self._unsynced_since: Optional[float] = None
+        # Guards the log against the group-commit timer thread.
+        self._wal_lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self.shared = shared
+        self._deferred: Optional[List[list]] = None
+        self._stamps: Dict[str, Optional[tuple]] = {}
+        if shared:
+            if fcntl is None:
+                raise RuntimeError("shared FileStore needs fcntl advisory locks")
+            if self._unreplayed():
+                raise RuntimeError(f"{self.wal.path} has writes not yet checkpointed; open the store unshared and commit() first")
+
+    @classmethod
+    def at(cls, data_dir: str) -> "FileStore":
+        """Return the process-wide store for `data_dir`."""
+        data_dir = os.path.abspath(data_dir)
+        store = _stores.get(data_dir)
+        if store is None:
+            store = _stores[data_dir] = cls(data_dir, shared=SHARED)
+        return store
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.data_dir, f"{name}.json")
+
+    def table(self, name: str, create: Optional[type] = None) -> Table:
+        if self.shared:
+            if self._txn is not None and name not in self._txn.locks:
+                self._txn.locks[name] = self._lock(name)
+            if name in self.data and self._stamps.get(name) != _stamp(self.path(name)):
+                self._evict(name)
+        if name not in self.data:
+            raw = None
+            path = self.path(name)
+            self._stamps[name] = _stamp(path)
+            if os.path.exists(path):
+                raw = load_file(path)
+            replay = self._unreplayed()
+            if name in replay:
+                replay.discard(name)
+                raw, n = _apply(raw, self._logged_ops(name))
+                if n:
+                    self._pending[name] = self._pending.get(name, 0) + n
+            if self._deferred:
+                # Committed but not logged yet (the table was reloaded by an abort).
+                raw, _ = _apply(raw, (_decoded(op) for op in self._deferred if op[0] == name))
+            if isinstance(raw, (list, dict)):
+                self.data[name] = raw
+        return super().table(name, create)
+
+    @contextmanager
+    def transaction(self, sync: bool = False) -> Iterator["FileStore"]:
+        """
+        Group the writes of the block into one transaction. A transaction
+        opened inside another one joins it. With sync=True the log is
+        fsynced before the block returns.
+        """
+        if self._txn is not None:
+            try:
+                yield self
+            except BaseException:
+                # The outer block may catch this; its transaction must not commit.
+                self._txn.failed = True
+                raise
+            return
+        txn = self._txn = Transaction()
+        try:
+            yield self
+        except BaseException:
+            self._txn = None
+            self._abort(txn)
+            raise
+        self._txn = None
+        if txn.failed:
+            self._abort(txn)
+        elif self.shared:
+            self._write_through(txn)
+        elif txn.ops:
+            self._log(txn.ops, sync)
+
+    def abort(self) -> None:
+        """
+        Make the current transaction abort when its block exits, e.g. after
+        catching a failed write inside it. Does nothing outside a transaction.
+        """
+        if self._txn is not None:
+            self._txn.failed = True
+
+    @contextmanager
+    def deferred(self, sync: bool = False) -> Iterator["FileStore"]:
+        """
+        Hold back the log writes of everything committed in the block and
+        append them as one log entry when it ends (fsynced with sync=True).
+        Each transaction still commits or aborts on its own; a crash inside
+        the block loses the writes held back so far. Shared stores write
+        through as usual.
+        """
+        if self._deferred is not None or self.shared:
+            yield self
+            return
+        self._deferred = []
+        try:
+            yield self
+        finally:
+            ops, self._deferred = self._deferred, None
+            if ops:
+                self._log([_decoded(op) for op in ops], sync)
+
+    def _written(self, name: str, record: Dict[str, Any], inserted: bool) -> None:
+        rows = self.data.get(name)
+        if isinstance(rows, list):
+            op = [name, "i", self._position(name, rows, record, inserted), record]
+        else:
+            op = [name, "k", record.get(self._tables[name].key_field), record]
+        if self._txn is not None:
+            self._txn.ops.append(op)
+            self._txn.tables.add(name)
+            if self.shared and name not in self._txn.locks:
+                self._txn.locks[name] = self._lock(name)
+                if self._stamps.get(name) != _stamp(self.path(name)):
+                    self._txn.failed = True
+                    raise RuntimeError(f"{name} was changed by another process")
+        elif self.shared:
+            txn = Transaction()
+            txn.tables.add(name)
+            txn.locks[name] = self._lock(name)
+            if self._stamps.get(name) != _stamp(self.path(name)):
+                self._abort(txn)
+                raise RuntimeError(f"{name} was changed by another process")
+            self._write_through(txn)
+        else:
+            self._log([op])
+
+    def _position(self, name: str, rows: List[Any], record: Dict[str, Any], inserted: bool) -> int:
+        """Index of `record` in list table `name`."""
+        positions = self._positions.get(name)
+        if inserted and rows and rows[-1] is record:
+            pos = len(rows) - 1
+            if positions is not None:
+                positions[id(record)] = pos
+            return pos
+        pos = -1 if positions is None else positions.get(id(record), -1)
+        if not 0 <= pos < len(rows) or rows[pos] is not record:
+            # First update of the table, or rows changed outside the store.
+            positions = self._positions[name] = {id(rec): i for i, rec in enumerate(rows)}
+            pos = positions[id(record)]
+        return pos
+
+    def _log(self, ops: List[list], sync: bool = False) -> None:
+        if self._deferred is not None:
+            # Held back encoded: later transactions edit the live records in
+            # place and may abort, and replay must see them as committed.
+            self._deferred.extend([name, kind, where, encode_compact(record)] for name, kind, where, record in ops)
+            return
+        with self._wal_lock:
+            self.wal.append({"ops": ops})
+            now = time.monotonic()
+            self._unsynced += 1
+            if self._unsynced_since is None:
+                self._unsynced_since = now
+            if sync or self._unsynced >= self.sync_every or now - self._unsynced_since >= self.flush_interval:
+                self.sync()
+            elif self._timer is None or not self._timer.is_alive():
+                self._arm_timer(self._unsynced_since + self.flush_interval - now)
+        for op in ops:
+            self._pending[op[0]] = self._pending.get(op[0], 0) + 1
+        for name in dict.fromkeys(op[0] for op in ops):
+            if self._pending.get(name, 0) >= max(self.min_pending, self.flush_ratio * len(self.data.get(name, ()))):
+                self.flush(name)
+        if len(self.wal) >= CHECKPOINT_ENTRIES:
+            self.commit()
+
+    def _unreplayed(self) -> Set[str]:
+        """Tables with logged writes that have not been replayed yet."""
+        if self._replay is None:
+            self._replay = set()
+            n = 0
+            for entry in self.wal.read():
+                n += 1
+                self._replay.update(op[0] for op in entry["ops"])
+            self.wal._entries = n
+        return self._replay
+
+    def _logged_ops(self, name: str) -> Iterator[list]:
+        """Stream the logged writes of table `name`, in log order."""
+        for entry in self.wal.read():
+            for op in entry["ops"]:
+                if op[0] == name:
+                    yield op
+
+    def _abort(self, txn: Transaction) -> None:
+        """Reload the tables `txn` wrote, dropping its in-memory changes."""
+        for name in txn.tables:
+            self._evict(name)
+        if not self.shared:
+            self._unreplayed().update(txn.tables)
+        self._unlock(txn)
+
+    def _evict(self, name: str) -> None:
+        self.data.pop(name, None)
+        self._tables.pop(name, None)
+        self._stamps.pop(name, None)
+        self._positions.pop(name, None)
+
+    def _write_through(self, txn: Transaction) -> None:
+        """Shared mode: rewrite the tables `txn` wrote, then release its locks."""
+        try:
+            for name in txn.tables:
+                if name in self.data:
+                    path = self.path(name)
+                    atomic_write_json(path, self.data[name], pretty=self.pretty)
+                    self._stamps[name] = _stamp(path)
+        except BaseException:
+            for name in txn.tables:
+                self._evict(name)
+            raise
+        finally:
+            self._unlock(txn)
+
+    def _lock(self, name: str) -> int:
+        """Take the exclusive lock of table `name`, waiting up to LOCK_TIMEOUT seconds."""
+        fd = os.open(os.path.join(self.data_dir, f".{name}.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        delay = 0.0005
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise TimeoutError(f"timed out waiting for the lock of {name}")
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+
+    def _unlock(self, txn: Transaction) -> None:
+        for fd in txn.locks.values():
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        txn.locks.clear()
+
+    def sync(self) -> None:
+        """fsync the write-ahead log."""
+        with self._wal_lock:
+            self.wal.sync()
+            self._unsynced = 0
+            self._unsynced_since = None
+
+    def _arm_timer(self, delay: float) -> None:
+        self._timer = threading.Timer(max(0.0, delay), self._sync_idle)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _sync_idle(self) -> None:
+        """Timer callback: sync once the oldest unsynced transaction is flush_interval old."""
+        with self._wal_lock:
+            self._timer = None
+            if self._unsynced_since is None:
+                return
+            wait = self._unsynced_since + self.flush_interval - time.monotonic()
+            if wait > 0:
+                self._arm_timer(wait)
+            else:
+                self.sync()
+
+    def dirty(self) -> list:
+        return list(self._pending)
+
+    def flush(self, name: str) -> None:
+        """Checkpoint table `name` if it has logged writes."""
+        if name in self._pending:
+            self.compact(name)
+
+    def compact(self, name: str) -> None:
+        """
+        Rewrite the snapshot of `name`, and truncate the write-ahead log once
+        no table depends on it.
+        """
+        if name not in self.data or self._txn is not None:
+            return
+        atomic_write_json(self.path(name), self.data[name], pretty=self.pretty, durable=True)
+        self._pending.pop(name, None)
+        if not self._pending and not self._unreplayed():
+            with self._wal_lock:
+                self.wal.truncate()
+                self._unsynced = 0
+                self._unsynced_since = None
+
+    def commit(self) -> None:
+        """Checkpoint every table with logged writes."""
+        if self._txn is not None:
+            return
+        for name in list(self._unreplayed()):
+            self.table(name)
+        for name in list(self._pending):
+            self.flush(name)
+        self.sync()
+
+    def discard(self) -> None:
+        """Drop all cached tables and the write-ahead log, including writes not yet checkpointed."""
+        self.data.clear()
+        self._tables.clear()
+        self._pending.clear()
+        self._positions.clear()
+        self._replay = set()
+        with self._wal_lock:
+            self.wal.truncate()
+            self._unsynced = 0
+            self._unsynced_since = None
+
+
+def _decoded(op: list) -> list:
+    """A deferred op with its record decoded into a new dict."""
+    name, kind, where, record = op
+    return [name, kind, where, loads(record)]
+
+
+def _apply(rows: Any, ops: Iterable[list]) -> Tuple[Any, int]:
+    """
+    Replay logged writes onto `rows`, creating the table if it has no rows
+    yet, and return it with the number of writes. Replaying a write twice
+    is harmless.
+    """
+    n = 0
+    for _, kind, where, record in ops:
+        if not isinstance(rows, (list, dict)):
+            rows = [] if kind == "i" else {}
+        if kind == "k":
+            rows[where] = record
+        elif where < len(rows):
+            rows[where] = record
+        else:
+            rows.append(record)
+        n += 1
+    return rows, n
+
+
+async def run_io(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Await fn(*args, **kwargs) run on the process's file I/O thread, in a
+    copy of the caller's context. FileStores are not thread-safe; running
+    every file-backed call on the one thread keeps them consistent while
+    the event loop goes on serving other work.
+    """
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="filestore-io")
+    call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(_io_executor, call)
+
+
+@atexit.register
+def _flush_all() -> None:
+    for store in _stores.values():
+        try:
+            store.commit()
+        except Exception:
+            pass
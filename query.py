@@ -0,0 +1,339 @@
+import heapq
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from instrumentation import scanned
+from table_store import Table
+
+# Predicate templates; `{f}` is the field value and `{c}` the operand.
+OPERATORS: Dict[str, str] = {
+    "eq": "{f} == {c}",
+    "ne": "{f} != {c}",
+    "gt": "{f} is not None and {f} > {c}",
+    "gte": "{f} is not None and {f} >= {c}",
+    "lt": "{f} is not None and {f} < {c}",
+    "lte": "{f} is not None and {f} <= {c}",
+    "in": "{f} in {c}",
+    "not_in": "{f} not in {c}",
+    "prefix": "isinstance({f}, str) and {f}.startswith({c})",
+    "is_null": "({f} is None) == {c}",
+}
+
+Condition = Tuple[str, str, Any]
+
+
+def parse_filters(filters: Dict[str, Any]) -> List[Condition]:
+    """
+    Turn a QueryTable filters dict into (field, operator, operand) triples.
+
+    A plain value means equality. A dict whose keys are all operator names
+    holds one or more predicates on the field, e.g.
+    {"amount": {"gte": 100, "lt": 500}, "status": {"in": ["open", "paid"]}}.
+    """
+    conditions: List[Condition] = []
+    for field, spec in filters.items():
+        if isinstance(spec, dict) and spec and all(op in OPERATORS for op in spec):
+            for op, operand in spec.items():
+                if op in ("in", "not_in") and not isinstance(operand, (list, tuple, set, frozenset)):
+                    raise ValueError(f"'{op}' on '{field}' needs a list of values")
+                if op == "prefix" and not isinstance(operand, str):
+                    raise ValueError(f"'prefix' on '{field}' needs a string")
+                conditions.append((field, op, operand))
+        elif isinstance(spec, dict) and any(op in OPERATORS for op in spec):
+            raise ValueError(f"unknown operator in filter on '{field}': {sorted(set(spec) - set(OPERATORS))}")
+        else:
+            conditions.append((field, "eq", spec))
+    return conditions
+
+
+def _members(values: Iterable[Any]) -> Union[frozenset, tuple]:
+    values = tuple(values)
+    try:
+        return frozenset(values)
+    except TypeError:
+        return values
+
+
+def compile_predicate(conditions: Sequence[Condition]) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Compile conditions into one Python function that reads each field once
+    and short-circuits on the first failing predicate.
+    """
+    env: Dict[str, Any] = {}
+    fields: Dict[str, str] = {}
+    lines = ["def _match(r):"]
+    for i, (field, op, operand) in enumerate(conditions):
+        var = fields.get(field)
+        if var is None:
+            var = fields[field] = f"_f{len(fields)}"
+            env[f"_k{var}"] = field
+            lines.append(f"    {var} = r.get(_k{var})")
+        const = f"_c{i}"
+        env[const] = _members(operand) if op in ("in", "not_in") else bool(operand) if op == "is_null" else operand
+        lines.append(f"    if not ({OPERATORS[op].format(f=var, c=const)}): return False")
+    lines.append("    return True")
+    exec(compile("\n".join(lines), "<query>", "exec"), env)
+    return env["_match"]
+
+
+class Query:
+    """
+    Planned query over one Table.
+
+    The planner serves the rows from an index when it can: a primary key
+    equality (on a dict-shaped table) is a single lookup, equalities covered by a declared secondary
+    index read one bucket, and an `in` list on the primary key or on a
+    single-field secondary index reads one bucket per value. Everything
+    else is a scan. The remaining predicates are compiled into one function
+    (see compile_predicate), and rows are streamed through filtering,
+    ordering, offset/limit and projection without building a full result
+    list; ordering with a limit keeps only the top offset + limit rows.
+    resume() streams the same rows a page at a time (see pagination.Page).
+    """
+
+    def __init__(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None,
+        order_by: Optional[Union[str, Sequence[str]]] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ):
+        if limit is not None and limit < 0 or offset < 0:
+            raise ValueError("limit and offset must not be negative")
+        self.conditions = parse_filters(filters or {})
+        self.fields = list(fields) if fields else None
+        self.order_by = [order_by] if isinstance(order_by, str) else list(order_by or ())
+        self.descending = descending
+        self.limit = limit
+        self.offset = offset
+
+    def plan(self, table: Table) -> Tuple[str, Iterable[Dict[str, Any]], List[Condition]]:
+        """Return (access path, candidate rows, conditions still to check)."""
+        path, segments, remaining = self._access(table, positional=False)
+        if path == "scan":
+            scanned(table.name, len(table))
+            return path, segments[0], remaining
+        # Index buckets are live; copy them so that callers may write while iterating.
+        if len(segments) == 1:
+            return path, list(segments[0]), remaining
+        return path, chain.from_iterable(map(list, segments)), remaining
+
+    def _access(self, table: Table, positional: bool) -> Tuple[str, List[Sequence[Dict[str, Any]]], List[Condition]]:
+        """
+        Return (access path, candidate segments, conditions still to check).
+        The candidates are the rows of the segments in order: the live index
+        buckets for an index path, or the whole table for a scan, by
+        position (Table.sequence) when `positional` is set.
+        """
+        eq = {}
+        for field, op, operand in self.conditions:
+            if op == "eq" and field not in eq:
+                try:
+                    hash(operand)
+                except TypeError:
+                    continue
+                eq[field] = operand
+        pk = table.primary_key
+        # Primary keys are only unique in dict-shaped tables.
+        if pk in eq and table.keyed:
+            rec = table.get(eq[pk])
+            return "primary_key", [[rec]] if rec is not None else [], self._without(pk, "eq")
+        index = table.covering_index(eq)
+        if index is not None:
+            bucket = table.bucket(index, tuple(eq[f] for f in index))
+            return f"index({', '.join(index)})", [bucket], [c for c in self.conditions if not (c[1] == "eq" and c[0] in index and eq[c[0]] == c[2])]
+        for field, op, operand in self.conditions:
+            if op != "in":
+                continue
+            try:
+                values = list(dict.fromkeys(operand))
+            except TypeError:
+                continue
+            if field == pk and table.keyed:
+                rows = [rec for rec in map(table.get, values) if rec is not None]
+                return "primary_key_in", [rows], self._without(field, "in")
+            if table.covering_index({field: None}) == (field,):
+                return f"index_in({field})", [table.bucket((field,), (v,)) for v in values], self._without(field, "in")
+        return "scan", [table.sequence() if positional else table.records()], list(self.conditions)
+
+    def _without(self, field: str, op: str) -> List[Condition]:
+        conditions = list(self.conditions)
+        for i, (f, o, _) in enumerate(conditions):
+            if f == field and o == op:
+                del conditions[i]
+                break
+        return conditions
+
+    def matches(self, table: Table) -> Iterator[Dict[str, Any]]:
+        """Stream the records satisfying every condition, unordered and unprojected."""
+        _, rows, remaining = self.plan(table)
+        if not remaining:
+            return iter(rows)
+        return filter(compile_predicate(remaining), rows)
+
+    def count(self, table: Table) -> int:
+        return sum(1 for _ in self.matches(table))
+
+    def run(self, table: Table) -> Iterator[Dict[str, Any]]:
+        """Stream the result rows: filtered, ordered, sliced and projected."""
+        rows: Iterable[Dict[str, Any]] = self.matches(table)
+        stop = None if self.limit is None else self.offset + self.limit
+        if self.order_by:
+            key = self._sort_key()
+            if stop is not None:
+                pick = heapq.nlargest if self.descending else heapq.nsmallest
+                rows = pick(stop, rows, key=key)
+            else:
+                rows = sorted(rows, key=key, reverse=self.descending)
+        rows = islice(rows, self.offset, stop)
+        if self.fields is not None:
+            return map(self._project, rows)
+        return iter(rows)
+
+    def resume(
+        self,
+        table: Table,
+        after: Optional[List[Any]] = None,
+        count: Optional[int] = None,
+    ) -> Iterator[Tuple[List[Any], Dict[str, Any]]]:
+        """
+        Stream up to `count` rows of run(table) as (position, row) pairs,
+        continuing after the row at `after`, a position streamed earlier
+        (None: from the first row). Positions are JSON-serializable.
+
+        A position is a keyset: the number of result rows up to the row,
+        where the row sits among the planner's candidates (segment and
+        index, see _access) and its primary key, or for an ordered query
+        its sort key. An unordered query reads on from that place, so a
+        page costs the same however deep it is and rows inserted since,
+        which are appended after the existing candidates, do not shift
+        it. An ordered query reads the candidates again and keeps the
+        `count` smallest past the position.
+
+        ValueError("invalid_cursor") is raised at once if `after` is not a
+        position of this query.
+        """
+        if after is not None and not self._is_position(after):
+            raise ValueError("invalid_cursor")
+        return self._resume(table, after, count)
+
+    def _is_position(self, after: Any) -> bool:
+        if not (isinstance(after, list) and len(after) == 4):
+            return False
+        if not all(isinstance(n, int) and not isinstance(n, bool) and n >= 0 for n in after[:3]):
+            return False
+        if not self.order_by:
+            return True
+        key = after[3]
+        return (
+            isinstance(key, list)
+            and len(key) == len(self.order_by)
+            and all(isinstance(p, list) and len(p) == 2 and isinstance(p[0], bool) for p in key)
+        )
+
+    def _resume(
+        self,
+        table: Table,
+        after: Optional[List[Any]],
+        count: Optional[int],
+    ) -> Iterator[Tuple[List[Any], Dict[str, Any]]]:
+        path, segments, remaining = self._access(table, positional=True)
+        match = compile_predicate(remaining) if remaining else None
+        done = 0 if after is None else after[0]
+        # The query's own offset applies to the first page only.
+        skip = self.offset if after is None else 0
+        stop = None if self.limit is None else max(self.limit - done, 0)
+        if count is not None:
+            stop = count if stop is None else min(stop, count)
+        project = self._project if self.fields is not None else None
+        pk = table.primary_key
+
+        if not self.order_by:
+            seg, start = 0, 0
+            if after is not None:
+                seg, start = _relocate(segments, after[1], after[2], lambda r: r.get(pk) == after[3])
+            if path == "scan":
+                scanned(table.name, len(segments[0]) - start)
+            rows = islice(_candidates(segments, seg, start, match), skip, None if stop is None else skip + stop)
+            for n, (s, i, rec) in enumerate(rows, done + 1):
+                yield [n, s, i, rec.get(pk)], rec if project is None else project(rec)
+            return
+
+        if path == "scan":
+            scanned(table.name, len(segments[0]))
+        key = self._sort_key()
+        # Ties are broken by candidate order, as in run()'s stable sort.
+        if self.descending:
+            ranked = (((key(rec), -s, -i), rec) for s, i, rec in _candidates(segments, 0, 0, match))
+        else:
+            ranked = (((key(rec), s, i), rec) for s, i, rec in _candidates(segments, 0, 0, match))
+        if after is not None:
+            last_key = tuple(tuple(p) for p in after[3])
+            if self.descending:
+                last = (last_key, -after[1], -after[2])
+                ranked = (r for r in ranked if r[0] < last)
+            else:
+                last = (last_key, after[1], after[2])
+                ranked = (r for r in ranked if r[0] > last)
+        rank = itemgetter(0)
+        if stop is not None:
+            pick = heapq.nlargest if self.descending else heapq.nsmallest
+            top = pick(skip + stop, ranked, key=rank)
+        else:
+            top = sorted(ranked, key=rank, reverse=self.descending)
+        for n, ((k, s, i), rec) in enumerate(islice(top, skip, None), done + 1):
+            yield [n, abs(s), abs(i), [list(p) for p in k]], rec if project is None else project(rec)
+
+    def _sort_key(self) -> Callable[[Dict[str, Any]], Tuple]:
+        keys = self.order_by
+
+        # None sorts last in either direction.
+        if self.descending:
+            def key(r):
+                return tuple((r.get(k) is not None, r.get(k)) for k in keys)
+        else:
+            def key(r):
+                return tuple((r.get(k) is None, r.get(k)) for k in keys)
+
+        return key
+
+    def _project(self, rec: Dict[str, Any]) -> Dict[str, Any]:
+        return {f: rec[f] for f in self.fields if f in rec}
+
+
+def _candidates(
+    segments: List[Sequence[Dict[str, Any]]],
+    seg: int,
+    start: int,
+    match: Optional[Callable[[Dict[str, Any]], bool]],
+) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    """(segment, index, record) of the matching candidates from segments[seg][start] on."""
+    for s in range(seg, len(segments)):
+        rows = segments[s]
+        for i in range(start if s == seg else 0, len(rows)):
+            rec = rows[i]
+            if match is None or match(rec):
+                yield s, i, rec
+
+
+def _relocate(
+    segments: List[Sequence[Dict[str, Any]]],
+    seg: int,
+    index: int,
+    is_last: Callable[[Dict[str, Any]], bool],
+) -> Tuple[int, int]:
+    """
+    Where to resume after the row last seen at segments[seg][index]: just
+    after it, or after where it moved to if rows before it were removed,
+    or after its old place if it is gone.
+    """
+    if seg >= len(segments):
+        return len(segments), 0
+    rows = segments[seg]
+    for i in range(min(index, len(rows) - 1), -1, -1):
+        if is_last(rows[i]):
+            return seg, i + 1
+    return seg, min(index + 1, len(rows))
@@ -0,0 +1,159 @@
+import importlib
+import json
+import os
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from persistence import FileStore
+from serialization import discarded
+from table_store import TableStore
+
+INTERFACES = (1, 2, 3, 4, 5)
+TOOL_NAMES_MAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tool_names_map.json")
+
+
+class ToolRegistry:
+    """
+    Name-to-tool dispatch table for tools/interface_1..5.
+
+    Each interface package is imported once, on first use. Its tools'
+    get_info() schemas are cached, both as dicts and as a serialized JSON
+    list, and every tool name is mapped to the class's invoke in a dict.
+    Besides the name a tool reports in get_info(), an interface also answers
+    to every alias of the same tool in tool_names_map.json (the canonical
+    name and the names used by the other interfaces); a tool's own name
+    always wins over an alias.
+    """
+
+    def __init__(self, names_map_path: str = TOOL_NAMES_MAP, package: str = "tools"):
+        self.package = package
+        self._aliases: Dict[str, List[str]] = {}
+        if os.path.exists(names_map_path):
+            with open(names_map_path, "r", encoding="utf-8") as f:
+                for canon, alts in json.load(f).items():
+                    names = [canon] + list(alts)
+                    for name in names:
+                        self._aliases[name] = names
+        self._interfaces: Dict[int, Dict[str, Any]] = {}
+
+    def _load(self, interface: int) -> Dict[str, Any]:
+        loaded = self._interfaces.get(interface)
+        if loaded is not None:
+            return loaded
+        module = importlib.import_module(f"{self.package}.interface_{interface}")
+        tools = getattr(module, f"ALL_TOOLS_INTERFACE_{interface}")
+        classes: Dict[str, type] = {}
+        infos: Dict[str, Dict[str, Any]] = {}
+        schemas: List[Dict[str, Any]] = []
+        for cls in tools:
+            info = cls.get_info()
+            classes[info["function"]["name"]] = cls
+            infos[info["function"]["name"]] = info
+            schemas.append(info)
+        for name in list(classes):
+            for alias in self._aliases.get(name, ()):
+                if alias not in classes:
+                    classes[alias] = classes[name]
+                    infos[alias] = infos[name]
+        loaded = {
+            "classes": classes,
+            "dispatch": {name: cls.invoke for name, cls in classes.items()},
+            "schemas": schemas,
+            "schemas_json": json.dumps(schemas),
+            "info": infos,
+        }
+        self._interfaces[interface] = loaded
+        return loaded
+
+    def dispatch(self, interface: int) -> Dict[str, Callable[..., str]]:
+        """Map of every tool name and alias to its invoke callable."""
+        return self._load(interface)["dispatch"]
+
+    def resolve(self, name: str, interface: int) -> Callable[..., str]:
+        try:
+            return self._load(interface)["dispatch"][name]
+        except KeyError:
+            raise KeyError(f"unknown tool '{name}' in interface_{interface}") from None
+
+    def tool_class(self, name: str, interface: int) -> type:
+        return self._load(interface)["classes"][name]
+
+    def invoke(self, name: str, interface: int, data: Dict[str, Any], *args, **kwargs) -> str:
+        return self.resolve(name, interface)(data, *args, **kwargs)
+
+    async def ainvoke(self, name: str, interface: int, data: Optional[Dict[str, Any]], *args, **kwargs) -> str:
+        """invoke() through the tool's ainvoke, for asyncio callers."""
+        try:
+            cls = self._load(interface)["classes"][name]
+        except KeyError:
+            raise KeyError(f"unknown tool '{name}' in interface_{interface}") from None
+        return await cls.ainvoke(data, *args, **kwargs)
+
+    def execute_batch(
+        self,
+        calls: List[Dict[str, Any]],
+        interface: int,
+        data: Optional[Dict[str, Any]],
+        keep: Optional[Iterable[int]] = None,
+    ) -> List[Optional[str]]:
+        """
+        Run `calls` in order against `data` and return their results, each
+        exactly what invoke() would have returned at that point.
+
+        A call is {"tool": name, "args": [...], "kwargs": {...}}; args and
+        kwargs are optional and passed after `data`. Every name is resolved
+        before the first call runs. All calls share one TableStore over
+        `data`. The results of calls whose index is not in `keep` (None
+        keeps all) are never encoded and come back as None. With data=None
+        the tools use the interface's file-backed store, and the writes of
+        the whole batch are logged once, at the end (FileStore.deferred).
+        """
+        invokes = [self.resolve(call["tool"], interface) for call in calls]
+        keep = None if keep is None else set(keep)
+        db = TableStore.of(data) if data is not None else None
+        results: List[Optional[str]] = []
+        with ExitStack() as stack:
+            if data is None:
+                package = importlib.import_module(self.package)
+                stack.enter_context(FileStore.at(os.path.join(package.__path__[0], "data")).deferred())
+            for i, (invoke, call) in enumerate(zip(invokes, calls)):
+                args, kwargs = call.get("args", ()), call.get("kwargs", {})
+                if keep is None or i in keep:
+                    results.append(invoke(db, *args, **kwargs))
+                else:
+                    with discarded():
+                        invoke(db, *args, **kwargs)
+                    results.append(None)
+        return results
+
+    def schemas(self, interface: int) -> List[Dict[str, Any]]:
+        """Cached get_info() of every tool of the interface. Do not mutate."""
+        return self._load(interface)["schemas"]
+
+    def schemas_json(self, interface: int) -> str:
+        return self._load(interface)["schemas_json"]
+
+    def info(self, name: str, interface: int) -> Optional[Dict[str, Any]]:
+        """Cached get_info() of the tool `name` resolves to, or None."""
+        return self._load(interface)["info"].get(name)
+
+
+_default: Optional[ToolRegistry] = None
+
+
+def registry() -> ToolRegistry:
+    """Return the process-wide registry."""
+    global _default
+    if _default is None:
+        _default = ToolRegistry()
+    return _default
+
+
+def execute_batch(
+    calls: List[Dict[str, Any]],
+    interface: int,
+    data: Optional[Dict[str, Any]],
+    keep: Optional[Iterable[int]] = None,
+) -> List[Optional[str]]:
+    """ToolRegistry.execute_batch on the process-wide registry."""
+    return registry().execute_batch(calls, interface, data, keep)
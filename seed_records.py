@@ -0,0 +1,295 @@
+"""
+Business rules of the seed data, one record at a time.
+
+seed_data.generate_payroll_data and seed_stream both build every record
+with these functions. They differ only in how they find a record's
+inputs: seed_data reads them from the records it generated before,
+seed_stream computes them in closed form from the record's index. Names,
+roles, companies and services are passed in, because seed_data draws
+them from Faker one by one and seed_stream from pools.
+
+Dates are whole days since START, at noon UTC.
+"""
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+NOW = datetime(2025, 9, 23, 12, 0, 0, tzinfo=timezone.utc)
+START = NOW - timedelta(days=3 * 365)
+HISTORY_DAYS = 3 * 365
+NOW_ISO = NOW.isoformat()
+
+Record = Dict[str, Any]
+
+
+def seed_id(prefix: str, n: int) -> str:
+    """Incremental id with a zero-padded number, e.g. emp_007."""
+    return f"{prefix}_{n:03d}"
+
+
+@lru_cache(maxsize=None)
+def timestamp(day: int) -> str:
+    return (START + timedelta(days=day)).isoformat()
+
+
+@lru_cache(maxsize=None)
+def date(day: int) -> str:
+    return (START + timedelta(days=day)).date().isoformat()
+
+
+def day_of(iso: str) -> int:
+    """Inverse of timestamp()."""
+    return (datetime.fromisoformat(iso) - START).days
+
+
+def department(j: int, name: str, head_id: Optional[str]) -> Record:
+    return {"department_id": seed_id("dept", j), "name": name + " Department", "head_id": head_id}
+
+
+def onboarding_day(i: int, requests: int) -> int:
+    """Requests are spread evenly over the history."""
+    return ((i - 1) * HISTORY_DAYS) // requests
+
+
+def salary(i: int) -> int:
+    """Salary requested by onboarding request i."""
+    return 80000 + (i % 5) * 15000
+
+
+def onboarding_request(i: int, requests: int, departments: int, name: str, role: str, legal_name: str, service: str) -> Record:
+    """
+    Request i of `requests`. Requests alternate vendor/employee and cycle
+    pending/approved/rejected; the caller adds entity_id to approved
+    employee requests.
+    """
+    entity_type = ("employee", "vendor")[i % 2]
+    return {
+        "request_id": seed_id("onb", i),
+        "entity_type": entity_type,
+        "department_id": seed_id("dept", (i - 1) % departments + 1) if entity_type == "employee" else None,
+        "requested_by": f"emp_{i % 5 + 1:03d}",
+        "requested_data": {
+            "name": name,
+            "role": role,
+            "salary": salary(i),
+            "tax_id": f"TAX-{i:05d}",
+            "bank_account_number": f"{entity_type[:4].upper()}{i:010d}",
+            "bank_routing_number": f"{(100000000 + (i % 900000000)):09d}",
+            "legal_name": legal_name,
+            "service": service,
+        },
+        "status": ("pending", "approved", "rejected")[i % 3],
+        "created_at": timestamp(onboarding_day(i, requests)),
+        "updated_at": NOW_ISO,
+    }
+
+
+def employee(employee_id: str, request: Record) -> Record:
+    """The employee onboarded by an approved request."""
+    data = request["requested_data"]
+    return {
+        "employee_id": employee_id,
+        "name": data["name"],
+        "role": data["role"],
+        "salary": data["salary"],
+        "tax_id": data["tax_id"],
+        "bank_account_number": data["bank_account_number"],
+        "bank_routing_number": data["bank_routing_number"],
+        "department_id": request["department_id"],
+        "created_at": request["created_at"],
+        "updated_at": NOW_ISO,
+        "status": "active",
+    }
+
+
+def vendor(vendor_id: str, request: Record) -> Record:
+    """The vendor onboarded by an approved request."""
+    data = request["requested_data"]
+    return {
+        "vendor_id": vendor_id,
+        "legal_name": data["legal_name"],
+        "tax_id": data["tax_id"],
+        "bank_account_number": data["bank_account_number"],
+        "bank_routing_number": data["bank_routing_number"],
+        "service": data["service"],
+        "created_at": request["created_at"],
+        "updated_at": NOW_ISO,
+        "status": "active",
+    }
+
+
+def run_days(i: int) -> Tuple[int, int]:
+    """First and last day of payroll run i: two weeks, then one week off."""
+    start = 21 * (i - 1)
+    return start, start + 14
+
+
+def payroll_run(i: int) -> Record:
+    start, end = run_days(i)
+    return {
+        "payroll_run_id": seed_id("prun", i),
+        "payroll_period_start": date(start),
+        "payroll_period_end": date(end),
+        "status": ("draft", "pending_approval", "approved", "executed", "failed")[i % 5],
+        "created_at": timestamp(start),
+        "updated_at": NOW_ISO,
+    }
+
+
+def run_selection(i: int, hired: int, max_pays: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Positions [first, last] (1-based) among the `hired` employees hired by
+    the end of run i that the run pays: a quarter of them, at least one,
+    starting at i % hired. (1, 0) when nobody is hired yet.
+    """
+    if hired == 0:
+        return 1, 0
+    count = max(1, hired // 4)
+    if max_pays is not None:
+        count = min(count, max_pays)
+    first = i % hired + 1
+    return first, min(first + count - 1, hired)
+
+
+def employee_pay(n: int, run: int, employee_id: str, pay: Tuple[float, float, float]) -> Record:
+    """Pay n of the run, paid n % 5 days after the period ends."""
+    gross, deductions, net = pay
+    return {
+        "pay_id": seed_id("epay", n),
+        "employee_id": employee_id,
+        "payroll_run_id": seed_id("prun", run),
+        "gross_pay": gross,
+        "deductions": deductions,
+        "net_pay": net,
+        "status": ("pending", "paid", "failed", "disputed")[n % 4],
+        "paid_at": timestamp(run_days(run)[1] + n % 5),
+    }
+
+
+def order_day(i: int, orders: int, vendor_day: int) -> int:
+    """Orders are spread over the history, counted from their vendor's onboarding."""
+    return vendor_day + ((i - 1) * HISTORY_DAYS) // orders
+
+
+def order_amount(i: int) -> int:
+    return 500 + (i % 10) * 500
+
+
+def order(i: int, vendor_id: str, legal_name: str, day: int) -> Record:
+    order_id = seed_id("ord", i)
+    return {
+        "order_id": order_id,
+        "vendor_id": vendor_id,
+        "order_type": ("goods", "services", "licensing")[i % 3],
+        "description": f"Order {order_id} for {legal_name}",
+        "amount": order_amount(i),
+        "status": ("open", "fulfilled", "cancelled")[i % 3],
+        "created_at": timestamp(day),
+        "updated_at": NOW_ISO,
+    }
+
+
+def invoice_day(i: int, order_day: int) -> int:
+    return order_day + i % 30
+
+
+def invoice(i: int, vendor_id: str, day: int) -> Record:
+    """The invoice of order i, due 30 days after it is issued."""
+    return {
+        "invoice_id": seed_id("inv", i),
+        "vendor_id": vendor_id,
+        "order_id": seed_id("ord", i),
+        "amount": order_amount(i),
+        "due_date": date(day + 30),
+        "status": ("draft", "pending_approval", "approved", "paid", "rejected")[i % 5],
+        "created_at": timestamp(day),
+        "updated_at": NOW_ISO,
+    }
+
+
+def payment_day(j: int, entity_day: int) -> int:
+    return entity_day + j % 10
+
+
+def payment(j: int, entity_id: str, entity_type: str, amount: Any, entity_day: int) -> Record:
+    """Payment j (0-based) of an employee pay or invoice."""
+    return {
+        "payment_id": seed_id("pay", j + 1),
+        "entity_id": entity_id,
+        "entity_type": entity_type,
+        "amount": amount,
+        "method": ("bank_transfer", "check", "wallet")[j % 3],
+        "status": ("completed", "pending", "failed")[j % 3],
+        "executed_at": timestamp(payment_day(j, entity_day)),
+    }
+
+
+def approval(n: int, i: int, entity_type: str, entity_id: str, approver_id: str, entity_day: int) -> Record:
+    """Approval n, of the i-th (0-based) entity of its type."""
+    return {
+        "approval_id": seed_id("app", n),
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "approver_id": approver_id,
+        "level": (i % 3) + 1,
+        "decision": ("approved", "rejected", "escalated")[i % 3],
+        "comments": f"Approval comments for {entity_type} {entity_id}",
+        "created_at": timestamp(entity_day + i % 10),
+        "updated_at": NOW_ISO,
+    }
+
+
+def disputed(i: int) -> bool:
+    """Whether the i-th (0-based) entity of a dispute type is disputed."""
+    return i % 5 == 0
+
+
+def dispute(n: int, i: int, dispute_type: str, entity_id: str, raised_by: str, entity_day: int) -> Record:
+    dispute_id = seed_id("disp", n)
+    return {
+        "dispute_id": dispute_id,
+        "dispute_type": dispute_type,
+        "entity_id": entity_id,
+        "raised_by": raised_by,
+        "description": f"Dispute for {dispute_type} ID: {entity_id}",
+        "resolution": f"Resolution for {dispute_type} dispute {dispute_id}",
+        "status": ("open", "under_review", "resolved", "escalated")[i % 4],
+        "created_at": timestamp(entity_day + i % 10),
+        "updated_at": NOW_ISO,
+    }
+
+
+def offboarded(i: int) -> bool:
+    """Whether the i-th (0-based) employee or vendor, employees first, is offboarded."""
+    return i % 4 == 0
+
+
+def offboarding_request(n: int, i: int, entity_id: str, entity_type: str, entity_day: int) -> Record:
+    return {
+        "request_id": seed_id("off", n),
+        "entity_id": entity_id,
+        "entity_type": entity_type,
+        "reason": f"Offboarding reason for {entity_type} {entity_id}",
+        "status": ("pending", "approved", "rejected", "completed")[i % 4],
+        "created_at": timestamp(entity_day + i % 30),
+        "updated_at": NOW_ISO,
+    }
+
+
+def audited(i: int) -> bool:
+    """Whether the i-th (0-based) entity, over all audited types in order, has an audit entry."""
+    return i % 3 == 0
+
+
+def audit_log(n: int, i: int, entity_type: str, entity_id: str, performed_by: str) -> Record:
+    """Audit entry n, n seconds before NOW."""
+    return {
+        "audit_id": seed_id("audit", n),
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "action_performed": ("created", "approved", "rejected", "paid", "updated")[i % 5],
+        "timestamp": (NOW - timedelta(seconds=n)).isoformat(),
+        "performed_by": performed_by,
+        "role": ("system", "HR", "Finance")[i % 3],
+        "details": {},
+    }
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Streaming, scale-parameterized variant of seed_data.generate_payroll_data.
+
+Every record is a closed-form function of its index and the scale, so
+each table can be generated on its own, in its own process, and written
+to disk record by record without holding the database in memory. The
+records themselves are built by seed_records, like seed_data.py's, so
+both have the same schema, id formats and business rules: employees and
+vendors come from approved onboarding requests, payroll runs pay a slice
+of the employees hired before the period ends, and so on. Output is
+deterministic for a given seed and scale, whatever the number of
+processes.
+
+Names, roles, companies and services are drawn from pools of POOL_SIZE
+values built once per process with Faker (seeded) instead of calling
+Faker per record; without Faker installed the pools are synthesized from
+the same seed.
+
+Usage:
+    python seed_stream.py --employees 1000000 --vendors 100000 --payroll-runs 500 \\
+        --orders 1000000 --out data_large [--processes 8] [--format json|snap]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from functools import lru_cache
+from multiprocessing import Pool
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import seed_records as records
+from payroll_engine import compute_pay
+from seed_records import HISTORY_DAYS, seed_id as _id
+from serialization import encode_compact
+from snapfile import SUFFIX as SNAPSHOT_SUFFIX, write_snapshot_items
+
+try:
+    from faker import Faker
+except ImportError:  # Faker is optional here; pools are synthesized instead.
+    Faker = None
+
+POOL_SIZE = 1024
+
+TABLES = (
+    "departments", "onboarding_requests", "employees", "vendors", "payroll_runs",
+    "employee_pays", "orders", "invoices", "payments", "approvals", "disputes",
+    "offboarding_requests", "audit_logs",
+)
+
+Record = Tuple[str, Dict[str, Any]]
+
+
+class Scale:
+    """Table sizes and the derived quantities shared by the generators."""
+
+    def __init__(
+        self,
+        employees: int = 7,
+        vendors: int = 7,
+        payroll_runs: int = 20,
+        orders: int = 30,
+        departments: int = 5,
+        max_pays_per_run: Optional[int] = None,
+        seed: int = 42,
+        onboarding: Optional[int] = None,
+    ):
+        if employees < 1 or vendors < 1 or departments < 1:
+            raise ValueError("employees, vendors and departments must be at least 1")
+        # Requests alternate employee/vendor and cycle pending/approved/rejected,
+        # so every sixth request is an approved employee (and a vendor).
+        needed = max(6 * employees - 2, 6 * vendors - 5)
+        if onboarding is not None and onboarding < needed:
+            raise ValueError(f"onboarding must be at least {needed} for {employees} employees and {vendors} vendors")
+        self.employees = employees
+        self.vendors = vendors
+        self.payroll_runs = payroll_runs
+        self.orders = orders
+        self.departments = departments
+        self.max_pays_per_run = max_pays_per_run
+        self.seed = seed
+        self.onboarding = onboarding if onboarding is not None else 6 * max(employees, vendors)
+        self._pools: Optional[Dict[str, List[str]]] = None
+
+    def args(self) -> tuple:
+        return (self.employees, self.vendors, self.payroll_runs, self.orders, self.departments, self.max_pays_per_run, self.seed, self.onboarding)
+
+    # --- value pools -------------------------------------------------------
+
+    def pool(self, kind: str, n: int) -> str:
+        if self._pools is None:
+            self._pools = _build_pools(self.seed)
+        return self._pools[kind][(n * 2654435761) % POOL_SIZE]
+
+    # --- onboarding, employees, vendors ------------------------------------
+
+    def onboarding_day(self, i: int) -> int:
+        return records.onboarding_day(i, self.onboarding)
+
+    def employee_request(self, k: int) -> int:
+        return 6 * k - 2
+
+    def vendor_request(self, k: int) -> int:
+        return 6 * k - 5
+
+    def employee_day(self, k: int) -> int:
+        return self.onboarding_day(self.employee_request(k))
+
+    def vendor_day(self, k: int) -> int:
+        return self.onboarding_day(self.vendor_request(k))
+
+    def hired_by(self, day: int) -> int:
+        """Number of employees created on or before `day` (they are hired in id order)."""
+        k = (((day + 1) * self.onboarding - 1) // HISTORY_DAYS + 3) // 6
+        return max(0, min(self.employees, k))
+
+    def employee(self, n: int) -> str:
+        """Id of the n-th employee, 0-based and wrapping."""
+        return _id("emp", n % self.employees + 1)
+
+    def vendor(self, n: int) -> str:
+        return _id("vend", n % self.vendors + 1)
+
+    # --- payroll ------------------------------------------------------------
+
+    def run_selection(self, i: int) -> Tuple[int, int]:
+        """Employee numbers [first, last] paid by run i, or (1, 0) when none."""
+        return records.run_selection(i, self.hired_by(records.run_days(i)[1]), self.max_pays_per_run)
+
+    def pays(self) -> Iterator[Tuple[int, int, int, int]]:
+        """Yield (pay number, run, employee number, paid day) for every employee pay."""
+        n = 0
+        for i in range(1, self.payroll_runs + 1):
+            first, last = self.run_selection(i)
+            end = records.run_days(i)[1]
+            for k in range(first, last + 1):
+                n += 1
+                yield n, i, k, end + n % 5
+
+    def pay_count(self) -> int:
+        total = 0
+        for i in range(1, self.payroll_runs + 1):
+            first, last = self.run_selection(i)
+            total += max(0, last - first + 1)
+        return total
+
+    # --- orders and invoices -------------------------------------------------
+
+    def order_day(self, i: int) -> int:
+        return records.order_day(i, self.orders, self.vendor_day((i - 1) % self.vendors + 1))
+
+    def invoice_day(self, i: int) -> int:
+        return records.invoice_day(i, self.order_day(i))
+
+    def request(self, i: int) -> Dict[str, Any]:
+        """Onboarding request i, without its entity_id."""
+        return records.onboarding_request(
+            i, self.onboarding, self.departments,
+            self.pool("name", i), self.pool("job", i), self.pool("company", i), self.pool("phrase", i),
+        )
+
+
+def _build_pools(seed: int) -> Dict[str, List[str]]:
+    if Faker is not None:
+        Faker.seed(seed)
+        fake = Faker("en_US")
+        return {
+            "name": [fake.name() for _ in range(POOL_SIZE)],
+            "job": [fake.job() for _ in range(POOL_SIZE)],
+            "company": [fake.company() for _ in range(POOL_SIZE)],
+            "phrase": [fake.catch_phrase() for _ in range(POOL_SIZE)],
+        }
+    rng = random.Random(seed)
+    syllables = ["ka", "lo", "mi", "ra", "te", "vin", "sa", "dor", "el", "an", "ber", "co"]
+
+    def word() -> str:
+        return "".join(rng.choice(syllables) for _ in range(rng.randint(2, 3))).capitalize()
+
+    return {
+        "name": [f"{word()} {word()}" for _ in range(POOL_SIZE)],
+        "job": [f"{word()} Specialist" for _ in range(POOL_SIZE)],
+        "company": [f"{word()} {rng.choice(['LLC', 'Inc', 'Group', 'and Sons'])}" for _ in range(POOL_SIZE)],
+        "phrase": [f"{word()} {word().lower()} services" for _ in range(POOL_SIZE)],
+    }
+
+
+# --- table generators ---------------------------------------------------------
+
+def gen_departments(s: Scale) -> Iterator[Record]:
+    for j in range(1, s.departments + 1):
+        yield _id("dept", j), records.department(j, s.pool("job", j), s.employee(j - 1))
+
+
+def gen_onboarding_requests(s: Scale) -> Iterator[Record]:
+    for i in range(1, s.onboarding + 1):
+        rec = s.request(i)
+        if rec["status"] == "approved":
+            employee = rec["entity_type"] == "employee"
+            k, limit = ((i + 2) // 6, s.employees) if employee else ((i + 5) // 6, s.vendors)
+            # Approved requests beyond the requested scale are declined.
+            if k > limit:
+                rec["status"] = "rejected"
+            elif employee:
+                rec["entity_id"] = _id("emp", k)
+        yield rec["request_id"], rec
+
+
+def gen_employees(s: Scale) -> Iterator[Record]:
+    for k in range(1, s.employees + 1):
+        employee_id = _id("emp", k)
+        yield employee_id, records.employee(employee_id, s.request(s.employee_request(k)))
+
+
+def gen_vendors(s: Scale) -> Iterator[Record]:
+    for k in range(1, s.vendors + 1):
+        vendor_id = _id("vend", k)
+        yield vendor_id, records.vendor(vendor_id, s.request(s.vendor_request(k)))
+
+
+def gen_payroll_runs(s: Scale) -> Iterator[Record]:
+    for i in range(1, s.payroll_runs + 1):
+        yield _id("prun", i), records.payroll_run(i)
+
+
+@lru_cache(maxsize=None)
+def _pay_for_salary(salary: int) -> Tuple[float, float, float]:
+    return compute_pay(salary)
+
+
+def _pay_amounts(s: Scale, k: int) -> Tuple[float, float, float]:
+    """Pay of employee k, whose salary is that of its onboarding request."""
+    return _pay_for_salary(records.salary(s.employee_request(k)))
+
+
+def gen_employee_pays(s: Scale) -> Iterator[Record]:
+    for n, run, k, _ in s.pays():
+        yield _id("epay", n), records.employee_pay(n, run, _id("emp", k), _pay_amounts(s, k))
+
+
+def gen_orders(s: Scale) -> Iterator[Record]:
+    for i in range(1, s.orders + 1):
+        k = (i - 1) % s.vendors + 1
+        yield _id("ord", i), records.order(i, _id("vend", k), s.pool("company", s.vendor_request(k)), s.order_day(i))
+
+
+def gen_invoices(s: Scale) -> Iterator[Record]:
+    for i in range(1, s.orders + 1):
+        yield _id("inv", i), records.invoice(i, _id("vend", (i - 1) % s.vendors + 1), s.invoice_day(i))
+
+
+def _payment_entities(s: Scale) -> Iterator[Tuple[str, str, float, int]]:
+    """(entity_id, entity_type, amount, start day) of every paid entity, in payment order."""
+    for n, _, k, paid_day in s.pays():
+        yield _id("epay", n), "employee_pay", _pay_amounts(s, k)[2], paid_day
+    for i in range(1, s.orders + 1):
+        yield _id("inv", i), "invoice", records.order_amount(i), s.invoice_day(i)
+
+
+def gen_payments(s: Scale) -> Iterator[Record]:
+    for j, (entity_id, entity_type, amount, day) in enumerate(_payment_entities(s)):
+        yield _id("pay", j + 1), records.payment(j, entity_id, entity_type, amount, day)
+
+
+def gen_approvals(s: Scale) -> Iterator[Record]:
+    entities: List[Tuple[str, str, int, Callable[[int], int]]] = [
+        ("payroll_run", "prun", s.payroll_runs, lambda i: records.run_days(i)[0]),
+        ("invoice", "inv", s.orders, s.invoice_day),
+        ("order", "ord", s.orders, s.order_day),
+        ("onboarding", "onb", s.onboarding, s.onboarding_day),
+    ]
+    n = 0
+    for entity_type, prefix, count, created_day in entities:
+        for i in range(count):
+            n += 1
+            yield _id("app", n), records.approval(n, i, entity_type, _id(prefix, i + 1), s.employee(i), created_day(i + 1))
+
+
+def gen_disputes(s: Scale) -> Iterator[Record]:
+    payment_days = ((_id("pay", j + 1), records.payment_day(j, day)) for j, (_, _, _, day) in enumerate(_payment_entities(s)))
+    entities = [
+        ("payroll", ((_id("epay", n), paid_day) for n, _, _, paid_day in s.pays())),
+        ("invoice", ((_id("inv", i), s.invoice_day(i)) for i in range(1, s.orders + 1))),
+        ("payment", payment_days),
+    ]
+    n = 0
+    for dispute_type, stream in entities:
+        for i, (entity_id, day) in enumerate(stream):
+            if not records.disputed(i):
+                continue
+            n += 1
+            raised_by = s.employee(i) if dispute_type == "payroll" else s.vendor(i)
+            yield _id("disp", n), records.dispute(n, i, dispute_type, entity_id, raised_by, day)
+
+
+def _offboarded(s: Scale) -> Iterator[Tuple[int, str, str, int]]:
+    """(index, entity_id, entity_type, created day) of every entity, employees first."""
+    for k in range(1, s.employees + 1):
+        yield k - 1, _id("emp", k), "employee", s.employee_day(k)
+    for k in range(1, s.vendors + 1):
+        yield s.employees + k - 1, _id("vend", k), "vendor", s.vendor_day(k)
+
+
+def gen_offboarding_requests(s: Scale) -> Iterator[Record]:
+    n = 0
+    for i, entity_id, entity_type, day in _offboarded(s):
+        if not records.offboarded(i):
+            continue
+        n += 1
+        yield _id("off", n), records.offboarding_request(n, i, entity_id, entity_type, day)
+
+
+def gen_audit_logs(s: Scale) -> Iterator[Record]:
+    payments = s.pay_count() + s.orders
+    offboardings = (s.employees + s.vendors + 3) // 4
+    entities = [
+        ("payroll_run", "prun", s.payroll_runs),
+        ("invoice", "inv", s.orders),
+        ("payment", "pay", payments),
+        ("onboarding", "onb", s.onboarding),
+        ("offboarding", "off", offboardings),
+    ]
+    i = 0
+    n = 0
+    for entity_type, prefix, count in entities:
+        for m in range(1, count + 1):
+            if records.audited(i):
+                n += 1
+                yield _id("audit", n), records.audit_log(n, i, entity_type, _id(prefix, m), s.employee(i))
+            i += 1
+
+
+GENERATORS: Dict[str, Callable[[Scale], Iterator[Record]]] = {
+    "departments": gen_departments,
+    "onboarding_requests": gen_onboarding_requests,
+    "employees": gen_employees,
+    "vendors": gen_vendors,
+    "payroll_runs": gen_payroll_runs,
+    "employee_pays": gen_employee_pays,
+    "orders": gen_orders,
+    "invoices": gen_invoices,
+    "payments": gen_payments,
+    "approvals": gen_approvals,
+    "disputes": gen_disputes,
+    "offboarding_requests": gen_offboarding_requests,
+    "audit_logs": gen_audit_logs,
+}
+
+
+# --- writers ------------------------------------------------------------------
+
+def write_json_items(path: str, items: Iterator[Record]) -> int:
+    """Stream (key, record) pairs into a compact JSON object at `path`."""
+    count = 0
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("{")
+        for key, rec in items:
+            f.write(("," if count else "") + encode_compact(key) + ":" + encode_compact(rec))
+            count += 1
+        f.write("}")
+    os.replace(tmp, path)
+    return count
+
+
+def generate_table(name: str, scale_args: tuple, out_dir: str, fmt: str = "json") -> Tuple[str, int, float]:
+    """Generate table `name` into `out_dir`; returns (name, records, seconds)."""
+    start = time.perf_counter()
+    scale = Scale(*scale_args)
+    items = GENERATORS[name](scale)
+    if fmt == "snap":
+        count = write_snapshot_items(os.path.join(out_dir, name + SNAPSHOT_SUFFIX), items)
+    else:
+        count = write_json_items(os.path.join(out_dir, f"{name}.json"), items)
+    return name, count, time.perf_counter() - start
+
+
+def _generate_table(task: tuple) -> Tuple[str, int, float]:
+    return generate_table(*task)
+
+
+def generate_streaming(
+    out_dir: str,
+    scale: Scale,
+    processes: Optional[int] = None,
+    fmt: str = "json",
+    tables: Optional[List[str]] = None,
+) -> Iterator[Tuple[str, int, float]]:
+    """
+    Generate `tables` (default: all) into `out_dir`, one table per task,
+    across `processes` worker processes (default: one per CPU; 1 runs
+    in-process). Yields (name, records, seconds) as tables complete.
+    """
+    if fmt not in ("json", "snap"):
+        raise ValueError(f"unknown format {fmt!r}")
+    os.makedirs(out_dir, exist_ok=True)
+    # Longest tables first so they do not end up last on a busy pool.
+    names = sorted(tables or TABLES, key=lambda n: n not in ("employee_pays", "payments", "disputes", "audit_logs"))
+    tasks = [(name, scale.args(), out_dir, fmt) for name in names]
+    if processes == 1:
+        for task in tasks:
+            yield _generate_table(task)
+        return
+    with Pool(processes) as pool:
+        yield from pool.imap_unordered(_generate_table, tasks)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Stream a scaled payroll dataset to disk.")
+    parser.add_argument("--employees", type=int, default=7)
+    parser.add_argument("--vendors", type=int, default=7)
+    parser.add_argument("--payroll-runs", type=int, default=20)
+    parser.add_argument("--orders", type=int, default=30)
+    parser.add_argument("--departments", type=int, default=5)
+    parser.add_argument("--max-pays-per-run", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    # No default: the committed fixtures live in data/ and must not be overwritten by accident.
+    parser.add_argument("--out", required=True, help="directory to write the tables to")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--format", choices=("json", "snap"), default="json")
+    parser.add_argument("--tables", nargs="*", choices=TABLES)
+    args = parser.parse_args(argv)
+    scale = Scale(args.employees, args.vendors, args.payroll_runs, args.orders, args.departments, args.max_pays_per_run, args.seed)
+    start = time.perf_counter()
+    total = 0
+    for name, count, seconds in generate_streaming(args.out, scale, args.processes, args.format, args.tables):
+        total += count
+        print(f"{name}: {count} records in {seconds:.2f}s")
+    print(f"Wrote {total} records to {args.out} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,178 @@
+"""
+JSON encoding and decoding for tool results and data files.
+
+Tool results are encoded by dumps(). By default its output is exactly
+json.dumps(obj), so callers that compare or parse tool output see no
+change. Harnesses that only parse the output can switch to compact
+results with configure(compact=True) or TOOL_JSON_COMPACT=1, which drops
+the separator spaces and uses orjson when it is installed.
+
+Data files and the write-ahead log are written compact unless
+pretty-printing is requested, and read with orjson when it is installed.
+"""
+import asyncio
+import json
+import os
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List
+
+from pagination import Page
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is used instead.
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _encode_other(obj: Any) -> Any:
+    """Encode non-dict mappings, such as compact records, as objects."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_default_encode = json.JSONEncoder(default=_encode_other).encode
+_compact_encode = json.JSONEncoder(separators=(",", ":"), default=_encode_other).encode
+_pretty_encode = json.JSONEncoder(indent=2, default=_encode_other).encode
+
+_compact = os.environ.get("TOOL_JSON_COMPACT", "") not in ("", "0")
+# Longest stretch, in seconds, adumps() encodes before yielding to the event loop.
+YIELD_INTERVAL = 0.002
+_discarding: ContextVar[bool] = ContextVar("discarding_results", default=False)
+# What dumps() returns for a failed result inside discarded().
+_DISCARDED_FAILURE = '{"success": false}'
+
+
+def configure(compact: bool) -> None:
+    """Select compact (True) or json.dumps-compatible (False) tool results."""
+    global _compact
+    _compact = compact
+
+
+def encode_compact(obj: Any) -> str:
+    """Single-line JSON without separator spaces, through orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_encode_other, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return _compact_encode(obj)
+
+
+@contextmanager
+def discarded() -> Iterator[None]:
+    """
+    Skip encoding the tool results produced inside the block: nobody reads
+    them. dumps() returns "" instead, or '{"success": false}' for a failed
+    result so that callers counting failures still see it.
+    """
+    token = _discarding.set(True)
+    try:
+        yield
+    finally:
+        _discarding.reset(token)
+
+
+def dumps(result: Any) -> str:
+    """Encode a tool result. Page values are streamed row by row (see iter_json)."""
+    if _discarding.get():
+        return _DISCARDED_FAILURE if isinstance(result, dict) and result.get("success") is False else ""
+    if isinstance(result, dict):
+        for value in result.values():
+            if isinstance(value, Page):
+                return "".join(iter_json(result))
+    return encode_compact(result) if _compact else _default_encode(result)
+
+
+def failed(output: Any) -> bool:
+    """
+    Whether a tool's output reports failure, i.e. its top-level "success"
+    is false. Entries further down (the per-record results of the bulk
+    tools) do not count. Only outputs that mention a false success are
+    parsed.
+    """
+    if not isinstance(output, str) or ('"success": false' not in output and '"success":false' not in output):
+        return False
+    try:
+        result = loads(output)
+    except ValueError:
+        return False
+    return isinstance(result, dict) and result.get("success") is False
+
+
+async def adumps(result: Any) -> str:
+    """
+    dumps() for coroutines. Page values, whose rows are usually produced by
+    a scan as they are encoded, are encoded row by row, and the event loop
+    gets control back at least every YIELD_INTERVAL seconds.
+    """
+    if _discarding.get() or not (isinstance(result, dict) and any(isinstance(v, Page) for v in result.values())):
+        return dumps(result)
+    parts = []
+    deadline = time.perf_counter() + YIELD_INTERVAL
+    for chunk in iter_json(result):
+        parts.append(chunk)
+        if time.perf_counter() >= deadline:
+            await asyncio.sleep(0)
+            deadline = time.perf_counter() + YIELD_INTERVAL
+    return "".join(parts)
+
+
+def iter_json(result: Dict[str, Any]) -> Iterator[str]:
+    """
+    Serialize a tool result in chunks, one per row of each Page value.
+
+    The output is exactly dumps(result) with every Page replaced by the
+    list of its rows; paginated Pages also add a "next_cursor" key at the
+    end. No list of rows is built along the way.
+    """
+    if _compact:
+        encode, item_sep, key_sep = encode_compact, ",", ":"
+    else:
+        encode, item_sep, key_sep = _default_encode, ", ", ": "
+    pages: List[Page] = []
+    sep = "{"
+    for key, value in result.items():
+        yield sep + encode(key) + key_sep
+        sep = item_sep
+        if isinstance(value, Page):
+            pages.append(value)
+            first = True
+            yield "["
+            for row in value:
+                yield encode(row) if first else item_sep + encode(row)
+                first = False
+            yield "]"
+        else:
+            yield encode(value)
+    for page in pages:
+        if page.paginated:
+            yield sep + '"next_cursor"' + key_sep + encode(page.next_cursor)
+            sep = item_sep
+    yield "{}" if sep == "{" else "}"
+
+
+def loads(data: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_file(path: str) -> Any:
+    with open(path, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dump_file(path: str, obj: Any, pretty: bool = False) -> None:
+    """Write `obj` to `path`, compact unless `pretty`."""
+    if orjson is not None:
+        raw = orjson.dumps(obj, default=_encode_other, option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0))
+    else:
+        raw = (_pretty_encode(obj) if pretty else _compact_encode(obj)).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(raw)
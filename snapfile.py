@@ -0,0 +1,283 @@
+"""
+Binary, memory-mapped table snapshots (<table>.snap).
+
+A snapshot file holds one table: every record as a length-prefixed blob
+(the record's key followed by its compact JSON), an array of record
+offsets in table order and, for tables keyed by id, the record numbers
+sorted by key. Opening a snapshot maps the file and reads the header
+only; records are decoded when they are first accessed, and keys are
+found by binary search over the sorted array, so the cost of opening a
+table does not depend on its size.
+
+Layout (little endian):
+
+    header   magic "TAUSNAP1", shape (u8: 0 list, 1 dict), count (u32),
+             offsets position (u64), sorted-keys position (u64)
+    records  count x [key length (u32), body length (u32), key, body]
+    offsets  count x u64, position of each record, in table order
+    sorted   count x u32, record numbers ordered by key (dict tables)
+"""
+import mmap
+import os
+import struct
+from collections.abc import Mapping, MutableMapping, MutableSequence, ValuesView
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from serialization import encode_compact, loads
+
+MAGIC = b"TAUSNAP1"
+SUFFIX = ".snap"
+_HEADER = struct.Struct("<8sBIQQ")
+_RECORD = struct.Struct("<II")
+_OFFSET = struct.Struct("<Q")
+_RECNO = struct.Struct("<I")
+
+
+def write_snapshot(path: str, rows: Union[List[Any], Dict[str, Any]]) -> int:
+    """Write `rows` (a dict keyed by id or a list) as a snapshot at `path`."""
+    keyed = isinstance(rows, Mapping)
+    return write_snapshot_items(path, rows.items() if keyed else (("", rec) for rec in rows), keyed)
+
+
+def write_snapshot_items(path: str, items: Iterable[Tuple[Any, Any]], keyed: bool = True) -> int:
+    """
+    Stream (key, record) pairs into a snapshot at `path` and return the
+    record count. Only record offsets and keys are held in memory.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"\0" * _HEADER.size)
+        offsets = []
+        keys = []
+        for key, rec in items:
+            key_raw = str(key).encode("utf-8")
+            body = encode_compact(rec).encode("utf-8")
+            offsets.append(f.tell())
+            keys.append(key_raw)
+            f.write(_RECORD.pack(len(key_raw), len(body)))
+            f.write(key_raw)
+            f.write(body)
+        offsets_pos = f.tell()
+        f.write(b"".join(_OFFSET.pack(o) for o in offsets))
+        sorted_pos = 0
+        if keyed:
+            sorted_pos = f.tell()
+            f.write(b"".join(_RECNO.pack(i) for i in sorted(range(len(keys)), key=keys.__getitem__)))
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, 1 if keyed else 0, len(offsets), offsets_pos, sorted_pos))
+    os.replace(tmp, path)
+    return len(offsets)
+
+
+class SnapshotFile:
+    """Read-only access to the records of one snapshot file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, shape, self.count, self._offsets, self._sorted = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a table snapshot")
+        self.keyed = shape == 1
+
+    def _position(self, i: int) -> int:
+        return _OFFSET.unpack_from(self._mm, self._offsets + 8 * i)[0]
+
+    def key(self, i: int) -> str:
+        pos = self._position(i)
+        key_len, _ = _RECORD.unpack_from(self._mm, pos)
+        start = pos + _RECORD.size
+        return self._mm[start:start + key_len].decode("utf-8")
+
+    def record(self, i: int) -> Any:
+        pos = self._position(i)
+        key_len, body_len = _RECORD.unpack_from(self._mm, pos)
+        start = pos + _RECORD.size + key_len
+        return loads(self._mm[start:start + body_len])
+
+    def find(self, key: str) -> Optional[int]:
+        """Record number of `key`, by binary search over the sorted keys."""
+        if not self.keyed or not isinstance(key, str):
+            return None
+        target = key.encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            i = _RECNO.unpack_from(self._mm, self._sorted + 4 * mid)[0]
+            pos = self._position(i)
+            key_len, _ = _RECORD.unpack_from(self._mm, pos)
+            start = pos + _RECORD.size
+            probe = self._mm[start:start + key_len]
+            if probe < target:
+                lo = mid + 1
+            elif probe > target:
+                hi = mid
+            else:
+                return i
+        return None
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+class _Values(ValuesView):
+    def __iter__(self):
+        return self._mapping._values()
+
+
+class SnapshotDict(MutableMapping):
+    """
+    Dict-shaped table backed by a SnapshotFile.
+
+    Records are decoded on first access and then kept, so in-place updates
+    stick. Writes never touch the file: replaced records stay in the
+    decoded cache, new keys go to an in-memory overlay and deleted keys are
+    remembered, which keeps dict iteration order. `convert`, when set, is
+    applied to every record as it is decoded.
+    """
+
+    def __init__(self, snapshot: SnapshotFile, convert: Optional[Callable[[Any], Any]] = None):
+        self.snapshot = snapshot
+        self.convert = convert
+        self._decoded: Dict[int, Any] = {}
+        self._added: Dict[str, Any] = {}
+        self._deleted: Set[str] = set()
+
+    def _record(self, i: int) -> Any:
+        rec = self._decoded.get(i)
+        if rec is None:
+            rec = self.snapshot.record(i)
+            if self.convert is not None:
+                rec = self.convert(rec)
+            self._decoded[i] = rec
+        return rec
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._added:
+            return self._added[key]
+        i = self.snapshot.find(key)
+        if i is None or key in self._deleted:
+            raise KeyError(key)
+        return self._record(i)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        i = self.snapshot.find(key)
+        if i is None or key in self._deleted:
+            self._deleted.discard(key)
+            self._added[key] = value
+        else:
+            self._decoded[i] = value
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._added:
+            return True
+        return key not in self._deleted and self.snapshot.find(key) is not None  # type: ignore[arg-type]
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._added:
+            del self._added[key]
+            return
+        i = self.snapshot.find(key)
+        if i is None or key in self._deleted:
+            raise KeyError(key)
+        self._deleted.add(key)
+        self._decoded.pop(i, None)
+
+    def __iter__(self) -> Iterator[str]:
+        deleted = self._deleted
+        for i in range(self.snapshot.count):
+            key = self.snapshot.key(i)
+            if not deleted or key not in deleted:
+                yield key
+        yield from self._added
+
+    def __len__(self) -> int:
+        return self.snapshot.count - len(self._deleted) + len(self._added)
+
+    def values(self) -> ValuesView:
+        return _Values(self)
+
+    def _values(self) -> Iterator[Any]:
+        deleted = self._deleted
+        for i in range(self.snapshot.count):
+            if deleted and self.snapshot.key(i) in deleted:
+                continue
+            yield self._record(i)
+        yield from self._added.values()
+
+
+class SnapshotList(MutableSequence):
+    """
+    List-shaped table backed by a SnapshotFile. Appends stay in memory;
+    any other structural change first copies the records into a list.
+    `convert` is applied to records as they are decoded, as in SnapshotDict.
+    """
+
+    def __init__(self, snapshot: SnapshotFile, convert: Optional[Callable[[Any], Any]] = None):
+        self.snapshot = snapshot
+        self.convert = convert
+        self._decoded: Dict[int, Any] = {}
+        self._added: List[Any] = []
+        self._items: Optional[List[Any]] = None
+
+    def _record(self, i: int) -> Any:
+        rec = self._decoded.get(i)
+        if rec is None:
+            rec = self.snapshot.record(i)
+            if self.convert is not None:
+                rec = self.convert(rec)
+            self._decoded[i] = rec
+        return rec
+
+    def _materialize(self) -> List[Any]:
+        if self._items is None:
+            self._items = [self._record(i) for i in range(self.snapshot.count)] + self._added
+        return self._items
+
+    def __getitem__(self, i):
+        if self._items is not None or isinstance(i, slice):
+            return self._materialize()[i]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("list index out of range")
+        count = self.snapshot.count
+        return self._record(i) if i < count else self._added[i - count]
+
+    def __setitem__(self, i, value) -> None:
+        self._materialize()[i] = value
+
+    def __delitem__(self, i) -> None:
+        del self._materialize()[i]
+
+    def __len__(self) -> int:
+        if self._items is not None:
+            return len(self._items)
+        return self.snapshot.count + len(self._added)
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._items is not None:
+            return iter(self._items)
+        return self._iter()
+
+    def _iter(self) -> Iterator[Any]:
+        for i in range(self.snapshot.count):
+            yield self._record(i)
+        yield from self._added
+
+    def insert(self, i: int, value: Any) -> None:
+        if self._items is None and i >= len(self):
+            self._added.append(value)
+        else:
+            self._materialize().insert(i, value)
+
+    def append(self, value: Any) -> None:
+        self.insert(len(self), value)
+
+
+def open_snapshot(path: str, convert: Optional[Callable[[Any], Any]] = None) -> Union[SnapshotDict, SnapshotList]:
+    """Map the snapshot at `path` as a dict- or list-shaped table."""
+    snapshot = SnapshotFile(path)
+    return SnapshotDict(snapshot, convert) if snapshot.keyed else SnapshotList(snapshot, convert)
@@ -0,0 +1,306 @@
+from collections.abc import MutableMapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from instrumentation import scanned, written
+from table_store import Table, TableStore, _id_number
+
+
+class OverlayTable(Table):
+    """
+    Copy-on-write view of another table.
+
+    Reads fall through to `base`. The first update of a base record copies
+    it into the overlay (a shadow) and later reads return the copy; inserts
+    are kept in the overlay as well, so `base` is never modified and the
+    cost of the overlay follows the number of records written, not the
+    size of the table. Records added here come after the base records.
+    """
+
+    def __init__(self, base: Table, on_write=None):
+        super().__init__(base.name, base.rows, base.primary_key, on_write)
+        self.base = base
+        self._shadows: Dict[int, Dict[str, Any]] = {}  # id(base record) -> copy
+        self._origin: Dict[int, int] = {}  # id(copy) -> id(base record)
+        self._added: List[Dict[str, Any]] = []
+        self._own_indexes: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+
+    @property
+    def keyed(self) -> bool:
+        return self.base.keyed
+
+    def __len__(self) -> int:
+        return len(self.base) + len(self._added)
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        shadows = self._shadows
+        for rec in self.base.records():
+            yield shadows.get(id(rec), rec)
+        yield from self._added
+
+    def sequence(self) -> Sequence:
+        return _OverlayRows(self.base.sequence(), self._shadows, self._added)
+
+    def bucket(self, fields: Tuple[str, ...], key: Tuple) -> List[Dict[str, Any]]:
+        return self.find(dict(zip(fields, key)))
+
+    def materialize(self) -> Union[List[Dict[str, Any]], Dict[Any, Dict[str, Any]]]:
+        """Return the table as a new list or dict, in the shape of the base rows."""
+        if self.keyed:
+            return {rec.get(self.key_field): rec for rec in self.records()}
+        return list(self.records())
+
+    def get(self, key: Any, field: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        field = field or self.primary_key
+        rec = self.base.get(key, field)
+        if rec is not None and id(rec) not in self._shadows:
+            return rec
+        own = self._own_index(field).get(key)
+        if own is not None:
+            return own
+        if rec is not None:
+            # The base's first match was changed away from `key`; look further.
+            for rec in self.base.find({field: key}):
+                if id(rec) not in self._shadows:
+                    return rec
+        return None
+
+    def find(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Table.find() in records() order: a shadow takes the place of its
+        base record and added records come last. The base is searched
+        through its indexes, unless a shadow was changed to match when its
+        base record does not; the overlay is then scanned.
+        """
+        items = list(criteria.items())
+        out = []
+        seen: Set[int] = set()
+        for rec in self.base.find(criteria):
+            own = self._shadows.get(id(rec))
+            if own is None:
+                out.append(rec)
+            else:
+                seen.add(id(own))
+                if all(own.get(k) == v for k, v in items):
+                    out.append(own)
+        for own in self._shadows.values():
+            if id(own) not in seen and all(own.get(k) == v for k, v in items):
+                scanned(self.name, len(self))
+                return [rec for rec in self.records() if all(rec.get(k) == v for k, v in items)]
+        out.extend(rec for rec in self._added if all(rec.get(k) == v for k, v in items))
+        return out
+
+    def conflict(
+        self,
+        record: Dict[str, Any],
+        exclude: Optional[Dict[str, Any]] = None,
+        changed: Optional[Iterable[str]] = None,
+    ) -> Optional[str]:
+        """
+        Table.conflict() over the overlay view: base holders that have a
+        shadow are skipped, and the overlay's own records are checked
+        through its own indexes, which insert/update keep current.
+        """
+        changed = set(changed) if changed is not None else None
+        for fields, name in self._unique.items():
+            if changed is not None and changed.isdisjoint(fields):
+                continue
+            key = tuple(record.get(f) for f in fields)
+            if None in key:
+                continue
+            criteria = dict(zip(fields, key))
+            try:
+                own = key[0] in self._own_index(fields[0])
+            except TypeError:
+                continue
+            holders = [rec for rec in self.base.find(criteria) if id(rec) not in self._shadows]
+            if own:
+                holders += [rec for rec in self._own_records() if all(rec.get(f) == v for f, v in criteria.items())]
+            if any(rec is not exclude for rec in holders):
+                return name
+        return None
+
+    def next_id(self, prefix: str, field: Optional[str] = None, width: int = 3) -> str:
+        field = field or self.primary_key
+        seq = (field, prefix)
+        n = self._sequences.get(seq)
+        if n is None:
+            n = _id_number(self.base.next_id(prefix, field, width), prefix) - 1
+            for rec in self._own_records():
+                n = max(n, _id_number(rec.get(field), prefix))
+            self._sequences[seq] = n
+        return f"{prefix}_{(n + 1):0{width}d}"
+
+    def insert(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        old = None
+        if self.keyed:
+            key = record.get(self.key_field)
+            if key is None:
+                raise ValueError(f"{self.name} record has no {self.key_field}")
+            old = self.get(key, self.key_field)
+        if old is None:
+            self._added.append(record)
+        elif id(old) in self._origin:
+            self._shadow(self._origin.pop(id(old)), record)
+        elif self._added and any(rec is old for rec in self._added):
+            self._added[next(i for i, rec in enumerate(self._added) if rec is old)] = record
+        else:
+            self._shadow(id(old), record)
+        if old is not None:
+            self._own_indexes.clear()
+        self._index_own(record)
+        self._advance(record)
+        written(self.name)
+        if self.on_write is not None:
+            self.on_write(self.name, record, True)
+        return record
+
+    def update(self, record: Dict[str, Any], changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply `changes` to the overlay's copy of `record` and return the copy."""
+        if id(record) not in self._origin and not any(rec is record for rec in self._added):
+            record = self._shadow(id(record), dict(record))
+        for field in [f for f in self._own_indexes if f in changes and changes[f] != record.get(f)]:
+            del self._own_indexes[field]
+        record.update(changes)
+        self._index_own(record)
+        self._advance(record)
+        written(self.name)
+        if self.on_write is not None:
+            self.on_write(self.name, record, False)
+        return record
+
+    def _shadow(self, base_id: int, record: Dict[str, Any]) -> Dict[str, Any]:
+        self._shadows[base_id] = record
+        self._origin[id(record)] = base_id
+        return record
+
+    def _own_records(self) -> Iterator[Dict[str, Any]]:
+        yield from self._shadows.values()
+        yield from self._added
+
+    def _own_index(self, field: str) -> Dict[Any, Dict[str, Any]]:
+        index = self._own_indexes.get(field)
+        if index is None:
+            index = {}
+            for rec in self._own_records():
+                value = rec.get(field)
+                if value is not None and value not in index:
+                    index[value] = rec
+            self._own_indexes[field] = index
+        return index
+
+    def _index_own(self, record: Dict[str, Any]) -> None:
+        for field, index in self._own_indexes.items():
+            value = record.get(field)
+            if value is not None and value not in index:
+                index[value] = record
+
+
+class _OverlayRows(Sequence):
+    """OverlayTable records by position: the base rows, shadowed, then the added ones."""
+
+    def __init__(self, base: Sequence, shadows: Dict[int, Dict[str, Any]], added: List[Dict[str, Any]]):
+        self.base = base
+        self.shadows = shadows
+        self.added = added
+
+    def __len__(self) -> int:
+        return len(self.base) + len(self.added)
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        n = len(self.base)
+        if i < n:
+            rec = self.base[i]
+            return self.shadows.get(id(rec), rec)
+        return self.added[i - n]
+
+
+class Snapshot(TableStore):
+    """
+    Copy-on-write fork of a base database for one episode.
+
+    Creating a Snapshot is O(1): every table starts as an OverlayTable over
+    the base table, so only records a tool writes are copied and the base
+    (including its indexes) is shared by all forks and never modified.
+    Build the base TableStore once and fork it per episode:
+
+        base = TableStore(data)
+        db = Snapshot(base)
+        sp = db.savepoint()
+        ...
+        db.rollback(sp)   # undo everything since the savepoint
+        db.reset()        # back to the base state
+
+    Savepoints stack overlay layers, so rollback and reset only drop layers
+    and cost nothing proportional to the database size. `db[name]` returns
+    a new container built from the current view of the table; tools write
+    through table() as usual.
+    """
+
+    def __init__(self, base: MutableMapping):
+        super().__init__({})
+        self.base = base if isinstance(base, TableStore) else TableStore(base)
+        self._layers: List[Dict[str, Optional[Table]]] = [{}]
+
+    def savepoint(self) -> int:
+        """Start a new layer and return a token for rollback()."""
+        self._layers.append({})
+        return len(self._layers) - 1
+
+    def rollback(self, savepoint: int = 0) -> None:
+        """Discard every write made since `savepoint` (default: since the fork)."""
+        if not 0 <= savepoint < len(self._layers):
+            raise ValueError(f"unknown savepoint {savepoint}")
+        del self._layers[savepoint:]
+        self._layers.append({})
+
+    def reset(self) -> None:
+        self._layers = [{}]
+
+    def table(self, name: str, create: Optional[type] = None) -> Table:
+        top = self._layers[-1]
+        table = top.get(name)
+        if table is not None:
+            return table
+        below = None if name in top else self._lookup(name, len(self._layers) - 1)
+        if below is not None:
+            table = OverlayTable(below, on_write=self._written)
+        elif create is None:
+            return Table(name, [])
+        else:
+            table = Table(name, create(), on_write=self._written)
+        top[name] = table
+        return table
+
+    def _lookup(self, name: str, depth: int) -> Optional[Table]:
+        """Visible table `name` below layer `depth`, or None if there is none."""
+        for layer in reversed(self._layers[:depth]):
+            if name in layer:
+                return layer[name]
+        if self.base.get(name) is None:
+            return None
+        return self.base.table(name)
+
+    def __getitem__(self, name: str) -> Any:
+        table = self._lookup(name, len(self._layers))
+        if table is None:
+            raise KeyError(name)
+        if isinstance(table, OverlayTable):
+            return table.materialize()
+        return table.rows
+
+    def __setitem__(self, name: str, rows: Any) -> None:
+        self._layers[-1][name] = Table(name, rows, on_write=self._written)
+
+    def __delitem__(self, name: str) -> None:
+        if self._lookup(name, len(self._layers)) is None:
+            raise KeyError(name)
+        self._layers[-1][name] = None
+
+    def __iter__(self) -> Iterator[str]:
+        names = dict.fromkeys(self.base)
+        for layer in self._layers:
+            names.update(dict.fromkeys(layer))
+        return (name for name in names if self._lookup(name, len(self._layers)) is not None)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
@@ -0,0 +1,498 @@
+from collections.abc import Mapping, MutableMapping, Sequence
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from instrumentation import scanned, written
+
+Rows = Union[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]
+
+# Primary key field of every table shipped in data/. The JSON files are keyed
+# by this value; list-shaped tables carry it on each record.
+PRIMARY_KEYS: Dict[str, str] = {
+    "approvals": "approval_id",
+    "audit_log": "audit_id",
+    "audit_logs": "audit_id",
+    "departments": "department_id",
+    "disputes": "dispute_id",
+    "employee_pays": "pay_id",
+    "employees": "employee_id",
+    "invoices": "invoice_id",
+    "offboarding_requests": "request_id",
+    "onboarding_requests": "request_id",
+    "orders": "order_id",
+    "payments": "payment_id",
+    "payroll_runs": "payroll_run_id",
+    "vendors": "vendor_id",
+}
+
+# Dict-shaped tables whose keys are not their primary key values: table ->
+# field the keys are taken from. Every other dict table is keyed by primary
+# key, so a primary key lookup that misses the mapping misses the table.
+KEY_FIELDS: Dict[str, str] = {}
+
+# Declared secondary (non-unique) indexes per table. Each entry is a tuple of
+# fields; find() uses the widest index covered by its criteria.
+SECONDARY_INDEXES: Dict[str, List[Tuple[str, ...]]] = {
+    "approvals": [("approver_id",), ("entity_type", "entity_id")],
+    "audit_log": [("entity_type", "entity_id"), ("entity_id",)],
+    "audit_logs": [("entity_type", "entity_id"), ("entity_id",)],
+    "disputes": [("entity_id",)],
+    "employee_pays": [("payroll_run_id",), ("employee_id",)],
+    "employees": [("department_id",)],
+    "invoices": [("vendor_id",), ("order_id",)],
+    "offboarding_requests": [("entity_id",)],
+    "orders": [("vendor_id",)],
+    "payments": [("entity_id",)],
+}
+
+# Declared unique indexes per table: fields -> name of the constraint. Values
+# must not repeat within the table; Table.conflict() checks a record against
+# them in O(1). They are kept as secondary indexes, so find() uses them too.
+_PARTY_UNIQUE: Dict[Tuple[str, ...], str] = {
+    ("tax_id",): "tax_id",
+    ("bank_account_number", "bank_routing_number"): "bank_account",
+}
+UNIQUE_INDEXES: Dict[str, Dict[Tuple[str, ...], str]] = {
+    "employees": _PARTY_UNIQUE,
+    "vendors": _PARTY_UNIQUE,
+}
+
+
+def _id_number(value: Any, prefix: str) -> int:
+    """Numeric part of a `<prefix>_<n>` id, or 0 when `value` is not one."""
+    if isinstance(value, str) and value.startswith(prefix + "_"):
+        try:
+            return int(value[len(prefix) + 1:])
+        except ValueError:
+            return 0
+    return 0
+
+
+class Table:
+    """
+    Indexed view over one table of the tool database.
+
+    The underlying rows stay in whatever shape the caller handed in: a dict
+    (or other mutable mapping) keyed by primary key, as in data/*.json, or
+    a list of records. Lookups on the field a dict is keyed by (see
+    KEY_FIELDS) are one mapping lookup and never scan, hit or miss.
+    Other lookups go through hash indexes that are built on first use and
+    kept in step by insert/update. The invariant is that every change to the rows
+    goes through the table, except appending records (or adding new keys)
+    behind its back, which the next lookup picks up: the only check made is
+    on the row count (see _sync), so records edited, replaced or removed
+    behind the table's back with the count unchanged leave the indexes stale.
+
+    Tables listed in SECONDARY_INDEXES also get non-unique hash indexes
+    that serve find(). Like the lookup indexes they are built on first use
+    and then maintained incrementally; a record moved into a bucket by
+    update() is appended to it.
+
+    A transient table (one wrapped for a single call, see TableStore.of)
+    does not build an index for the first lookup on a field: it scans the
+    rows, stopping at the first match where it can, and builds the index
+    only if the call looks the field up again.
+
+    Tables listed in UNIQUE_INDEXES check candidate records with conflict().
+    The constraint is not enforced by insert/update themselves: callers
+    decide how to report a violation, and rows loaded with duplicates stay
+    readable.
+
+    next_id() hands out `<prefix>_<n>` ids from a per-prefix sequence that is
+    seeded from the largest existing id and then advanced by every insert,
+    including inserts that carry an explicit id. Seeding scans the table,
+    so ids are O(1) only on a table that is kept, such as those of a held
+    TableStore: a transient table seeds its sequence on every call.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rows: Rows,
+        primary_key: Optional[str] = None,
+        on_write: Optional[Callable[[str, Dict[str, Any], bool], None]] = None,
+        transient: bool = False,
+    ):
+        self.name = name
+        self.rows = rows
+        self._keyed = isinstance(rows, Mapping)
+        self.primary_key = primary_key or PRIMARY_KEYS.get(name, "id")
+        self.key_field = KEY_FIELDS.get(name, self.primary_key) if self._keyed else None
+        self.on_write = on_write
+        self.transient = transient
+        self._scanned_once: Set[Any] = set()
+        self._indexes: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+        self._unique = UNIQUE_INDEXES.get(name, {})
+        self._declared = SECONDARY_INDEXES.get(name, []) + list(self._unique)
+        self._secondary: Dict[Tuple[str, ...], Dict[Tuple, List[Dict[str, Any]]]] = {}
+        self._sequences: Dict[Tuple[str, str], int] = {}
+        self._keys: Optional[List[Any]] = None
+        self._indexed = 0
+
+    @property
+    def keyed(self) -> bool:
+        """True when the rows are a mapping keyed by primary key."""
+        return self._keyed
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.records())
+
+    def records(self):
+        """Iterate over the records regardless of the table shape."""
+        if self._keyed:
+            return self.rows.values()
+        return self.rows
+
+    def sequence(self) -> Sequence:
+        """
+        The records in table order, by position, so that a scan can resume
+        where an earlier one stopped. List tables return their rows. Dict
+        tables return a view through a list of their keys, built on first
+        use and extended by inserts; replacing a record keeps its position.
+        """
+        if not self._keyed:
+            return self.rows
+        self._sync()
+        if self._keys is None:
+            self._keys = list(self.rows)
+            scanned(self.name, len(self._keys))
+        return _RowsByKey(self.rows, self._keys)
+
+    def get(self, key: Any, field: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return the first record whose `field` (primary key by default) equals
+        `key`, or None.
+        """
+        field = field or self.primary_key
+        scanned(self.name, 1)
+        if field == self.key_field:
+            try:
+                rec = self.rows.get(key)
+            except TypeError:
+                return None
+            return rec if rec is not None and rec.get(field) == key else None
+        if self._scan_first(field):
+            if key is None:
+                return None
+            for n, rec in enumerate(self.records(), 1):
+                if rec.get(field) == key:
+                    scanned(self.name, n)
+                    return rec
+            scanned(self.name, len(self.rows))
+            return None
+        return self._index(field).get(key)
+
+    def find(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Return every record whose fields equal all values in `criteria`.
+
+        When a declared secondary index is covered by the criteria only its
+        bucket is examined, so the cost follows the result size; otherwise
+        the table is scanned.
+        """
+        fields = self.covering_index(criteria)
+        if fields is not None:
+            candidates = self.bucket(fields, tuple(criteria[f] for f in fields))
+        else:
+            self._sync()
+            candidates = self.records()
+            scanned(self.name, len(self.rows))
+        items = list(criteria.items())
+        return [r for r in candidates if all(r.get(k) == v for k, v in items)]
+
+    def bucket(self, fields: Tuple[str, ...], key: Tuple) -> Sequence[Dict[str, Any]]:
+        """
+        The records whose `fields` equal `key`, from the declared index on
+        `fields`. The returned list is the live index bucket: do not modify
+        it, and copy it before writing to the table while iterating.
+        """
+        if self._scan_first(fields):
+            bucket = [rec for rec in self.records() if tuple(rec.get(f) for f in fields) == key]
+            scanned(self.name, len(self.rows))
+            return bucket
+        bucket = self._secondary_index(fields).get(key, ())
+        scanned(self.name, len(bucket))
+        return bucket
+
+    def conflict(
+        self,
+        record: Dict[str, Any],
+        exclude: Optional[Dict[str, Any]] = None,
+        changed: Optional[Iterable[str]] = None,
+    ) -> Optional[str]:
+        """
+        Name of the first unique index whose values in `record` already
+        belong to a record other than `exclude`, or None. Indexes with a
+        missing value in `record` are not checked, nor, when `changed` is
+        given, indexes none of whose fields are in it.
+        """
+        changed = set(changed) if changed is not None else None
+        for fields, name in self._unique.items():
+            if changed is not None and changed.isdisjoint(fields):
+                continue
+            key = tuple(record.get(f) for f in fields)
+            if None in key:
+                continue
+            try:
+                holders = self.bucket(fields, key)
+            except TypeError:
+                continue
+            if any(rec is not exclude for rec in holders):
+                return name
+        return None
+
+    def next_id(self, prefix: str, field: Optional[str] = None, width: int = 3) -> str:
+        """
+        Return the id following the largest `<prefix>_<n>` value of `field`
+        (primary key by default), zero-padded to `width` digits. The id is
+        not reserved until a record carrying it is inserted.
+        """
+        field = field or self.primary_key
+        self._sync()
+        seq = (field, prefix)
+        n = self._sequences.get(seq)
+        if n is None:
+            n = max((_id_number(rec.get(field), prefix) for rec in self.records()), default=0)
+            scanned(self.name, len(self.rows))
+            self._sequences[seq] = n
+        return f"{prefix}_{(n + 1):0{width}d}"
+
+    def insert(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Add a record, under its key field (see KEY_FIELDS) when the table is a dict."""
+        self._sync()
+        if self._keyed:
+            key = record.get(self.key_field)
+            if key is None:
+                raise ValueError(f"{self.name} record has no {self.key_field}")
+            old = self.rows.get(key)
+            if old is not None:
+                self._drop(old)
+            elif self._keys is not None:
+                self._keys.append(key)
+            self.rows[key] = record
+        else:
+            self.rows.append(record)
+        self._indexed = len(self.rows)
+        self._add(record)
+        written(self.name)
+        if self.on_write is not None:
+            self.on_write(self.name, record, True)
+        return record
+
+    def update(self, record: Dict[str, Any], changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply `changes` to a record of this table in place."""
+        stale = [f for f in self._indexes if f in changes and changes[f] != record.get(f)]
+        for field in stale:
+            # Rebuilt lazily; dropping keeps first-match semantics when
+            # several records share the old value.
+            del self._indexes[field]
+        moved = [
+            fields for fields in self._secondary
+            if any(f in changes and changes[f] != record.get(f) for f in fields)
+        ]
+        for fields in moved:
+            self._unbucket(fields, record)
+        record.update(changes)
+        for fields in moved:
+            self._secondary[fields].setdefault(tuple(record.get(f) for f in fields), []).append(record)
+        self._advance(record)
+        written(self.name)
+        if self.on_write is not None:
+            self.on_write(self.name, record, False)
+        return record
+
+    def build_indexes(self) -> None:
+        """
+        Build the primary key index (for list tables) and every declared
+        secondary index now instead of on first use, e.g. before forking
+        processes that should share them.
+        """
+        if not self._keyed:
+            self._index(self.primary_key)
+        for fields in self._declared:
+            self._secondary_index(fields)
+
+    def _scan_first(self, index: Any) -> bool:
+        """
+        True when a transient table should serve this lookup on `index` (a
+        field or a tuple of fields) by scanning: it is the first one and
+        the index is not built yet.
+        """
+        if not self.transient or index in self._indexes or index in self._secondary or index in self._scanned_once:
+            return False
+        self._scanned_once.add(index)
+        return True
+
+    def _index(self, field: str) -> Dict[Any, Dict[str, Any]]:
+        self._sync()
+        index = self._indexes.get(field)
+        if index is None:
+            index = {}
+            for rec in self.records():
+                value = rec.get(field)
+                if value is not None and value not in index:
+                    index[value] = rec
+            self._indexes[field] = index
+            scanned(self.name, len(self.rows))
+        return index
+
+    def covering_index(self, criteria: Dict[str, Any]) -> Optional[Tuple[str, ...]]:
+        """Widest declared secondary index whose fields all appear in `criteria`."""
+        best = None
+        for fields in self._declared:
+            if all(f in criteria for f in fields) and (best is None or len(fields) > len(best)):
+                best = fields
+        if best is not None:
+            try:
+                hash(tuple(criteria[f] for f in best))
+            except TypeError:
+                return None
+        return best
+
+    def _secondary_index(self, fields: Tuple[str, ...]) -> Dict[Tuple, List[Dict[str, Any]]]:
+        self._sync()
+        index = self._secondary.get(fields)
+        if index is None:
+            index = {}
+            for rec in self.records():
+                index.setdefault(tuple(rec.get(f) for f in fields), []).append(rec)
+            self._secondary[fields] = index
+            scanned(self.name, len(self.rows))
+        return index
+
+    def _unbucket(self, fields: Tuple[str, ...], record: Dict[str, Any]) -> None:
+        key = tuple(record.get(f) for f in fields)
+        bucket = self._secondary[fields].get(key, [])
+        for i, rec in enumerate(bucket):
+            if rec is record:
+                del bucket[i]
+                break
+        if not bucket:
+            self._secondary[fields].pop(key, None)
+
+    def _add(self, record: Dict[str, Any]) -> None:
+        for field, index in self._indexes.items():
+            value = record.get(field)
+            if value is not None and value not in index:
+                index[value] = record
+        for fields, index in self._secondary.items():
+            index.setdefault(tuple(record.get(f) for f in fields), []).append(record)
+        self._advance(record)
+
+    def _advance(self, record: Dict[str, Any]) -> None:
+        for (field, prefix), n in list(self._sequences.items()):
+            m = _id_number(record.get(field), prefix)
+            if m > n:
+                self._sequences[field, prefix] = m
+
+    def _drop(self, record: Dict[str, Any]) -> None:
+        for field in [f for f, index in self._indexes.items() if index.get(record.get(f)) is record]:
+            del self._indexes[field]
+        for fields in self._secondary:
+            self._unbucket(fields, record)
+
+    def _sync(self) -> None:
+        """
+        Catch the indexes up with the row count: index rows appended since
+        the last call, or drop every index if rows were removed.
+        """
+        n = len(self.rows)
+        if n == self._indexed:
+            return
+        if n < self._indexed or not (self._indexes or self._secondary or self._sequences or self._keys is not None):
+            self._indexes.clear()
+            self._secondary.clear()
+            self._sequences.clear()
+            self._keys = None
+        else:
+            if self._keys is not None:
+                self._keys.extend(islice(self.rows, self._indexed, None))
+            tail = islice(self.records(), self._indexed, None)
+            for rec in tail:
+                self._add(rec)
+        self._indexed = n
+
+
+class _RowsByKey(Sequence):
+    """Records of a dict table by position, through a list of its keys."""
+
+    __slots__ = ("rows", "keys")
+
+    def __init__(self, rows: Mapping, keys: List[Any]):
+        self.rows = rows
+        self.keys = keys
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        return self.rows[self.keys[i]]
+
+
+class TableStore(MutableMapping):
+    """
+    Mapping of table name to rows that the tools run against.
+
+    It wraps the `data` dict by reference, so reads and writes go straight
+    through to the caller's tables, and keeps one indexed `Table` per table
+    for O(1) primary key access. Harnesses can pass a TableStore as `data`
+    directly and keep it for the episode, so that the indexes built by one
+    call serve the next; the Table invariant then applies to the harness
+    too. Plain dicts are wrapped for the duration of a call (transient=True),
+    which keeps no reference to them and cannot go stale between calls.
+    Primary key lookups on dict-keyed tables are still O(1) that way; any
+    other lookup, and next_id(), costs a scan per call, as no index or id
+    sequence outlives the call.
+    """
+
+    def __init__(self, data: Optional[MutableMapping] = None, transient: bool = False):
+        self.data = data if data is not None else {}
+        self.transient = transient
+        self._tables: Dict[str, Table] = {}
+
+    @classmethod
+    def of(cls, data: MutableMapping) -> "TableStore":
+        """`data` itself if it is a TableStore, else a transient wrapper around it."""
+        if isinstance(data, TableStore):
+            return data
+        return cls(data, transient=True)
+
+    def table(self, name: str, create: Optional[type] = None) -> Table:
+        """
+        Return the indexed table `name`. Missing tables are created with the
+        `create` shape (list or dict); without it an empty, detached table is
+        returned so that reads never add tables to the database.
+        """
+        rows = self.data.get(name)
+        if rows is None:
+            if create is None:
+                return Table(name, [])
+            rows = self.data.setdefault(name, create())
+        table = self._tables.get(name)
+        if table is None or table.rows is not rows:
+            table = Table(name, rows, on_write=self._written, transient=self.transient)
+            self._tables[name] = table
+        return table
+
+    def _written(self, name: str, record: Dict[str, Any], inserted: bool) -> None:
+        """Called after every insert or update made through `table(name)`."""
+
+    def __getitem__(self, name: str) -> Any:
+        return self.data[name]
+
+    def __setitem__(self, name: str, rows: Any) -> None:
+        self._tables.pop(name, None)
+        self.data[name] = rows
+
+    def __delitem__(self, name: str) -> None:
+        self._tables.pop(name, None)
+        del self.data[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
@@ -0,0 +1,12 @@
+import json
+
+from registry import registry
+
+
+def test_create_approval_request_ignores_caller_approval_id():
+    data = {"approvals": {"app_001": {"approval_id": "app_001", "entity_type": "invoice", "entity_id": "inv_001", "decision": "approved"}}}
+    record = {"approval_id": "app_001", "entity_type": "order", "entity_id": "ord_001", "approver_id": "emp_001", "level": 1}
+    res = json.loads(registry().invoke("create_approval_request", 1, data, record))
+    assert res["created_approval_request"]["approval_id"] == "app_002"
+    assert data["approvals"]["app_001"]["decision"] == "approved"
+    assert data["approvals"]["app_002"]["entity_id"] == "ord_001"
@@ -0,0 +1,30 @@
+import asyncio
+
+from registry import registry
+from table_store import TableStore
+
+TOOL = "get_audit_entries_for_entity"
+
+
+def audit_db(n=500):
+    logs = {}
+    for i in range(n):
+        rec = {"audit_id": f"audit_{i:04d}", "entity_type": "invoice" if i % 3 else "payment", "entity_id": f"inv_{i % 7:03d}"}
+        logs[rec["audit_id"]] = rec
+    return TableStore({"audit_logs": logs})
+
+
+def test_scan_rows_are_streamed():
+    cls = registry().tool_class(TOOL, 1)
+    db = audit_db()
+    res = cls._invoke_internal({"entity_type": "invoice"}, db=db)
+    # Nothing is read until the page is iterated (while it is encoded).
+    db.table("audit_logs").insert({"audit_id": "audit_9999", "entity_type": "invoice", "entity_id": "inv_000"})
+    assert [r["audit_id"] for r in res["audit_entries"]][-1] == "audit_9999"
+
+
+def test_ainvoke_matches_invoke():
+    db = audit_db()
+    for kwargs in ({"entity_type": "invoice"}, {"entity_type": "invoice", "entity_id": "inv_003"}, {"entity_id": "inv_002", "page_size": 5}, {}):
+        expected = registry().invoke(TOOL, 1, db, **kwargs)
+        assert asyncio.run(registry().ainvoke(TOOL, 1, db, **kwargs)) == expected
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+import instrumentation
+from registry import registry
+from snapshot import Snapshot
+from table_store import TableStore
+
+
+def vendor(n, **fields):
+    rec = {"name": f"Vendor {n}", "tax_id": f"T{n}", "bank_account_number": f"A{n}", "bank_routing_number": "R1"}
+    rec.update(fields)
+    return rec
+
+
+def employee(n, **fields):
+    rec = {
+        "name": f"Employee {n}", "role": "Analyst", "salary": 1000, "tax_id": f"T{n}",
+        "bank_account_number": f"A{n}", "bank_routing_number": "R1", "department_id": "dept_001",
+    }
+    rec.update(fields)
+    return rec
+
+
+def call(name, db, *args):
+    return json.loads(registry().invoke(name, 1, db, *args))
+
+
+@pytest.fixture(params=["plain", "snapshot"])
+def db(request):
+    data = {"vendors": {}, "employees": {}, "audit_log": []}
+    return data if request.param == "plain" else Snapshot(TableStore(data))
+
+
+@pytest.mark.parametrize("tool,make", [("bulk_create_vendors", vendor), ("bulk_create_employees", employee)])
+def test_duplicates_within_the_batch_are_rejected(db, tool, make):
+    res = call(tool, db, [make(1), make(2, tax_id="T1"), make(3, bank_account_number="A1"), make(4)])
+    assert res["created_count"] == 2
+    assert [r.get("error") for r in res["results"]] == [None, "duplicate_tax_id", "duplicate_bank_account", None]
+
+
+@pytest.mark.parametrize("tool", ["bulk_create_invoices", "bulk_create_employees", "bulk_create_vendors", "bulk_create_payments"])
+def test_empty_batch_creates_nothing(db, tool):
+    assert call(tool, db, []) == {"success": True, "created_count": 0, "failed_count": 0, "results": []}
+
+
+def test_rejected_records_do_not_fail_the_call_in_metrics():
+    sink = instrumentation.add_sink(instrumentation.MemorySink())
+    try:
+        res = call("bulk_create_invoices", {"invoices": []}, [{"vendor_id": "vend_001"}, {"vendor_id": "vend_001", "amount": 5}])
+        call("bulk_create_invoices", {"invoices": []}, None)
+    finally:
+        instrumentation.remove_sink(sink)
+    assert [r["success"] for r in res["results"]] == [False, True]
+    stats = sink.snapshot()["bulk_create_invoices"]
+    assert (stats["calls"], stats["errors"]) == (2, 1)
@@ -0,0 +1,71 @@
+import copy
+import gc
+import multiprocessing
+import re
+
+import pytest
+
+import episode_runner
+from episode_runner import EpisodeRunner
+from registry import registry
+
+pytestmark = pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs the fork start method")
+
+EPISODE = [
+    {"tool": "update_invoice", "args": ["inv_002", {"status": "paid"}]},
+    {"tool": "get_invoice", "args": ["inv_002"]},
+    {"tool": "create_invoice", "args": [{"vendor_id": "vend_001", "amount": 5}]},
+    {"tool": "query_table", "args": ["invoices"], "kwargs": {"filters": {"vendor_id": "vend_001"}}},
+]
+
+
+def base_data():
+    invoices = {f"inv_{n:03d}": {"invoice_id": f"inv_{n:03d}", "vendor_id": f"vend_{n % 2:03d}", "amount": n, "status": "open"} for n in range(1, 30)}
+    vendors = {f"vend_{n:03d}": {"vendor_id": f"vend_{n:03d}", "legal_name": f"Vendor {n}"} for n in range(2)}
+    return {"invoices": invoices, "vendors": vendors, "audit_log": []}
+
+
+def without_timestamps(results):
+    return [None if r is None else re.sub(r"\d{4}-\d\d-\d\dT[\d:.+]+Z?", "T", r) for r in results]
+
+
+def worker_base(_):
+    """Identity of the worker's base, and how many objects its gc has frozen."""
+    return id(episode_runner._base), gc.get_freeze_count()
+
+
+@pytest.fixture
+def runner():
+    with EpisodeRunner(base_data(), processes=2) as runner:
+        yield runner
+
+
+def test_episodes_match_execute_batch_on_a_copy(runner):
+    expected = without_timestamps(registry().execute_batch(EPISODE, 1, copy.deepcopy(base_data())))
+    results = runner.map([EPISODE] * 6)
+    assert [without_timestamps(r) for r in results] == [expected] * 6
+
+
+def test_episodes_do_not_write_the_base(runner):
+    runner.map([EPISODE] * 3)
+    assert runner.base.table("invoices").get("inv_002")["status"] == "open"
+    assert len(runner.base["invoices"]) == 29
+
+
+def test_keep_limits_the_encoded_results(runner):
+    results = runner.map([EPISODE], keep=[1])[0]
+    assert results[0] is None and results[2:] == [None, None]
+    assert '"status": "paid"' in results[1]
+
+
+def test_workers_share_the_frozen_base(runner):
+    assert gc.get_freeze_count() == 0
+    for base_id, frozen in runner._pool.map(worker_base, range(4)):
+        assert base_id == id(runner.base)
+        assert frozen > 0
+
+
+def test_in_memory_base_needs_fork(monkeypatch):
+    monkeypatch.setattr(multiprocessing, "get_all_start_methods", lambda: ["spawn"])
+    with pytest.raises(RuntimeError, match="fork"):
+        EpisodeRunner(base_data(), processes=1)
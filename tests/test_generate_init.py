@@ -0,0 +1,68 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from generate_init import generate_init_file
+from registry import INTERFACES
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def run(code):
+    """Run `code` in a fresh interpreter at the repository root and return its stdout."""
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return out.stdout.strip()
+
+
+@pytest.mark.parametrize("interface", INTERFACES)
+def test_committed_inits_are_the_lazy_generator_output(tmp_path, interface):
+    package = os.path.join(ROOT, "tools", f"interface_{interface}")
+    copy = tmp_path / f"interface_{interface}"
+    shutil.copytree(package, copy, ignore=shutil.ignore_patterns("__pycache__"))
+    generate_init_file(str(copy), lazy=True)
+    with open(os.path.join(package, "__init__.py")) as committed:
+        assert (copy / "__init__.py").read_text() == committed.read()
+
+
+def test_import_loads_no_tool_module():
+    loaded = run(
+        "import sys, tools.interface_1 as p\n"
+        "print(sorted(m for m in sys.modules if m.startswith('tools.interface_1.')))"
+    )
+    assert loaded == "[]"
+
+
+def test_a_class_imports_only_its_module():
+    loaded = run(
+        "import sys\n"
+        "from tools.interface_1 import GetInvoice\n"
+        "print(GetInvoice.__module__, sorted(m for m in sys.modules if m.startswith('tools.interface_1.')))"
+    )
+    assert loaded == "tools.interface_1.get_invoice ['tools.interface_1.get_invoice']"
+
+
+def test_lazy_and_eager_packages_expose_the_same_tools(tmp_path):
+    eager = tmp_path / "eager" / "interface_2"
+    shutil.copytree(os.path.join(ROOT, "tools", "interface_2"), eager, ignore=shutil.ignore_patterns("__pycache__"))
+    (eager.parent / "__init__.py").write_text("")
+    generate_init_file(str(eager), lazy=False)
+    code = (
+        "import sys\n"
+        f"sys.path[:0] = [{str(tmp_path)!r}, {ROOT!r}]\n"
+        "import eager.interface_2 as e, tools.interface_2 as l\n"
+        "print([c.__name__ for c in e.ALL_TOOLS_INTERFACE_2] == [c.__name__ for c in l.ALL_TOOLS_INTERFACE_2])\n"
+        "print(sorted(dir(l)) == sorted(n for n in dir(e) if not n.startswith('_') and n[0].isupper()))\n"
+        "print(all(getattr(l, c.__name__) is c for c in l.ALL_TOOLS_INTERFACE_2))"
+    )
+    assert run(code).split() == ["True", "True", "True"]
+
+
+def test_unknown_names_raise_attribute_error():
+    import tools.interface_3 as package
+
+    with pytest.raises(AttributeError):
+        package.NoSuchTool
+    assert not hasattr(package, "no_such_tool")
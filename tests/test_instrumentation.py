@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+import pytest
+
+import instrumentation
+from instrumentation import JsonlSink, MemorySink, PrometheusSink
+from registry import registry
+
+
+def invoices(n=20):
+    return {"invoices": {f"inv_{i:03d}": {"invoice_id": f"inv_{i:03d}", "amount": i} for i in range(1, n + 1)}, "audit_log": []}
+
+
+@pytest.fixture
+def sink():
+    sink = instrumentation.add_sink(MemorySink())
+    yield sink
+    instrumentation.remove_sink(sink)
+
+
+def test_calls_are_counted_per_tool(sink):
+    db = invoices()
+    out = registry().invoke("get_invoice", 1, db, "inv_001")
+    registry().invoke("get_invoice", 1, db, "inv_999")
+    registry().invoke("update_invoice", 1, db, "inv_002", {"amount": 5})
+    registry().invoke("query_table", 1, db, "invoices", filters={"amount": {"gt": 10}})
+    stats = sink.snapshot()
+    assert set(stats) == {"get_invoice", "update_invoice", "query_table"}
+    get = stats["get_invoice"]
+    assert (get["calls"], get["errors"]) == (2, 1)
+    assert get["input_size"] == len('[["inv_001"],{}]') + len('[["inv_999"],{}]')
+    assert get["output_size"] == len(out) + len('{"success": false, "error": "not_found"}')
+    assert get["tables_read"] == {"invoices": 2}
+    assert stats["update_invoice"]["tables_written"] == {"invoices": 1, "audit_log": 1}
+    assert stats["query_table"]["rows_scanned"] >= 20
+    assert stats["query_table"]["tables_read"] == {"invoices": 1}
+    assert 0 < get["max_seconds"] <= get["seconds"]
+
+
+def test_removed_sinks_receive_nothing(sink):
+    registry().invoke("get_invoice", 1, invoices(), "inv_001")
+    instrumentation.remove_sink(sink)
+    registry().invoke("get_invoice", 1, invoices(), "inv_001")
+    assert sink.snapshot()["get_invoice"]["calls"] == 1
+    assert sink not in instrumentation.sinks()
+
+
+@pytest.mark.parametrize("tool, args", [("get_invoice", ["inv_001"]), ("query_table", ["invoices"])])
+def test_ainvoke_is_measured_once(sink, tool, args):
+    expected = registry().invoke(tool, 1, invoices(), *args)
+    sink.reset()
+    assert asyncio.run(registry().ainvoke(tool, 1, invoices(), *args)) == expected
+    stats = sink.snapshot()[tool]
+    assert (stats["calls"], stats["errors"], stats["output_size"]) == (1, 0, len(expected))
+
+
+def test_exceptions_count_as_errors(sink):
+    with pytest.raises(TypeError):
+        registry().invoke("get_invoice", 1, invoices())
+    assert sink.snapshot()["get_invoice"]["errors"] == 1
+
+
+def test_jsonl_sink_writes_a_line_per_call(tmp_path):
+    path = tmp_path / "calls.jsonl"
+    sink = instrumentation.add_sink(JsonlSink(str(path)))
+    try:
+        registry().invoke("get_invoice", 1, invoices(), "inv_001")
+        registry().invoke("update_invoice", 1, invoices(), "inv_404", {})
+    finally:
+        instrumentation.remove_sink(sink)
+        sink.close()
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(r["tool"], r["error"]) for r in lines] == [("get_invoice", False), ("update_invoice", True)]
+    assert lines[0]["tables_read"] == ["invoices"] and lines[0]["tables_written"] == []
+    assert set(lines[0]) == set(instrumentation.CallStats("x").to_dict())
+
+
+def test_prometheus_sink_renders_counters_and_histogram():
+    sink = instrumentation.add_sink(PrometheusSink(prefix="t"))
+    try:
+        db = invoices()
+        registry().invoke("get_invoice", 1, db, "inv_001")
+        registry().invoke("get_invoice", 1, db, "missing")
+    finally:
+        instrumentation.remove_sink(sink)
+    lines = sink.render().splitlines()
+    assert "# TYPE t_call_seconds histogram" in lines
+    assert 't_call_seconds_bucket{tool="get_invoice",le="+Inf"} 2' in lines
+    assert 't_call_seconds_count{tool="get_invoice"} 2' in lines
+    assert 't_errors_total{tool="get_invoice"} 1' in lines
+    assert 't_table_reads_total{tool="get_invoice",table="invoices"} 2' in lines
+    buckets = [int(line.rsplit(" ", 1)[1]) for line in lines if line.startswith("t_call_seconds_bucket")]
+    assert buckets == sorted(buckets)
+
+
+def test_without_sinks_calls_are_not_measured(monkeypatch):
+    assert instrumentation.sinks() == []
+
+    def start(*args):
+        raise AssertionError("measured a call without sinks")
+
+    monkeypatch.setattr(instrumentation, "_start", start)
+    assert json.loads(registry().invoke("get_invoice", 1, invoices(), "inv_001"))["success"]
@@ -0,0 +1,27 @@
+import os
+
+from compact import CompactRecord
+from persistence import LazyDatabase
+from snapfile import SUFFIX, write_snapshot
+
+
+def test_compact_snapshot_tables_are_compacted_on_decode(tmp_path):
+    invoices = {
+        "inv_001": {"invoice_id": "inv_001", "status": "open", "amount": 1},
+        "inv_002": {"invoice_id": "inv_002", "status": "paid", "amount": 2},
+        "inv_003": {"invoice_id": "inv_003", "note": "outside the schema"},
+    }
+    audit = [{"audit_id": "audit_001", "entity_id": "inv_001"}]
+    write_snapshot(os.path.join(tmp_path, "invoices" + SUFFIX), invoices)
+    write_snapshot(os.path.join(tmp_path, "audit_log" + SUFFIX), audit)
+
+    db = LazyDatabase(str(tmp_path), compact=True)
+    rows = db["invoices"]
+    assert isinstance(rows["inv_002"], CompactRecord)
+    assert type(rows["inv_003"]) is dict
+    assert {k: dict(v) for k, v in rows.items()} == invoices
+    assert isinstance(db["audit_log"][0], CompactRecord)
+    assert [dict(r) for r in db["audit_log"]] == audit
+
+    plain = LazyDatabase(str(tmp_path))
+    assert type(plain["invoices"]["inv_001"]) is dict
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from pagination import Page
+from query import Query
+from registry import registry
+from table_store import TableStore
+
+
+def approvals(n=120):
+    rows = {}
+    for i in range(1, n + 1):
+        rows[f"appr_{i:03d}"] = {
+            "approval_id": f"appr_{i:03d}",
+            "approver_id": f"emp_{i % 3:03d}",
+            "decision": None if i % 4 else "approved",
+            "amount": (i * 37) % 50,
+        }
+    return rows
+
+
+def pages(db, page_size, **kwargs):
+    """Every page of query_table on approvals, as lists of approval ids."""
+    out, cursor = [], None
+    while True:
+        res = json.loads(registry().invoke("query_table", 1, db, "approvals", page_size=page_size, cursor=cursor, **kwargs))
+        assert res["success"], res
+        out.append([r["approval_id"] for r in res["results"]])
+        cursor = res["next_cursor"]
+        if cursor is None:
+            return out
+
+
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {"filters": {"approver_id": "emp_001"}},
+    {"filters": {"approver_id": {"in": ["emp_002", "emp_000"]}}},
+    {"filters": {"approval_id": {"in": ["appr_005", "appr_001", "appr_100"]}}},
+    {"filters": {"decision": None}, "offset": 7, "limit": 50},
+    {"filters": {"amount": {"gte": 10}}, "order_by": "amount"},
+    {"order_by": ["decision", "amount"], "descending": True, "offset": 3, "limit": 61},
+])
+@pytest.mark.parametrize("page_size", [1, 7, 500])
+def test_pages_concatenate_to_the_unpaginated_result(kwargs, page_size):
+    db = TableStore({"approvals": approvals()})
+    whole = json.loads(registry().invoke("query_table", 1, db, "approvals", **kwargs))["results"]
+    got = pages(db, page_size, **kwargs)
+    assert sum(got, []) == [r["approval_id"] for r in whole]
+    assert all(len(p) == page_size for p in got[:-1])
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"filters": {"approver_id": "emp_001"}}, {"order_by": "amount"}])
+def test_inserts_between_pages_do_not_shift_them(kwargs):
+    db = TableStore({"approvals": approvals()})
+    table = db.table("approvals")
+    first = Page(table, Query(**kwargs), page_size=10)
+    seen = [r["approval_id"] for r in first]
+    # Sorts and is filtered before every row of the first page.
+    table.insert({"approval_id": "appr_000", "approver_id": "emp_001", "decision": None, "amount": -1})
+    second = [r["approval_id"] for r in Page(table, Query(**kwargs), page_size=10, cursor=first.next_cursor)]
+    assert len(second) == 10
+    assert not set(second) & set(seen) and "appr_000" not in second
+    if "order_by" not in kwargs:
+        expected = [r["approval_id"] for r in Query(**kwargs).run(table) if r["approval_id"] != "appr_000"]
+        assert second == expected[10:20]
+
+
+def test_deep_pages_read_only_their_rows():
+    class Rows(list):
+        reads = 0
+
+        def __getitem__(self, i):
+            Rows.reads += 1
+            return list.__getitem__(self, i)
+
+    table = TableStore({"approvals": Rows(approvals(3000).values())}).table("approvals")
+    query = Query({"amount": {"gte": 0}})
+    page = Page(table, query, page_size=10)
+    for _ in range(200):
+        Rows.reads = 0
+        page = Page(table, query, page_size=10, cursor=page.next_cursor)
+        assert len(list(page)) == 10
+        assert Rows.reads <= 12
+
+
+def test_cursors_are_bound_to_their_query():
+    db = TableStore({"approvals": approvals()})
+    res = json.loads(registry().invoke("get_pending_approvals", 1, db, "emp_001", page_size=5))
+    cursor = res["next_cursor"]
+    other = json.loads(registry().invoke("get_pending_approvals", 1, db, "emp_002", cursor=cursor))
+    assert other == {"success": False, "error": "Invalid Pagination"}
+    for bad in ("not-a-cursor", cursor[:-3]):
+        res = json.loads(registry().invoke("query_table", 1, db, "approvals", page_size=5, cursor=bad))
+        assert res["error"] == "invalid_pagination"
@@ -0,0 +1,58 @@
+import json
+import random
+
+import pytest
+
+import payroll_engine
+from payroll_engine import PayrollColumns, compute_pay, compute_pay_cents
+from registry import registry
+
+
+def salaries(n=500, seed=0):
+    rng = random.Random(seed)
+    values = [rng.randint(0, 50_000_000) / 100 for _ in range(n)]
+    # Exact halves of a cent per period, missing and string salaries.
+    values += [0.12, 0.36, 0.60, 1.20, 24.12, None, 0, "85000", "1234.56"]
+    return values
+
+
+@pytest.mark.parametrize("num, den, expected", [
+    (1, 2, 0), (3, 2, 2), (5, 2, 2), (7, 2, 4), (12, 24, 0), (36, 24, 2), (60, 24, 2), (59, 24, 2), (61, 24, 3),
+])
+def test_round_div_rounds_half_to_even(num, den, expected):
+    assert payroll_engine._round_div(num, den) == expected
+
+
+def test_pay_is_computed_in_whole_cents():
+    # 2412 cents a year is 100.5 cents a period: half to even gives 100.
+    assert compute_pay_cents(2412) == (100, 20, 80)
+    assert compute_pay_cents(2436) == (102, 20, 82)
+    assert compute_pay("85000") == (3541.67, 708.33, 2833.34)
+    for salary in salaries():
+        gross, deductions, net = compute_pay(salary)
+        assert round(gross - deductions, 2) == net
+
+
+@pytest.mark.skipif(payroll_engine.np is None, reason="NumPy is not installed")
+def test_numpy_and_pure_python_agree(monkeypatch):
+    values = salaries()
+    ids = [f"emp_{n:04d}" for n in range(len(values))]
+    vectorized = PayrollColumns(ids, values, ["active"] * len(values), [None] * len(values)).compute()
+    monkeypatch.setattr(payroll_engine, "np", None)
+    scalar = PayrollColumns(ids, values, ["active"] * len(values), [None] * len(values)).compute()
+    assert vectorized == scalar
+    assert list(zip(*scalar)) == [compute_pay(s) for s in values]
+
+
+@pytest.mark.parametrize("n", [20, payroll_engine.VECTORIZE_THRESHOLD + 5])
+def test_generate_employee_pays_fields(n):
+    values = salaries(n - 9)
+    employees = {f"emp_{i:04d}": {"employee_id": f"emp_{i:04d}", "salary": s} for i, s in enumerate(values)}
+    db = {"employees": employees, "employee_pays": []}
+    res = json.loads(registry().invoke("generate_employee_pays", 1, db, "run_001"))
+    assert res["generated_count"] == n
+    for i, (pay, salary) in enumerate(zip(res["employee_pays"], values), 1):
+        assert pay["pay_id"] == f"ep_run_001_{i:03d}"
+        assert pay["amount"] == salary
+        assert (pay["gross_pay"], pay["deductions"], pay["net_pay"]) == compute_pay(salary)
+    assert db["employee_pays"] == res["employee_pays"]
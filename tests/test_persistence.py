@@ -0,0 +1,209 @@
+import contextlib
+import json
+import multiprocessing
+import os
+import time
+
+import pytest
+
+import persistence
+from persistence import WAL_NAME, FileStore
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    invoices = {f"inv_00{n}": {"invoice_id": f"inv_00{n}", "status": "open", "amount": n} for n in (1, 2)}
+    (tmp_path / "invoices.json").write_text(json.dumps(invoices))
+    return str(tmp_path)
+
+
+def set_status(store, status, fail=False):
+    with store.transaction():
+        invoices = store.table("invoices")
+        invoices.update(invoices.get("inv_001"), {"status": status})
+        if fail:
+            raise RuntimeError("abort")
+
+
+def status(store):
+    return store.table("invoices").get("inv_001")["status"]
+
+
+@pytest.mark.parametrize("deferred", [False, True])
+def test_abort_keeps_earlier_commits(data_dir, deferred):
+    store = FileStore(data_dir)
+    with store.deferred() if deferred else contextlib.nullcontext():
+        set_status(store, "A")
+        for attempt in ("B", "C"):
+            with pytest.raises(RuntimeError):
+                set_status(store, attempt, fail=True)
+            assert status(store) == "A"
+    assert status(store) == "A"
+    assert status(FileStore(data_dir)) == "A"
+
+
+def test_idle_store_syncs_its_last_transaction(data_dir):
+    store = FileStore(data_dir, flush_interval=0.05)
+    set_status(store, "A")
+    assert store._unsynced == 1
+    deadline = time.monotonic() + 5
+    while store._unsynced and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert store._unsynced == 0
+
+
+def test_wal_is_replayed_after_a_crash(data_dir):
+    store = FileStore(data_dir)
+    set_status(store, "paid")
+    with store.transaction():
+        store.table("invoices").insert({"invoice_id": "inv_003", "status": "open", "amount": 3})
+    store.sync()
+    # Simulate a crash: the snapshot was never checkpointed, only the log was written.
+    with open(os.path.join(data_dir, "invoices.json")) as f:
+        assert json.load(f)["inv_001"]["status"] == "open"
+    recovered = FileStore(data_dir)
+    assert status(recovered) == "paid"
+    assert recovered.table("invoices").get("inv_003")["amount"] == 3
+
+
+def test_torn_last_log_line_is_ignored(data_dir):
+    store = FileStore(data_dir)
+    set_status(store, "paid")
+    store.sync()
+    with open(os.path.join(data_dir, WAL_NAME), "a") as f:
+        f.write('{"ops": [["invoices", "k", "inv_001", {"invoice_id": "inv_001", "sta')
+    assert status(FileStore(data_dir)) == "paid"
+
+
+def test_commit_checkpoints_and_truncates_the_log(data_dir):
+    store = FileStore(data_dir)
+    set_status(store, "paid")
+    store.commit()
+    assert not os.path.exists(os.path.join(data_dir, WAL_NAME))
+    with open(os.path.join(data_dir, "invoices.json")) as f:
+        assert json.load(f)["inv_001"]["status"] == "paid"
+
+
+def test_list_table_updates_are_logged_at_their_position(tmp_path):
+    rows = [{"payment_id": f"pay_{n:03d}", "status": "open"} for n in range(200)]
+    (tmp_path / "payments.json").write_text(json.dumps(rows))
+    store = FileStore(str(tmp_path), min_pending=10**6)
+    payments = store.table("payments")
+    payments.insert({"payment_id": "pay_200", "status": "open"})
+    for n in (150, 3, 200, 150):
+        payments.update(payments.get(f"pay_{n:03d}"), {"status": f"paid {n}"})
+    store.sync()
+    reopened = FileStore(str(tmp_path)).table("payments")
+    assert len(reopened) == 201
+    assert [rec["status"] for rec in reopened if rec["status"] != "open"] == ["paid 3", "paid 150", "paid 200"]
+
+
+def test_checkpoint_threshold_counts_writes_not_transactions(data_dir):
+    store = FileStore(data_dir, min_pending=8, flush_ratio=0)
+    with store.transaction():
+        invoices = store.table("invoices")
+        for n in range(3, 11):
+            invoices.insert({"invoice_id": f"inv_{n:03d}", "status": "open", "amount": n})
+    # One transaction of eight writes reaches the threshold of eight.
+    assert store.dirty() == []
+    with open(os.path.join(data_dir, "invoices.json")) as f:
+        assert len(json.load(f)) == 10
+
+
+def test_replay_applies_each_table_only_its_own_writes(data_dir):
+    store = FileStore(data_dir)
+    set_status(store, "paid")
+    with store.transaction():
+        store.table("payments", create=dict).insert({"payment_id": "pay_001", "amount": 1})
+    store.sync()
+    reopened = FileStore(data_dir)
+    assert status(reopened) == "paid"
+    assert reopened.dirty() == ["invoices"]
+    assert len(reopened.table("payments")) == 1
+    reopened.commit()
+    assert not os.path.exists(os.path.join(data_dir, WAL_NAME))
+
+
+def test_abort_drops_the_writes_of_the_transaction(data_dir):
+    store = FileStore(data_dir)
+    with store.transaction():
+        invoices = store.table("invoices")
+        invoices.update(invoices.get("inv_001"), {"status": "B"})
+        store.abort()
+    assert status(store) == "open"
+    assert status(FileStore(data_dir)) == "open"
+
+
+def test_nested_failure_aborts_outer_transaction(data_dir):
+    store = FileStore(data_dir)
+    with store.transaction():
+        try:
+            set_status(store, "B", fail=True)
+        except RuntimeError:
+            pass
+        store.table("invoices").update(store.table("invoices").get("inv_002"), {"status": "B"})
+    assert status(store) == "open"
+    assert store.table("invoices").get("inv_002")["status"] == "open"
+
+
+def test_shared_stores_see_each_others_commits(data_dir):
+    first, second = FileStore(data_dir, shared=True), FileStore(data_dir, shared=True)
+    assert status(first) == status(second) == "open"
+    set_status(second, "paid")
+    assert status(first) == "paid"
+    assert not os.path.exists(os.path.join(data_dir, WAL_NAME))
+    set_status(first, "void")
+    assert status(second) == status(FileStore(data_dir)) == "void"
+
+
+def test_shared_write_outside_a_transaction_fails_on_a_stale_table(data_dir):
+    first, second = FileStore(data_dir, shared=True), FileStore(data_dir, shared=True)
+    invoices = first.table("invoices")
+    record = invoices.get("inv_002")
+    set_status(second, "paid")
+    with pytest.raises(RuntimeError, match="changed by another process"):
+        invoices.update(record, {"status": "lost"})
+    assert status(first) == "paid"
+    assert FileStore(data_dir).table("invoices").get("inv_002")["status"] == "open"
+
+
+def test_shared_transaction_holds_its_table_locks(data_dir, monkeypatch):
+    monkeypatch.setattr(persistence, "LOCK_TIMEOUT", 0.05)
+    first, second = FileStore(data_dir, shared=True), FileStore(data_dir, shared=True)
+    with first.transaction():
+        assert status(first) == "open"
+        with pytest.raises(TimeoutError):
+            set_status(second, "paid")
+        first.table("invoices").update(first.table("invoices").get("inv_001"), {"status": "void"})
+    set_status(second, "paid")
+    assert status(first) == "paid"
+
+
+def test_shared_store_refuses_a_log_with_unreplayed_writes(data_dir):
+    store = FileStore(data_dir)
+    set_status(store, "paid")
+    store.sync()
+    with pytest.raises(RuntimeError, match="not yet checkpointed"):
+        FileStore(data_dir, shared=True)
+    store.commit()
+    assert status(FileStore(data_dir, shared=True)) == "paid"
+
+
+def _add_to_amount(data_dir, times):
+    store = FileStore(data_dir, shared=True)
+    for _ in range(times):
+        with store.transaction():
+            invoices = store.table("invoices")
+            record = invoices.get("inv_001")
+            invoices.update(record, {"amount": record["amount"] + 1})
+
+
+def test_shared_transactions_of_several_processes_lose_no_update(data_dir):
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_add_to_amount, args=(data_dir, 25)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert [worker.exitcode for worker in workers] == [0, 0, 0]
+    assert FileStore(data_dir).table("invoices").get("inv_001")["amount"] == 1 + 75
@@ -0,0 +1,120 @@
+import random
+
+import pytest
+
+from query import Query
+from snapshot import Snapshot
+from table_store import TableStore
+
+STATUSES = ["open", "approved", "paid", None]
+
+
+def invoices(n=300, seed=0):
+    rng = random.Random(seed)
+    rows = {}
+    for i in range(1, n + 1):
+        inv_id = f"inv_{i:03d}"
+        rows[inv_id] = {
+            "invoice_id": inv_id,
+            "vendor_id": f"vend_{rng.randint(1, 12):03d}",
+            "order_id": f"ord_{rng.randint(1, 40):03d}",
+            "status": rng.choice(STATUSES),
+            "amount": rng.choice([None, *range(0, 1000, 7)]),
+        }
+    return rows
+
+
+def holds(value, op, operand):
+    if op == "eq":
+        return value == operand
+    if op == "ne":
+        return value != operand
+    if op in ("gt", "gte", "lt", "lte"):
+        if value is None:
+            return False
+        return {"gt": value > operand, "gte": value >= operand, "lt": value < operand, "lte": value <= operand}[op]
+    if op == "in":
+        return value in operand
+    if op == "not_in":
+        return value not in operand
+    if op == "prefix":
+        return isinstance(value, str) and value.startswith(operand)
+    if op == "is_null":
+        return (value is None) == bool(operand)
+    raise AssertionError(op)
+
+
+def linear(rows, filters, order_by=None, descending=False, limit=None, offset=0):
+    """Reference result: scan, filter, sort, slice."""
+    out = []
+    for rec in rows:
+        ok = True
+        for field, spec in filters.items():
+            ops = spec if isinstance(spec, dict) else {"eq": spec}
+            if not all(holds(rec.get(field), op, operand) for op, operand in ops.items()):
+                ok = False
+                break
+        if ok:
+            out.append(rec)
+    if order_by:
+        out.sort(key=lambda r: tuple(((r.get(k) is not None) if descending else (r.get(k) is None), r.get(k)) for k in order_by), reverse=descending)
+    stop = None if limit is None else offset + limit
+    return out[offset:stop]
+
+
+def random_filters(rng):
+    choices = [
+        lambda: ("invoice_id", f"inv_{rng.randint(1, 320):03d}"),
+        lambda: ("invoice_id", {"in": [f"inv_{rng.randint(1, 320):03d}" for _ in range(3)]}),
+        lambda: ("vendor_id", f"vend_{rng.randint(1, 12):03d}"),
+        lambda: ("vendor_id", {"in": [f"vend_{rng.randint(1, 12):03d}" for _ in range(2)]}),
+        lambda: ("order_id", f"ord_{rng.randint(1, 40):03d}"),
+        lambda: ("status", rng.choice(STATUSES)),
+        lambda: ("status", {"not_in": ["paid"]}),
+        lambda: ("amount", {"gte": rng.randint(0, 500), "lt": rng.randint(500, 1000)}),
+        lambda: ("amount", {"is_null": rng.random() < 0.5}),
+        lambda: ("order_id", {"prefix": "ord_01"}),
+        lambda: ("status", {"ne": "open"}),
+    ]
+    filters = {}
+    for _ in range(rng.randint(0, 3)):
+        field, spec = rng.choice(choices)()
+        filters.setdefault(field, spec)
+    return filters
+
+
+def overlay_table():
+    db = Snapshot(TableStore({"invoices": invoices()}))
+    table = db.table("invoices")
+    rng = random.Random(1)
+    for i in range(1, 301, 5):
+        rec = table.get(f"inv_{i:03d}")
+        table.update(rec, {"vendor_id": f"vend_{rng.randint(1, 12):03d}", "status": rng.choice(STATUSES)})
+    for i in range(301, 321):
+        table.insert({"invoice_id": f"inv_{i:03d}", "vendor_id": f"vend_{rng.randint(1, 12):03d}", "order_id": "ord_001", "status": "open", "amount": i})
+    return table
+
+
+@pytest.mark.parametrize("make", [lambda: TableStore({"invoices": invoices()}).table("invoices"), overlay_table], ids=["table", "overlay"])
+def test_planner_matches_linear_scan(make):
+    table = make()
+    rows = list(table.records())
+    rng = random.Random(2)
+    paths = set()
+    for _ in range(400):
+        filters = random_filters(rng)
+        query = Query(filters)
+        paths.add(query.plan(table)[0])
+        key = lambda r: r["invoice_id"]
+        assert sorted(query.matches(table), key=key) == sorted(linear(rows, filters), key=key), filters
+
+        ordered = Query(filters, order_by=["amount", "invoice_id"], descending=rng.random() < 0.5, limit=rng.choice([None, 5, 20]), offset=rng.choice([0, 3]))
+        expected = linear(rows, filters, ordered.order_by, ordered.descending, ordered.limit, ordered.offset)
+        assert list(ordered.run(table)) == expected, filters
+    assert paths >= {"primary_key", "primary_key_in", "index(vendor_id)", "index(order_id)", "index_in(vendor_id)", "scan"}
+
+
+def test_projection_keeps_only_present_fields():
+    table = TableStore({"invoices": invoices(20)}).table("invoices")
+    rows = list(Query({"vendor_id": {"in": ["vend_001", "vend_002"]}}, fields=["invoice_id", "missing"]).run(table))
+    assert rows and all(set(r) == {"invoice_id"} for r in rows)
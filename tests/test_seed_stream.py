@@ -0,0 +1,51 @@
+import filecmp
+import json
+import os
+
+import pytest
+
+from seed_stream import TABLES, Scale, generate_streaming
+
+# Text drawn from Faker: seed_data draws it record by record, seed_stream from pools.
+FAKER_FIELDS = {"name", "role", "legal_name", "service", "description"}
+
+
+def load_tables(out_dir):
+    tables = {}
+    for name in TABLES:
+        with open(os.path.join(out_dir, f"{name}.json"), encoding="utf-8") as f:
+            tables[name] = json.load(f)
+    return tables
+
+
+def without_faker_text(value):
+    if isinstance(value, dict):
+        return {k: without_faker_text(v) for k, v in value.items() if k not in FAKER_FIELDS}
+    return value
+
+
+def test_small_scale_matches_seed_data(tmp_path):
+    pytest.importorskip("faker")
+    from seed_data import generate_payroll_data
+
+    expected = json.loads(json.dumps(generate_payroll_data()))
+    # seed_data's defaults: 40 onboarding requests approve 7 employees and 7 vendors.
+    scale = Scale(employees=7, vendors=7, payroll_runs=20, orders=30, onboarding=40)
+    list(generate_streaming(str(tmp_path), scale, processes=1))
+    got = load_tables(str(tmp_path))
+    assert set(got) == set(expected)
+    for name in TABLES:
+        assert list(got[name]) == list(expected[name]), name
+        assert without_faker_text(got[name]) == without_faker_text(expected[name]), name
+
+
+@pytest.mark.parametrize("fmt", ["json", "snap"])
+def test_output_does_not_depend_on_the_number_of_processes(tmp_path, fmt):
+    scale = Scale(employees=40, vendors=9, payroll_runs=30, orders=60, departments=3, max_pays_per_run=5, seed=7)
+    one, many = tmp_path / "one", tmp_path / "many"
+    list(generate_streaming(str(one), scale, processes=1, fmt=fmt))
+    list(generate_streaming(str(many), scale, processes=3, fmt=fmt))
+    files = sorted(os.listdir(one))
+    assert len(files) == len(TABLES) and files == sorted(os.listdir(many))
+    match, mismatch, errors = filecmp.cmpfiles(one, many, files, shallow=False)
+    assert (mismatch, errors) == ([], [])
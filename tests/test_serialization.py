@@ -0,0 +1,135 @@
+import asyncio
+import json
+
+import pytest
+
+import serialization
+from pagination import Page
+from query import Query
+from registry import registry
+from serialization import adumps, discarded, dumps, failed, iter_json
+from table_store import TableStore
+
+RESULTS = [
+    {"success": True, "items": [1, 2.5, None, "é"], "nested": {"a": {"b": []}}},
+    {"success": False, "error": "not_found"},
+    [{"x": 1}, "y"],
+    "text",
+    None,
+    {},
+]
+
+
+def table(n=50):
+    rows = {f"row_{i:03d}": {"id": f"row_{i:03d}", "n": i, "label": "ü" * (i % 3)} for i in range(n)}
+    return TableStore({"rows": rows}).table("rows")
+
+
+@pytest.fixture(autouse=True)
+def default_encoding():
+    serialization.configure(compact=False)
+    yield
+    serialization.configure(compact=False)
+
+
+@pytest.mark.parametrize("result", RESULTS)
+def test_dumps_is_json_dumps(result):
+    assert dumps(result) == json.dumps(result)
+
+
+def test_pages_are_encoded_as_their_rows():
+    rows = table()
+    query = Query({"n": {"gte": 10}})
+    expected = json.dumps({"success": True, "results": list(query.run(rows)), "count": 3})
+    assert dumps({"success": True, "results": Page(rows, query), "count": 3}) == expected
+    assert "".join(iter_json({"results": Page(rows, query)})) == json.dumps({"results": list(query.run(rows))})
+    assert dumps({"results": Page(rows, Query({"n": -1}))}) == '{"results": []}'
+
+
+def test_paginated_pages_end_with_the_next_cursor():
+    rows = table()
+    page = Page(rows, Query({}), page_size=20)
+    res = json.loads(dumps({"success": True, "results": page}))
+    assert list(res) == ["success", "results", "next_cursor"]
+    assert len(res["results"]) == 20 and res["next_cursor"] == page.next_cursor is not None
+
+
+def test_compact_results_parse_to_the_same_value():
+    serialization.configure(compact=True)
+    rows = table()
+    for result in RESULTS + [{"results": Page(rows, Query({}))}]:
+        out = dumps(result)
+        assert ", " not in out and ": " not in out
+        expected = {"results": list(Query({}).run(rows))} if isinstance(result, dict) and "results" in result else result
+        assert json.loads(out) == json.loads(json.dumps(expected))
+
+
+def test_discarded_results_are_not_encoded(monkeypatch):
+    def encode(obj):
+        raise AssertionError("encoded a discarded result")
+
+    monkeypatch.setattr(serialization, "_default_encode", encode)
+    with discarded():
+        assert dumps({"success": True, "items": list(range(10))}) == ""
+        assert dumps({"success": False, "error": "not_found"}) == '{"success": false}'
+        assert dumps({"results": Page(table(), Query({}))}) == ""
+        assert dumps([1, 2]) == ""
+
+
+def test_execute_batch_encodes_only_kept_results():
+    data = {"rows": table(5).records()}
+    calls = [{"tool": "query_table", "args": ["rows"]}, {"tool": "query_table", "args": ["rows"], "kwargs": {"filters": {"n": 3}}}]
+    expected = registry().invoke("query_table", 1, data, "rows", filters={"n": 3})
+    assert registry().execute_batch(calls, 1, data, keep=[1]) == [None, expected]
+
+
+def results():
+    """RESULTS plus a paginated and an unpaginated Page result, built afresh: Pages are read once."""
+    rows = table()
+    return RESULTS + [
+        {"success": True, "results": Page(rows, Query({}), page_size=7)},
+        {"results": Page(rows, Query({"n": {"lt": 30}})), "count": 30},
+    ]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_adumps_equals_dumps(monkeypatch, compact):
+    serialization.configure(compact=compact)
+    # Yield to the event loop after every row.
+    monkeypatch.setattr(serialization, "YIELD_INTERVAL", 0)
+    for result, again in zip(results(), results()):
+        assert asyncio.run(adumps(result)) == dumps(again)
+
+
+def test_adumps_lets_other_tasks_run(monkeypatch):
+    monkeypatch.setattr(serialization, "YIELD_INTERVAL", 0)
+    rows = table()
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.ensure_future(ticker())
+        await asyncio.sleep(0)
+        out = await adumps({"results": Page(rows, Query({}))})
+        task.cancel()
+        return out
+
+    assert asyncio.run(main()) == json.dumps({"results": list(Query({}).run(rows))})
+    assert len(ticks) > 10
+
+
+@pytest.mark.parametrize("output, expected", [
+    (json.dumps({"success": False, "error": "x"}), True),
+    ('{"success":false}', True),
+    (json.dumps({"success": True, "results": [{"success": False}]}), False),
+    (json.dumps({"error": "x", "note": '"success": false'}), False),
+    ("not json: \"success\": false", False),
+    ("", False),
+    (None, False),
+])
+def test_failed_reads_the_top_level_success(output, expected):
+    assert failed(output) is expected
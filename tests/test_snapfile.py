@@ -0,0 +1,21 @@
+import os
+
+from snapfile import SUFFIX, open_snapshot, write_snapshot
+from table_store import TableStore
+
+
+def snapshot_table(tmp_path, store):
+    path = os.path.join(tmp_path, "invoices" + SUFFIX)
+    write_snapshot(path, {f"inv_{i:03d}": {"invoice_id": f"inv_{i:03d}", "amount": i} for i in range(100)})
+    rows = open_snapshot(path)
+    return rows, store({"invoices": rows}).table("invoices")
+
+
+def test_primary_key_lookups_decode_only_the_hit(tmp_path):
+    for store in (TableStore, TableStore.of):
+        rows, table = snapshot_table(tmp_path, store)
+        assert table.get("inv_999") is None
+        assert table.get(7) is None
+        assert not rows._decoded
+        assert table.get("inv_042")["amount"] == 42
+        assert list(rows._decoded) == [42]
@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from registry import registry
+from snapshot import Snapshot
+from table_store import TableStore
+
+
+def employee(n, **fields):
+    rec = {
+        "name": f"Employee {n}", "role": "Analyst", "salary": 1000, "tax_id": f"T{n}",
+        "bank_account_number": f"A{n}", "bank_routing_number": "R1", "department_id": "dept_001",
+    }
+    rec.update(fields)
+    return rec
+
+
+def base():
+    employees = {}
+    for n in (1, 2):
+        rec = employee(n, employee_id=f"emp_00{n}")
+        employees[rec["employee_id"]] = rec
+    return TableStore({"employees": employees, "audit_log": []})
+
+
+def call(name, db, *args):
+    return json.loads(registry().invoke(name, 1, db, *args))
+
+
+def test_overlay_rejects_tax_id_inserted_in_the_same_snapshot():
+    db = Snapshot(base())
+    assert call("create_employee", db, employee(3))["success"]
+    res = call("create_employee", db, employee(4, tax_id="T3"))
+    assert res == {"success": False, "error": "duplicate_tax_id"}
+
+
+def test_overlay_rejects_base_tax_id():
+    db = Snapshot(base())
+    res = call("create_employee", db, employee(3, tax_id="T1"))
+    assert res == {"success": False, "error": "duplicate_tax_id"}
+
+
+def test_overlay_accepts_tax_id_released_in_the_same_snapshot():
+    b = base()
+    db = Snapshot(b)
+    assert call("update_employee", db, "emp_001", {"tax_id": "T9"})["success"]
+    res = call("update_employee", db, "emp_002", {"tax_id": "T1"})
+    assert res["success"], res
+    assert db.table("employees").conflict(employee(5, tax_id="T1")) == "tax_id"
+    assert b["employees"]["emp_001"]["tax_id"] == "T1"
+
+
+def test_overlay_unique_check_sees_savepoint_layers():
+    db = Snapshot(base())
+    assert call("create_employee", db, employee(3))["success"]
+    sp = db.savepoint()
+    assert call("create_employee", db, employee(4, tax_id="T3"))["error"] == "duplicate_tax_id"
+    db.rollback(sp)
+    assert call("create_employee", db, employee(4, bank_account_number="A3"))["error"] == "duplicate_bank_account"
+
+
+def invoices():
+    return TableStore({"invoices": {f"inv_00{n}": {"invoice_id": f"inv_00{n}", "vendor_id": "vend_001", "status": "open"} for n in (1, 2)}})
+
+
+def statuses(db):
+    return {k: r["status"] for k, r in db["invoices"].items()}
+
+
+def test_savepoint_rollback_and_reset():
+    b = invoices()
+    db = Snapshot(b)
+    inv = db.table("invoices")
+    inv.update(inv.get("inv_001"), {"status": "paid"})
+    sp = db.savepoint()
+    inv = db.table("invoices")
+    inv.update(inv.get("inv_002"), {"status": "paid"})
+    inv.insert({"invoice_id": "inv_003", "vendor_id": "vend_002", "status": "open"})
+    assert statuses(db) == {"inv_001": "paid", "inv_002": "paid", "inv_003": "open"}
+    db.rollback(sp)
+    assert statuses(db) == {"inv_001": "paid", "inv_002": "open"}
+    db.reset()
+    assert statuses(db) == {"inv_001": "open", "inv_002": "open"}
+    assert statuses(b) == {"inv_001": "open", "inv_002": "open"}
+
+
+def test_rollback_rejects_unknown_savepoints():
+    db = Snapshot(invoices())
+    with pytest.raises(ValueError):
+        db.rollback(3)
+
+
+def test_overlay_find_and_get_follow_writes():
+    b = invoices()
+    db = Snapshot(b)
+    inv = db.table("invoices")
+    inv.update(inv.get("inv_001"), {"vendor_id": "vend_002"})
+    inv.insert({"invoice_id": "inv_003", "vendor_id": "vend_001", "status": "open"})
+    assert [r["invoice_id"] for r in inv.find({"vendor_id": "vend_001"})] == ["inv_002", "inv_003"]
+    assert [r["invoice_id"] for r in inv.find({"vendor_id": "vend_002"})] == ["inv_001"]
+    assert inv.get("vend_002", field="vendor_id")["invoice_id"] == "inv_001"
+    assert inv.next_id("inv") == "inv_004"
+    assert [r["invoice_id"] for r in b.table("invoices").find({"vendor_id": "vend_001"})] == ["inv_001", "inv_002"]
+
+
+@pytest.mark.parametrize("shape", [dict, list])
+def test_overlay_find_returns_records_order(shape):
+    rows = [{"invoice_id": f"inv_00{n}", "vendor_id": f"vend_00{n % 2}", "status": "open"} for n in range(1, 7)]
+    db = Snapshot(TableStore({"invoices": {r["invoice_id"]: r for r in rows} if shape is dict else rows}))
+    inv = db.table("invoices")
+    inv.insert({"invoice_id": "inv_007", "vendor_id": "vend_001", "status": "open"})
+    inv.update(inv.get("inv_005"), {"status": "paid"})
+    inv.update(inv.get("inv_004"), {"vendor_id": "vend_001"})
+    inv.update(inv.get("inv_001"), {"vendor_id": "vend_000"})
+
+    def ids(criteria):
+        found = [r["invoice_id"] for r in inv.find(criteria)]
+        assert found == [r["invoice_id"] for r in inv.records() if all(r.get(k) == v for k, v in criteria.items())]
+        return found
+
+    assert ids({"vendor_id": "vend_001"}) == ["inv_003", "inv_004", "inv_005", "inv_007"]
+    assert ids({"vendor_id": "vend_000"}) == ["inv_001", "inv_002", "inv_006"]
+    assert ids({"vendor_id": "vend_001", "status": "open"}) == ["inv_003", "inv_004", "inv_007"]
+    assert ids({"status": "paid"}) == ["inv_005"]
@@ -0,0 +1,88 @@
+import gc
+import json
+import weakref
+
+from registry import registry
+import table_store
+from table_store import TableStore
+
+
+class Data(dict):
+    """A dict that can be weakly referenced."""
+
+
+def employee(n, **fields):
+    rec = {
+        "name": f"Employee {n}", "role": "Analyst", "salary": 1000, "tax_id": f"T{n}",
+        "bank_account_number": f"A{n}", "bank_routing_number": "R1", "department_id": "dept_001",
+    }
+    rec.update(fields)
+    return rec
+
+
+def data():
+    return Data(employees={"emp_001": {"employee_id": "emp_001", **employee(1)}}, audit_log=[])
+
+
+def call(name, db, *args):
+    return json.loads(registry().invoke(name, 1, db, *args))
+
+
+def test_plain_data_is_not_kept_alive():
+    db = data()
+    assert call("get_employee", db, "emp_001")["success"]
+    ref = weakref.ref(db)
+    del db
+    gc.collect()
+    assert ref() is None
+
+
+def test_plain_data_edited_between_calls_is_seen():
+    db = data()
+    assert call("create_employee", db, employee(2))["success"]
+    db["employees"]["emp_001"]["tax_id"] = "T9"
+    assert call("create_employee", db, employee(3, tax_id="T1"))["success"]
+
+
+def test_store_keeps_indexes_across_calls():
+    store = TableStore(data())
+    assert call("create_employee", store, employee(2))["success"]
+    employees = store.table("employees")
+    assert call("create_employee", store, employee(3, tax_id="T2"))["error"] == "duplicate_tax_id"
+    assert store.table("employees") is employees and employees._secondary
+
+
+def invoices(n=50):
+    return {f"inv_{i:03d}": {"invoice_id": f"inv_{i:03d}", "vendor_id": f"vend_{i % 5}", "status": "open"} for i in range(n)}
+
+
+def test_keyed_primary_key_miss_builds_no_index():
+    table = TableStore.of({"invoices": invoices()}).table("invoices")
+    assert table.get("inv_999") is None
+    assert table.get(["unhashable"]) is None
+    assert table.get("inv_007")["invoice_id"] == "inv_007"
+    assert not table._indexes
+
+
+def test_declared_key_field_falls_back_to_the_primary_key_index(monkeypatch):
+    monkeypatch.setitem(table_store.KEY_FIELDS, "invoices", "number")
+    rows = {"1": {"number": "1", "invoice_id": "inv_a"}, "2": {"number": "2", "invoice_id": "inv_b"}}
+    table = TableStore({"invoices": rows}).table("invoices")
+    assert table.get("inv_b")["number"] == "2"
+    assert table.get("2", field="number")["invoice_id"] == "inv_b"
+
+
+def test_transient_table_scans_once_before_indexing():
+    table = TableStore.of({"invoices": invoices()}).table("invoices")
+    assert table.get("vend_3", field="vendor_id")["invoice_id"] == "inv_003"
+    assert len(table.find({"vendor_id": "vend_2"})) == 10
+    assert not table._indexes and not table._secondary
+    assert table.get("vend_4", field="vendor_id")["invoice_id"] == "inv_004"
+    assert len(table.find({"vendor_id": "vend_1"})) == 10
+    assert "vendor_id" in table._indexes and ("vendor_id",) in table._secondary
+
+
+def test_held_table_indexes_on_first_lookup():
+    table = TableStore({"invoices": invoices()}).table("invoices")
+    table.find({"vendor_id": "vend_2"})
+    assert ("vendor_id",) in table._secondary
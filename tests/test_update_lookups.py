@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from registry import registry
+
+
+def call(name, db, *args):
+    return json.loads(registry().invoke(name, 1, db, *args))
+
+
+def db():
+    return {
+        "payments": {"pay_001": {"payment_id": "pay_001", "status": "pending"}},
+        "employee_pays": {"epay_001": {"pay_id": "epay_001", "status": "pending"}},
+        "onboarding_requests": {"onb_001": {"request_id": "onb_001", "status": "pending"}},
+        "offboarding_requests": {"off_001": {"request_id": "off_001", "status": "pending"}},
+        "audit_log": [],
+    }
+
+
+def test_execute_external_payment_reads_the_payment_request():
+    res = call("execute_external_payment", db(), {"payment_id": "pay_001"})
+    assert res["success"] and res["payment"]["status"] == "executed_external"
+    assert call("execute_external_payment", db(), {})["error"] == "missing_payment_id"
+
+
+@pytest.mark.parametrize("tool,table,key,ident", [
+    ("update_employee_pay", "employee_pays", "employee_pay", "epay_001"),
+    ("update_onboarding_request", "onboarding_requests", "onboarding_request", "onb_001"),
+    ("update_offboarding_request", "offboarding_requests", "offboarding_request", "off_001"),
+])
+def test_update_finds_records_by_primary_key(tool, table, key, ident):
+    data = db()
+    res = call(tool, data, ident, {"status": "approved"})
+    assert res["success"], res
+    assert res[key]["status"] == "approved"
+    assert call(tool, data, "missing_001", {"status": "approved"})["error"] == "not_found"
@@ -1,75 +1,62 @@
-from .add_audit_logs_entry import AddAuditLogsEntry
-from .create_approval_request import CreateApprovalRequest
-from .create_dispute import CreateDispute
-from .create_employee import CreateEmployee
-from .create_invoice import CreateInvoice
-from .create_offboarding_request import CreateOffboardingRequest
-from .create_payment import CreatePayment
-from .create_payroll_run import CreatePayrollRun
-from .create_vendor import CreateVendor
-from .execute_external_payment import ExecuteExternalPayment
-from .generate_employee_pays import GenerateEmployeePays
-from .get_approval_request import GetApprovalRequest
-from .get_audit_entries_for_entity import GetAuditEntriesForEntity
-from .get_department import GetDepartment
-from .get_dispute import GetDispute
-from .get_employee import GetEmployee
-from .get_employee_pay import GetEmployeePay
-from .get_invoice import GetInvoice
-from .get_offboarding_request import GetOffboardingRequest
-from .get_onboarding_request import GetOnboardingRequest
-from .get_order import GetOrder
-from .get_payment import GetPayment
-from .get_payroll_run import GetPayrollRun
-from .get_pending_approvals import GetPendingApprovals
-from .get_vendor import GetVendor
-from .query_table import QueryTable
-from .resolve_dispute import ResolveDispute
-from .submit_approval_decision import SubmitApprovalDecision
-from .update_dispute_status import UpdateDisputeStatus
-from .update_employee import UpdateEmployee
-from .update_employee_pay import UpdateEmployeePay
-from .update_invoice import UpdateInvoice
-from .update_offboarding_request import UpdateOffboardingRequest
-from .update_onboarding_request import UpdateOnboardingRequest
-from .update_payment import UpdatePayment
-from .update_vendor import UpdateVendor
+import importlib
 
-ALL_TOOLS_INTERFACE_1 = [
-    AddAuditLogsEntry,
-    CreateApprovalRequest,
-    CreateDispute,
-    CreateEmployee,
-    CreateInvoice,
-    CreateOffboardingRequest,
-    CreatePayment,
-    CreatePayrollRun,
-    CreateVendor,
-    ExecuteExternalPayment,
-    GenerateEmployeePays,
-    GetApprovalRequest,
-    GetAuditEntriesForEntity,
-    GetDepartment,
-    GetDispute,
-    GetEmployee,
-    GetEmployeePay,
-    GetInvoice,
-    GetOffboardingRequest,
-    GetOnboardingRequest,
-    GetOrder,
-    GetPayment,
-    GetPayrollRun,
-    GetPendingApprovals,
-    GetVendor,
-    QueryTable,
-    ResolveDispute,
-    SubmitApprovalDecision,
-    UpdateDisputeStatus,
-    UpdateEmployee,
-    UpdateEmployeePay,
-    UpdateInvoice,
-    UpdateOffboardingRequest,
-    UpdateOnboardingRequest,
-    UpdatePayment,
-    UpdateVendor
-]
+_TOOLS = {
+    "AddAuditLogsEntry": "add_audit_logs_entry",
+    "BulkCreateEmployees": "bulk_create_employees",
+    "BulkCreateInvoices": "bulk_create_invoices",
+    "BulkCreatePayments": "bulk_create_payments",
+    "BulkCreateVendors": "bulk_create_vendors",
+    "CreateApprovalRequest": "create_approval_request",
+    "CreateDispute": "create_dispute",
+    "CreateEmployee": "create_employee",
+    "CreateInvoice": "create_invoice",
+    "CreateOffboardingRequest": "create_offboarding_request",
+    "CreatePayment": "create_payment",
+    "CreatePayrollRun": "create_payroll_run",
+    "CreateVendor": "create_vendor",
+    "ExecuteExternalPayment": "execute_external_payment",
+    "GenerateEmployeePays": "generate_employee_pays",
+    "GetApprovalRequest": "get_approval_request",
+    "GetAuditEntriesForEntity": "get_audit_entries_for_entity",
+    "GetDepartment": "get_department",
+    "GetDispute": "get_dispute",
+    "GetEmployee": "get_employee",
+    "GetEmployeePay": "get_employee_pay",
+    "GetInvoice": "get_invoice",
+    "GetOffboardingRequest": "get_offboarding_request",
+    "GetOnboardingRequest": "get_onboarding_request",
+    "GetOrder": "get_order",
+    "GetPayment": "get_payment",
+    "GetPayrollRun": "get_payroll_run",
+    "GetPendingApprovals": "get_pending_approvals",
+    "GetVendor": "get_vendor",
+    "QueryTable": "query_table",
+    "ResolveDispute": "resolve_dispute",
+    "SubmitApprovalDecision": "submit_approval_decision",
+    "UpdateDisputeStatus": "update_dispute_status",
+    "UpdateEmployee": "update_employee",
+    "UpdateEmployeePay": "update_employee_pay",
+    "UpdateInvoice": "update_invoice",
+    "UpdateOffboardingRequest": "update_offboarding_request",
+    "UpdateOnboardingRequest": "update_onboarding_request",
+    "UpdatePayment": "update_payment",
+    "UpdateVendor": "update_vendor",
+}
+
+__all__ = list(_TOOLS) + ["ALL_TOOLS_INTERFACE_1"]
+
+
+def __getattr__(name):
+    module = _TOOLS.get(name)
+    if module is not None:
+        value = getattr(importlib.import_module(f".{module}", __name__), name)
+    elif name == "ALL_TOOLS_INTERFACE_1":
+        value = [__getattr__(class_name) for class_name in _TOOLS]
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return __all__
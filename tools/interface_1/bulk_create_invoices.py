@@ -0,0 +1,81 @@
+import os
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
+
+
+class BulkCreateInvoices(Tool):
+    @staticmethod
+    def _validate(invoice: Any) -> Optional[Dict[str, Any]]:
+        """Why `invoice` cannot be created, or None."""
+        if not isinstance(invoice, dict):
+            return {"error": "invalid_input"}
+        missing = [k for k in ("vendor_id", "amount") if not invoice.get(k)]
+        if missing:
+            return {"error": "missing_fields", "missing": missing}
+        return None
+
+    @staticmethod
+    def _create(store: TableStore, records: List[Any], ts: str) -> List[Dict[str, Any]]:
+        """Insert every valid record; ids follow each other in the order of `records`."""
+        errors = [BulkCreateInvoices._validate(r) for r in records]
+        invoices = store.table("invoices", create=list)
+        audit = store.table("audit_log", create=list)
+        results = []
+        for i, (invoice, error) in enumerate(zip(records, errors)):
+            if error is not None:
+                results.append({"index": i, "success": False, **error})
+                continue
+            inv_id = invoices.next_id("inv")
+            invoices.insert({"invoice_id": inv_id, "vendor_id": invoice.get("vendor_id"), "amount": invoice.get("amount"), "status": "open", "created_at": ts})
+            audit.insert({"audit_id": f"audit_{inv_id}", "entity_type": "invoice", "entity_id": inv_id, "action_performed": "created", "timestamp": ts})
+            results.append({"index": i, "success": True, "invoice_id": inv_id})
+        return results
+
+    @staticmethod
+    def _invoke_internal(payload: Dict[str, Any], db: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        records = payload.get("data_records")
+        if records is None:
+            records = payload.get("invoices")
+        if not isinstance(records, list):
+            return {"success": False, "error": "invalid_input"}
+
+        ts = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+
+        if db is not None:
+            results = BulkCreateInvoices._create(TableStore.of(db), records, ts)
+        else:
+            workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+            data_dir = os.path.join(workspace_root, "data")
+
+            store = FileStore.at(data_dir)
+            try:
+                with store.transaction():
+                    results = BulkCreateInvoices._create(store, records, ts)
+            except Exception as e:
+                return {"success": False, "error": "write_error", "details": str(e)}
+
+        created = sum(r["success"] for r in results)
+        return {"success": True, "created_count": created, "failed_count": len(results) - created, "results": results}
+
+    @staticmethod
+    def invoke(data: Dict[str, Any], invoice_records: List[Dict[str, Any]]) -> str:
+        try:
+            res = BulkCreateInvoices._invoke_internal({"data_records": invoice_records}, db=data)
+        except Exception as e:
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "bulk_create_invoices",
+                "description": "Create many invoices in one call. Expects data dict and a list of invoice records; reports success or failure per record.",
+                "parameters": {"type": "object", "properties": {"data": {"type": "dict"}, "invoice_records": {"type": "list"}}, "required": ["data", "invoice_records"]}
+            }
+        }
@@ -0,0 +1,81 @@
+import os
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
+
+
+class BulkCreatePayments(Tool):
+    @staticmethod
+    def _validate(payment: Any) -> Optional[Dict[str, Any]]:
+        """Why `payment` cannot be created, or None."""
+        if not isinstance(payment, dict):
+            return {"error": "invalid_input"}
+        missing = [k for k in ("amount", "method") if not payment.get(k)]
+        if missing:
+            return {"error": "missing_fields", "missing": missing}
+        return None
+
+    @staticmethod
+    def _create(store: TableStore, records: List[Any], ts: str) -> List[Dict[str, Any]]:
+        """Insert every valid record; ids follow each other in the order of `records`."""
+        errors = [BulkCreatePayments._validate(r) for r in records]
+        payments = store.table("payments", create=list)
+        audit = store.table("audit_log", create=list)
+        results = []
+        for i, (payment, error) in enumerate(zip(records, errors)):
+            if error is not None:
+                results.append({"index": i, "success": False, **error})
+                continue
+            pid = payments.next_id("pay")
+            payments.insert({"payment_id": pid, "amount": payment.get("amount"), "method": payment.get("method"), "status": "created", "created_at": ts})
+            audit.insert({"audit_id": f"audit_{pid}", "entity_type": "payment", "entity_id": pid, "action_performed": "created", "timestamp": ts})
+            results.append({"index": i, "success": True, "payment_id": pid})
+        return results
+
+    @staticmethod
+    def _invoke_internal(payload: Dict[str, Any], db: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        records = payload.get("data_records")
+        if records is None:
+            records = payload.get("payments")
+        if not isinstance(records, list):
+            return {"success": False, "error": "invalid_input"}
+
+        ts = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+
+        if db is not None:
+            results = BulkCreatePayments._create(TableStore.of(db), records, ts)
+        else:
+            workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+            data_dir = os.path.join(workspace_root, "data")
+
+            store = FileStore.at(data_dir)
+            try:
+                with store.transaction():
+                    results = BulkCreatePayments._create(store, records, ts)
+            except Exception as e:
+                return {"success": False, "error": "write_error", "details": str(e)}
+
+        created = sum(r["success"] for r in results)
+        return {"success": True, "created_count": created, "failed_count": len(results) - created, "results": results}
+
+    @staticmethod
+    def invoke(data: Dict[str, Any], payment_records: List[Dict[str, Any]]) -> str:
+        try:
+            res = BulkCreatePayments._invoke_internal({"data_records": payment_records}, db=data)
+        except Exception as e:
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "bulk_create_payments",
+                "description": "Create many payments in one call. Expects data dict and a list of payment records; reports success or failure per record.",
+                "parameters": {"type": "object", "properties": {"data": {"type": "dict"}, "payment_records": {"type": "list"}}, "required": ["data", "payment_records"]}
+            }
+        }
@@ -1,7 +1,9 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
 
 
 class GetDepartment(Tool):
@@ -12,30 +14,18 @@ class GetDepartment(Tool):
             return {"success": False, "error": "missing_department_id"}
 
         if db is not None:
-            depts = db.get("departments", [])
+            depts = TableStore.of(db).table("departments")
         else:
             workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
             data_dir = os.path.join(workspace_root, "data")
-            path = os.path.join(data_dir, "departments.json")
             try:
-                if os.path.exists(path):
-                    with open(path, "r", encoding="utf-8") as f:
-                        raw = json.load(f)
-                else:
-                    raw = []
+                depts = FileStore.at(data_dir).table("departments")
             except Exception as e:
                 return {"success": False, "error": "read_error", "details": str(e)}
 
-            if isinstance(raw, list):
-                depts = raw
-            elif isinstance(raw, dict):
-                depts = list(raw.values())
-            else:
-                depts = []
-
-        for d in depts:
-            if d.get("department_id") == department_id:
-                return {"success": True, "department": d}
+        d = depts.get(department_id)
+        if d is not None:
+            return {"success": True, "department": d}
         return {"success": False, "error": "not_found"}
 
     @staticmethod
@@ -43,8 +33,8 @@ class GetDepartment(Tool):
         try:
             res = GetDepartment._invoke_internal({"department_id": department_id}, db=data)
         except Exception as e:
-            return json.dumps({"success": False, "error": "internal_error", "details": str(e)})
-        return json.dumps(res)
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -1,7 +1,9 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
 
 
 class GetEmployee(Tool):
@@ -12,30 +14,18 @@ class GetEmployee(Tool):
             return {"success": False, "error": "missing_employee_id"}
 
         if db is not None:
-            employees = db.get("employees", [])
+            employees = TableStore.of(db).table("employees")
         else:
             workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
             data_dir = os.path.join(workspace_root, "data")
-            path = os.path.join(data_dir, "employees.json")
             try:
-                if os.path.exists(path):
-                    with open(path, "r", encoding="utf-8") as f:
-                        raw = json.load(f)
-                else:
-                    raw = []
+                employees = FileStore.at(data_dir).table("employees")
             except Exception as e:
                 return {"success": False, "error": "read_error", "details": str(e)}
 
-            if isinstance(raw, list):
-                employees = raw
-            elif isinstance(raw, dict):
-                employees = list(raw.values())
-            else:
-                employees = []
-
-        for e in employees:
-            if e.get("employee_id") == employee_id:
-                return {"success": True, "employee": e}
+        e = employees.get(employee_id)
+        if e is not None:
+            return {"success": True, "employee": e}
         return {"success": False, "error": "not_found"}
 
     @staticmethod
@@ -43,8 +33,8 @@ class GetEmployee(Tool):
         try:
             res = GetEmployee._invoke_internal({"employee_id": employee_id}, db=data)
         except Exception as e:
-            return json.dumps({"success": False, "error": "internal_error", "details": str(e)})
-        return json.dumps(res)
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
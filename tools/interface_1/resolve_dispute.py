@@ -1,8 +1,10 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from datetime import datetime
 from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
 
 
 class ResolveDispute(Tool):
@@ -16,82 +18,46 @@ class ResolveDispute(Tool):
         ts = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
         if db is not None:
-            disputes = db.setdefault("disputes", [])
-            for d in disputes:
-                if d.get("dispute_id") == dispute_id:
-                    d["status"] = "resolved"
-                    d["resolution"] = resolution
-                    d["resolved_at"] = ts
-                    db.setdefault("audit_log", []).append({"audit_id": f"audit_{dispute_id}", "entity_type": "dispute", "entity_id": dispute_id, "action_performed": "resolved", "timestamp": ts})
-                    return {"success": True, "dispute": d}
+            store = TableStore.of(db)
+            disputes = store.table("disputes", create=list)
+            d = disputes.get(dispute_id)
+            if d is not None:
+                d = disputes.update(d, {"status": "resolved", "resolution": resolution, "resolved_at": ts})
+                store.table("audit_log", create=list).insert({"audit_id": f"audit_{dispute_id}", "entity_type": "dispute", "entity_id": dispute_id, "action_performed": "resolved", "timestamp": ts})
+                return {"success": True, "dispute": d}
             return {"success": False, "error": "not_found"}
 
         workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
         data_dir = os.path.join(workspace_root, "data")
-        path = os.path.join(data_dir, "disputes.json")
 
-        try:
-            if os.path.exists(path):
-                with open(path, "r", encoding="utf-8") as f:
-                    raw = json.load(f)
-            else:
-                return {"success": False, "error": "not_found"}
-        except Exception as e:
-            return {"success": False, "error": "read_error", "details": str(e)}
+        store = FileStore.at(data_dir)
+        with store.transaction():
+            try:
+                disputes = store.table("disputes")
+            except Exception as e:
+                return {"success": False, "error": "read_error", "details": str(e)}
 
-        if isinstance(raw, list):
-            disputes = raw
-        elif isinstance(raw, dict):
-            disputes = list(raw.values())
-        else:
-            return {"success": False, "error": "not_found"}
-
-        for d in disputes:
-            if d.get("dispute_id") == dispute_id:
-                d["status"] = "resolved"
-                d["resolution"] = resolution
-                d["resolved_at"] = ts
+            d = disputes.get(dispute_id)
+            if d is not None:
+                audit_entry = {"audit_id": f"audit_{dispute_id}", "entity_type": "dispute", "entity_id": dispute_id, "action_performed": "resolved", "timestamp": ts}
                 try:
-                    tmp = path + ".tmp"
-                    with open(tmp, "w", encoding="utf-8") as f:
-                        json.dump(disputes, f, indent=2)
-                    os.replace(tmp, path)
+                    d = disputes.update(d, {"status": "resolved", "resolution": resolution, "resolved_at": ts})
+                    store.table("audit_log", create=list).insert(audit_entry)
                 except Exception as e:
+                    store.abort()
                     return {"success": False, "error": "write_error", "details": str(e)}
 
-                audit_entry = {"audit_id": f"audit_{dispute_id}", "entity_type": "dispute", "entity_id": dispute_id, "action_performed": "resolved", "timestamp": ts}
-                try:
-                    audit_path = os.path.join(data_dir, "audit_log.json")
-                    if os.path.exists(audit_path):
-                        with open(audit_path, "r", encoding="utf-8") as f:
-                            raw_a = json.load(f)
-                    else:
-                        raw_a = []
-                    if isinstance(raw_a, list):
-                        audit = raw_a
-                    elif isinstance(raw_a, dict):
-                        audit = list(raw_a.values())
-                    else:
-                        audit = []
-                    audit.append(audit_entry)
-                    tmpa = audit_path + ".tmp"
-                    with open(tmpa, "w", encoding="utf-8") as f:
-                        json.dump(audit, f, indent=2)
-                    os.replace(tmpa, audit_path)
-                except Exception:
-                    pass
-
                 return {"success": True, "dispute": d, "audit_entry": audit_entry}
 
-        return {"success": False, "error": "not_found"}
+            return {"success": False, "error": "not_found"}
 
     @staticmethod
     def invoke(data: Dict[str, Any], dispute_id: str, resolution: Dict[str, Any]) -> str:
         try:
             res = ResolveDispute._invoke_internal({"dispute_id": dispute_id, "resolution": resolution}, db=data)
         except Exception as e:
-            return json.dumps({"success": False, "error": "internal_error", "details": str(e)})
-        return json.dumps(res)
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -1,7 +1,9 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
 
 
 class FetchInvoice(Tool):
@@ -12,30 +14,18 @@ class FetchInvoice(Tool):
             return {"success": False, "error": "missing_invoice_id"}
 
         if db is not None:
-            invs = db.get("invoices", [])
+            invs = TableStore.of(db).table("invoices")
         else:
             workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
             data_dir = os.path.join(workspace_root, "data")
-            path = os.path.join(data_dir, "invoices.json")
             try:
-                if os.path.exists(path):
-                    with open(path, "r", encoding="utf-8") as f:
-                        raw = json.load(f)
-                else:
-                    raw = []
+                invs = FileStore.at(data_dir).table("invoices")
             except Exception as e:
                 return {"success": False, "error": "read_error", "details": str(e)}
 
-            if isinstance(raw, list):
-                invs = raw
-            elif isinstance(raw, dict):
-                invs = list(raw.values())
-            else:
-                invs = []
-
-        for i in invs:
-            if i.get("invoice_id") == invoice_id:
-                return {"success": True, "invoice": i}
+        i = invs.get(invoice_id)
+        if i is not None:
+            return {"success": True, "invoice": i}
         return {"success": False, "error": "not_found"}
 
     @staticmethod
@@ -43,8 +33,8 @@ class FetchInvoice(Tool):
         try:
             res = FetchInvoice._invoke_internal({"invoice_id": invoice_id}, db=data)
         except Exception as e:
-            return json.dumps({"success": False, "error": "internal_error", "details": str(e)})
-        return json.dumps(res)
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -1,8 +1,10 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from datetime import datetime
 from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
 
 
 class ModifyOffboardingStatus(Tool):
@@ -16,77 +18,46 @@ class ModifyOffboardingStatus(Tool):
         ts = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
         if db is not None:
-            reqs = db.setdefault("offboarding_requests", [])
-            for r in reqs:
-                if r.get("offboarding_id") == req_id:
-                    r.update(updates)
-                    r["updated_at"] = ts
-                    db.setdefault("audit_log", []).append({"audit_id": f"audit_{req_id}", "entity_type": "offboarding_request", "entity_id": req_id, "action_performed": "updated", "timestamp": ts})
-                    return {"success": True, "offboarding_request": r}
+            store = TableStore.of(db)
+            reqs = store.table("offboarding_requests", create=list)
+            r = reqs.get(req_id)
+            if r is not None:
+                r = reqs.update(r, {**updates, "updated_at": ts})
+                store.table("audit_log", create=list).insert({"audit_id": f"audit_{req_id}", "entity_type": "offboarding_request", "entity_id": req_id, "action_performed": "updated", "timestamp": ts})
+                return {"success": True, "offboarding_request": r}
             return {"success": False, "error": "not_found"}
 
         workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
         data_dir = os.path.join(workspace_root, "data")
-        path = os.path.join(data_dir, "offboarding_requests.json")
 
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                raw = json.load(f)
-        except Exception as e:
-            return {"success": False, "error": "read_error", "details": str(e)}
+        store = FileStore.at(data_dir)
+        with store.transaction():
+            try:
+                reqs = store.table("offboarding_requests")
+            except Exception as e:
+                return {"success": False, "error": "read_error", "details": str(e)}
 
-        if isinstance(raw, list):
-            reqs = raw
-        elif isinstance(raw, dict):
-            reqs = list(raw.values())
-        else:
-            return {"success": False, "error": "bad_data"}
-
-        for r in reqs:
-            if r.get("offboarding_id") == req_id:
-                r.update(updates)
-                r["updated_at"] = ts
+            r = reqs.get(req_id)
+            if r is not None:
+                audit_entry = {"audit_id": f"audit_{req_id}", "entity_type": "offboarding_request", "entity_id": req_id, "action_performed": "updated", "timestamp": ts}
                 try:
-                    tmp = path + ".tmp"
-                    with open(tmp, "w", encoding="utf-8") as f:
-                        json.dump(reqs, f, indent=2)
-                    os.replace(tmp, path)
+                    r = reqs.update(r, {**updates, "updated_at": ts})
+                    store.table("audit_log", create=list).insert(audit_entry)
                 except Exception as e:
+                    store.abort()
                     return {"success": False, "error": "write_error", "details": str(e)}
 
-                audit_entry = {"audit_id": f"audit_{req_id}", "entity_type": "offboarding_request", "entity_id": req_id, "action_performed": "updated", "timestamp": ts}
-                try:
-                    audit_path = os.path.join(data_dir, "audit_log.json")
-                    if os.path.exists(audit_path):
-                        with open(audit_path, "r", encoding="utf-8") as f:
-                            raw_a = json.load(f)
-                    else:
-                        raw_a = []
-                    if isinstance(raw_a, list):
-                        audit = raw_a
-                    elif isinstance(raw_a, dict):
-                        audit = list(raw_a.values())
-                    else:
-                        audit = []
-                    audit.append(audit_entry)
-                    tmpa = audit_path + ".tmp"
-                    with open(tmpa, "w", encoding="utf-8") as f:
-                        json.dump(audit, f, indent=2)
-                    os.replace(tmpa, audit_path)
-                except Exception:
-                    pass
-
                 return {"success": True, "offboarding_request": r, "audit_entry": audit_entry}
 
-        return {"success": False, "error": "not_found"}
+            return {"success": False, "error": "not_found"}
 
     @staticmethod
     def invoke(data: Dict[str, Any], offboarding_id: str, updates: Dict[str, Any]) -> str:
         try:
             res = ModifyOffboardingStatus._invoke_internal({"offboarding_id": offboarding_id, "updates": updates}, db=data)
         except Exception as e:
-            return json.dumps({"success": False, "error": "internal_error", "details": str(e)})
-        return json.dumps(res)
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
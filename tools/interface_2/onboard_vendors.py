@@ -0,0 +1,93 @@
+import os
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
+
+
+class OnboardVendors(Tool):
+    @staticmethod
+    def _validate(vendor: Any) -> Optional[Dict[str, Any]]:
+        """Why `vendor` cannot be created, or None."""
+        if not isinstance(vendor, dict):
+            return {"error": "invalid_input"}
+        required = ["name", "tax_id", "bank_account_number", "bank_routing_number"]
+        missing = [k for k in required if not vendor.get(k) and vendor.get(k) != 0]
+        if missing:
+            return {"error": "missing_fields", "missing": missing}
+        return None
+
+    @staticmethod
+    def _create(store: TableStore, records: List[Any], ts: str) -> List[Dict[str, Any]]:
+        """Insert every valid record; ids follow each other in the order of `records`."""
+        errors = [OnboardVendors._validate(r) for r in records]
+        vendors = store.table("vendors", create=list)
+        audit = store.table("audit_log", create=list)
+        results = []
+        for i, (vendor, error) in enumerate(zip(records, errors)):
+            clash = vendors.conflict(vendor) if error is None else None
+            if clash:
+                error = {"error": f"duplicate_{clash}"}
+            if error is not None:
+                results.append({"index": i, "success": False, **error})
+                continue
+            vendor_id = vendors.next_id("ven")
+            vendors.insert({
+                "vendor_id": vendor_id,
+                "name": vendor.get("name"),
+                "tax_id": vendor.get("tax_id"),
+                "bank_account_number": vendor.get("bank_account_number"),
+                "bank_routing_number": vendor.get("bank_routing_number"),
+                "created_at": ts,
+                "updated_at": ts,
+            })
+            audit.insert({"audit_id": f"audit_{vendor_id}", "entity_type": "vendor", "entity_id": vendor_id, "action_performed": "vendor_created", "timestamp": ts, "user_role": "Procurement"})
+            results.append({"index": i, "success": True, "vendor_id": vendor_id})
+        return results
+
+    @staticmethod
+    def _invoke_internal(payload: Dict[str, Any], db: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        records = payload.get("data_records")
+        if records is None:
+            records = payload.get("vendors")
+        if not isinstance(records, list):
+            return {"success": False, "error": "invalid_input"}
+
+        ts = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+
+        if db is not None:
+            results = OnboardVendors._create(TableStore.of(db), records, ts)
+        else:
+            workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+            data_dir = os.path.join(workspace_root, "data")
+
+            store = FileStore.at(data_dir)
+            try:
+                with store.transaction():
+                    results = OnboardVendors._create(store, records, ts)
+            except Exception as e:
+                return {"success": False, "error": "write_error", "details": str(e)}
+
+        created = sum(r["success"] for r in results)
+        return {"success": True, "created_count": created, "failed_count": len(results) - created, "results": results}
+
+    @staticmethod
+    def invoke(data: Dict[str, Any], vendor_records: List[Dict[str, Any]]) -> str:
+        try:
+            res = OnboardVendors._invoke_internal({"data_records": vendor_records}, db=data)
+        except Exception as e:
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "onboard_vendors",
+                "description": "Create many vendor records in one call. Expects in-memory data dict and a list of vendor data records; reports success or failure per record.",
+                "parameters": {"type": "object", "properties": {"data": {"type": "dict"}, "vendor_records": {"type": "list"}}, "required": ["data", "vendor_records"]}
+            }
+        }
@@ -1,7 +1,11 @@
-import json
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from base import Tool
+from pagination import Page, fingerprint
+from persistence import FileStore
+from query import Query
+from serialization import adumps, dumps
+from table_store import TableStore
 
 
 class SearchData(Tool):
@@ -13,46 +17,106 @@ class SearchData(Tool):
         if not table:
             return {"success": False, "error": "missing_table"}
 
+        try:
+            query = Query(
+                filters,
+                fields=payload.get("fields"),
+                order_by=payload.get("order_by"),
+                descending=bool(payload.get("descending")),
+                limit=payload.get("limit"),
+                offset=payload.get("offset") or 0,
+            )
+        except (TypeError, ValueError) as e:
+            return {"success": False, "error": "invalid_query", "details": str(e)}
+
         if db is not None:
-            rows = db.get(table, [])
+            rows = TableStore.of(db).table(table)
         else:
             workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
             data_dir = os.path.join(workspace_root, "data")
-            path = os.path.join(data_dir, f"{table}")
+            name = table[:-len(".json")] if table.endswith(".json") else table
             try:
-                if os.path.exists(path):
-                    with open(path, "r", encoding="utf-8") as f:
-                        raw = json.load(f)
-                else:
-                    raw = []
+                rows = FileStore.at(data_dir).table(name)
             except Exception as e:
                 return {"success": False, "error": "read_error", "details": str(e)}
 
-            if isinstance(raw, list):
-                rows = raw
-            elif isinstance(raw, dict):
-                rows = list(raw.values())
-            else:
-                rows = []
-
-        # apply simple equality filters
-        def match(row: Dict[str, Any]) -> bool:
-            for k, v in filters.items():
-                if row.get(k) != v:
-                    return False
-            return True
-
-        results = [r for r in rows if match(r)]
+        # filters go through an index when one covers them, the rest is streamed
+        try:
+            if payload.get("count_only"):
+                return {"success": True, "count": query.count(rows)}
+            query_key = fingerprint("query_table", table, filters, *(payload.get(k) for k in ("fields", "order_by", "descending", "limit", "offset")))
+            results = Page(rows, query, payload.get("page_size"), payload.get("cursor"), query_key)
+        except TypeError as e:
+            return {"success": False, "error": "invalid_query", "details": str(e)}
+        except ValueError as e:
+            return {"success": False, "error": "invalid_pagination", "details": str(e)}
         return {"success": True, "results": results}
 
     @staticmethod
-    def invoke(data: Dict[str, Any], table: str, filters: dict | None = None) -> str:
+    def _payload(table, filters, fields, order_by, descending, limit, offset, count_only, page_size, cursor) -> Dict[str, Any]:
+        return {
+            "data": table,
+            "filters": filters or {},
+            "fields": fields,
+            "order_by": order_by,
+            "descending": descending,
+            "limit": limit,
+            "offset": offset,
+            "count_only": count_only,
+            "page_size": page_size,
+            "cursor": cursor,
+        }
+
+    @staticmethod
+    def invoke(
+        data: Dict[str, Any],
+        table: str,
+        filters: dict | None = None,
+        fields: List[str] | None = None,
+        order_by: str | List[str] | None = None,
+        descending: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+        count_only: bool = False,
+        page_size: int | None = None,
+        cursor: str | None = None,
+    ) -> str:
+        try:
+            payload = SearchData._payload(table, filters, fields, order_by, descending, limit, offset, count_only, page_size, cursor)
+            res = SearchData._invoke_internal(payload, db=data)
+            return dumps(res)
+        except TypeError as e:
+            # predicates are evaluated while the page is serialized
+            return dumps({"success": False, "error": "invalid_query", "details": str(e)})
+        except Exception as e:
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+
+    @classmethod
+    async def ainvoke(
+        cls,
+        data: Dict[str, Any],
+        table: str,
+        filters: dict | None = None,
+        fields: List[str] | None = None,
+        order_by: str | List[str] | None = None,
+        descending: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+        count_only: bool = False,
+        page_size: int | None = None,
+        cursor: str | None = None,
+    ) -> str:
+        # the scan runs while the page is encoded; adumps yields to the event loop meanwhile
+        if data is None:
+            return await super().ainvoke(data, table, filters, fields, order_by, descending, limit, offset, count_only, page_size, cursor)
         try:
-            payload = {"data": table, "filters": filters or {}}
+            payload = SearchData._payload(table, filters, fields, order_by, descending, limit, offset, count_only, page_size, cursor)
             res = SearchData._invoke_internal(payload, db=data)
+            return await adumps(res)
+        except TypeError as e:
+            return dumps({"success": False, "error": "invalid_query", "details": str(e)})
         except Exception as e:
-            return json.dumps({"success": False, "error": "internal_error", "details": str(e)})
-        return json.dumps(res)
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -60,13 +124,21 @@ class SearchData(Tool):
             "type": "function",
             "function": {
                 "name": "search_data",
-                "description": "Query an arbitrary data table by equality filters. Expects data dict, table filename, and optional filters dict.",
+                "description": "Query an arbitrary data table. Filters map a field to a value (equality) or to an object of operators: eq, ne, gt, gte, lt, lte, in, not_in, prefix, is_null. Supports projection, ordering, limit/offset and count-only queries. Expects data dict, table filename, and optional filters dict.",
                 "parameters": {
                     "type": "object",
                     "properties": {
                         "data": {"type": "dict", "description": "In-memory DB"},
                         "table": {"type": "string"},
-                        "filters": {"type": "object"}
+                        "filters": {"type": "object", "description": "e.g. {\"status\": \"open\", \"amount\": {\"gte\": 100}, \"vendor_id\": {\"in\": [\"vend_001\", \"vend_002\"]}}"},
+                        "fields": {"type": "array", "items": {"type": "string"}, "description": "Fields to return; all fields when omitted."},
+                        "order_by": {"type": ["string", "array"], "description": "Field or list of fields to sort by. Missing values sort last."},
+                        "descending": {"type": "boolean"},
+                        "limit": {"type": "integer"},
+                        "offset": {"type": "integer"},
+                        "count_only": {"type": "boolean", "description": "Return only the number of matching rows."},
+                        "page_size": {"type": "integer", "description": "Maximum rows per page; the response then carries next_cursor (null on the last page)."},
+                        "cursor": {"type": "string", "description": "next_cursor from the previous page."}
                     },
                     "required": ["data", "table"]
                 }
@@ -0,0 +1,101 @@
+import os
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
+
+
+class AddNewEmployees(Tool):
+    @staticmethod
+    def _validate(employee: Any) -> Optional[Dict[str, Any]]:
+        """Why `employee` cannot be created, or None."""
+        if not isinstance(employee, dict):
+            return {"error": "invalid_input"}
+        required = ["name", "role", "salary", "tax_id", "bank_account_number", "bank_routing_number", "department_id"]
+        missing = [k for k in required if not employee.get(k) and employee.get(k) != 0]
+        if missing:
+            return {"error": "missing_fields", "missing": missing}
+        try:
+            float(employee["salary"])
+        except Exception:
+            return {"error": "invalid_field", "details": "salary must be numeric"}
+        return None
+
+    @staticmethod
+    def _create(store: TableStore, records: List[Any], ts: str) -> List[Dict[str, Any]]:
+        """Insert every valid record; ids follow each other in the order of `records`."""
+        errors = [AddNewEmployees._validate(r) for r in records]
+        employees = store.table("employees", create=list)
+        audit = store.table("audit_log", create=list)
+        results = []
+        for i, (employee, error) in enumerate(zip(records, errors)):
+            clash = employees.conflict(employee) if error is None else None
+            if clash:
+                error = {"error": f"duplicate_{clash}"}
+            if error is not None:
+                results.append({"index": i, "success": False, **error})
+                continue
+            employee_id = employees.next_id("emp")
+            employees.insert({
+                "employee_id": employee_id,
+                "name": employee["name"],
+                "role": employee["role"],
+                "salary": float(employee["salary"]),
+                "tax_id": employee["tax_id"],
+                "bank_account_number": employee["bank_account_number"],
+                "bank_routing_number": employee["bank_routing_number"],
+                "department_id": employee["department_id"],
+                "created_at": ts,
+                "updated_at": ts,
+                "status": "active",
+            })
+            audit.insert({"audit_id": f"audit_{employee_id}", "entity_type": "employee", "entity_id": employee_id, "action_performed": "employee_created", "timestamp": ts, "user_role": "HR"})
+            results.append({"index": i, "success": True, "employee_id": employee_id})
+        return results
+
+    @staticmethod
+    def _invoke_internal(payload: Dict[str, Any], db: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        records = payload.get("data_records")
+        if records is None:
+            records = payload.get("employees")
+        if not isinstance(records, list):
+            return {"success": False, "error": "invalid_input"}
+
+        ts = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+
+        if db is not None:
+            results = AddNewEmployees._create(TableStore.of(db), records, ts)
+        else:
+            workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+            data_dir = os.path.join(workspace_root, "data")
+
+            store = FileStore.at(data_dir)
+            try:
+                with store.transaction():
+                    results = AddNewEmployees._create(store, records, ts)
+            except Exception as e:
+                return {"success": False, "error": "write_error", "details": str(e)}
+
+        created = sum(r["success"] for r in results)
+        return {"success": True, "created_count": created, "failed_count": len(results) - created, "results": results}
+
+    @staticmethod
+    def invoke(data: Dict[str, Any], employee_records: List[Dict[str, Any]]) -> str:
+        try:
+            res = AddNewEmployees._invoke_internal({"data_records": employee_records}, db=data)
+        except Exception as e:
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "add_new_employees",
+                "description": "Create many employee records in one call. Expects in-memory data dict and a list of employee data records; reports success or failure per record.",
+                "parameters": {"type": "object", "properties": {"data": {"type": "dict"}, "employee_records": {"type": "list"}}, "required": ["data", "employee_records"]}
+            }
+        }
@@ -1,8 +1,10 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from datetime import datetime
 from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
 
 
 class ChangeEmployeeDetails(Tool):
@@ -16,77 +18,52 @@ class ChangeEmployeeDetails(Tool):
         ts = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
         if db is not None:
-            emps = db.setdefault("employees", [])
-            for e in emps:
-                if e.get("employee_id") == emp_id:
-                    e.update(updates)
-                    e["updated_at"] = ts
-                    db.setdefault("audit_log", []).append({"audit_id": f"audit_{emp_id}", "entity_type": "employee", "entity_id": emp_id, "action_performed": "updated", "timestamp": ts})
-                    return {"success": True, "employee": e}
+            store = TableStore.of(db)
+            emps = store.table("employees", create=list)
+            e = emps.get(emp_id)
+            if e is not None:
+                clash = emps.conflict({**e, **updates}, exclude=e, changed=updates)
+                if clash:
+                    return {"success": False, "error": f"duplicate_{clash}"}
+                e = emps.update(e, {**updates, "updated_at": ts})
+                store.table("audit_log", create=list).insert({"audit_id": f"audit_{emp_id}", "entity_type": "employee", "entity_id": emp_id, "action_performed": "updated", "timestamp": ts})
+                return {"success": True, "employee": e}
             return {"success": False, "error": "not_found"}
 
         workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
         data_dir = os.path.join(workspace_root, "data")
-        path = os.path.join(data_dir, "employees.json")
 
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                raw = json.load(f)
-        except Exception as e:
-            return {"success": False, "error": "read_error", "details": str(e)}
+        store = FileStore.at(data_dir)
+        with store.transaction():
+            try:
+                emps = store.table("employees")
+            except Exception as e:
+                return {"success": False, "error": "read_error", "details": str(e)}
 
-        if isinstance(raw, list):
-            emps = raw
-        elif isinstance(raw, dict):
-            emps = list(raw.values())
-        else:
-            return {"success": False, "error": "bad_data"}
-
-        for e in emps:
-            if e.get("employee_id") == emp_id:
-                e.update(updates)
-                e["updated_at"] = ts
+            e = emps.get(emp_id)
+            if e is not None:
+                clash = emps.conflict({**e, **updates}, exclude=e, changed=updates)
+                if clash:
+                    return {"success": False, "error": f"duplicate_{clash}"}
+                audit_entry = {"audit_id": f"audit_{emp_id}", "entity_type": "employee", "entity_id": emp_id, "action_performed": "updated", "timestamp": ts}
                 try:
-                    tmp = path + ".tmp"
-                    with open(tmp, "w", encoding="utf-8") as f:
-                        json.dump(emps, f, indent=2)
-                    os.replace(tmp, path)
+                    e = emps.update(e, {**updates, "updated_at": ts})
+                    store.table("audit_log", create=list).insert(audit_entry)
                 except Exception as e:
+                    store.abort()
                     return {"success": False, "error": "write_error", "details": str(e)}
 
-                audit_entry = {"audit_id": f"audit_{emp_id}", "entity_type": "employee", "entity_id": emp_id, "action_performed": "updated", "timestamp": ts}
-                try:
-                    audit_path = os.path.join(data_dir, "audit_log.json")
-                    if os.path.exists(audit_path):
-                        with open(audit_path, "r", encoding="utf-8") as f:
-                            raw_a = json.load(f)
-                    else:
-                        raw_a = []
-                    if isinstance(raw_a, list):
-                        audit = raw_a
-                    elif isinstance(raw_a, dict):
-                        audit = list(raw_a.values())
-                    else:
-                        audit = []
-                    audit.append(audit_entry)
-                    tmpa = audit_path + ".tmp"
-                    with open(tmpa, "w", encoding="utf-8") as f:
-                        json.dump(audit, f, indent=2)
-                    os.replace(tmpa, audit_path)
-                except Exception:
-                    pass
-
                 return {"success": True, "employee": e, "audit_entry": audit_entry}
 
-        return {"success": False, "error": "not_found"}
+            return {"success": False, "error": "not_found"}
 
     @staticmethod
     def invoke(data: Dict[str, Any], employee_id: str, updates: Dict[str, Any]) -> str:
         try:
             res = ChangeEmployeeDetails._invoke_internal({"employee_id": employee_id, "updates": updates}, db=data)
         except Exception as e:
-            return json.dumps({"success": False, "error": "internal_error", "details": str(e)})
-        return json.dumps(res)
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -1,7 +1,9 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
 
 
 class FindDisputeById(Tool):
@@ -12,30 +14,18 @@ class FindDisputeById(Tool):
             return {"success": False, "error": "missing_dispute_id"}
 
         if db is not None:
-            disputes = db.get("disputes", [])
+            disputes = TableStore.of(db).table("disputes")
         else:
             workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
             data_dir = os.path.join(workspace_root, "data")
-            path = os.path.join(data_dir, "disputes.json")
             try:
-                if os.path.exists(path):
-                    with open(path, "r", encoding="utf-8") as f:
-                        raw = json.load(f)
-                else:
-                    raw = []
+                disputes = FileStore.at(data_dir).table("disputes")
             except Exception as e:
                 return {"success": False, "error": "read_error", "details": str(e)}
 
-            if isinstance(raw, list):
-                disputes = raw
-            elif isinstance(raw, dict):
-                disputes = list(raw.values())
-            else:
-                disputes = []
-
-        for d in disputes:
-            if d.get("dispute_id") == dispute_id:
-                return {"success": True, "dispute": d}
+        d = disputes.get(dispute_id)
+        if d is not None:
+            return {"success": True, "dispute": d}
         return {"success": False, "error": "not_found"}
 
     @staticmethod
@@ -43,8 +33,8 @@ class FindDisputeById(Tool):
         try:
             res = FindDisputeById._invoke_internal({"dispute_id": dispute_id}, db=data)
         except Exception as e:
-            return json.dumps({"success": False, "error": "internal_error", "details": str(e)})
-        return json.dumps(res)
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -1,7 +1,9 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
 
 
 class FindVendorById(Tool):
@@ -12,30 +14,18 @@ class FindVendorById(Tool):
             return {"success": False, "error": "missing_vendor_id"}
 
         if db is not None:
-            vendors = db.get("vendors", [])
+            vendors = TableStore.of(db).table("vendors")
         else:
             workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
             data_dir = os.path.join(workspace_root, "data")
-            path = os.path.join(data_dir, "vendors.json")
             try:
-                if os.path.exists(path):
-                    with open(path, "r", encoding="utf-8") as f:
-                        raw = json.load(f)
-                else:
-                    raw = []
+                vendors = FileStore.at(data_dir).table("vendors")
             except Exception as e:
                 return {"success": False, "error": "read_error", "details": str(e)}
 
-            if isinstance(raw, list):
-                vendors = raw
-            elif isinstance(raw, dict):
-                vendors = list(raw.values())
-            else:
-                vendors = []
-
-        for v in vendors:
-            if v.get("vendor_id") == vendor_id:
-                return {"success": True, "vendor": v}
+        v = vendors.get(vendor_id)
+        if v is not None:
+            return {"success": True, "vendor": v}
         return {"success": False, "error": "not_found"}
 
     @staticmethod
@@ -46,8 +36,8 @@ class FindVendorById(Tool):
         try:
             res = FindVendorById._invoke_internal({"vendor_id": vendor_id}, db=data)
         except Exception as e:
-            return json.dumps({"success": False, "error": "internal_error", "details": str(e)})
-        return json.dumps(res)
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
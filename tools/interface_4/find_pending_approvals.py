@@ -1,22 +1,28 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from base import Tool
+from pagination import Page, fingerprint
+from query import Query
+from serialization import dumps
+from table_store import TableStore
 
 
-class FindPendingApprovals:
+class FindPendingApprovals(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], approver_id: str) -> str:
+    def invoke(data: Dict[str, Any], approver_id: str, page_size: Optional[int] = None, cursor: Optional[str] = None) -> str:
         """
-        Retrieves a list of all approval requests that are still pending.
+        Retrieves a list of all approval requests that are still pending,
+        one page at a time when page_size or cursor is given.
         """
-        approvals = data.get("approvals", {})
-        pending_requests = []
-        for approval_id, record in approvals.items():
-            if record.get("approver_id") == approver_id and record.get("decision") is None:
-                pending_requests.append(record)
-        
-        return json.dumps({"success": True, "pending_approvals": pending_requests})
+        approvals = TableStore.of(data).table("approvals")
+        pending_requests = Query({"approver_id": approver_id, "decision": None})
+
+        try:
+            page = Page(approvals, pending_requests, page_size, cursor, fingerprint("get_pending_approvals", approver_id))
+        except ValueError:
+            return dumps({"success": False, "error": "Invalid Pagination"})
+
+        return dumps({"success": True, "pending_approvals": page})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -35,6 +41,14 @@ class FindPendingApprovals:
                         "approver_id": {
                             "type": "string",
                             "description": "The ID of the approver whose pending requests are to be retrieved."
+                        },
+                        "page_size": {
+                            "type": "integer",
+                            "description": "Maximum number of requests to return. When set, the response carries a next_cursor for the following page (null on the last page)."
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "The next_cursor returned by the previous page."
                         }
                     },
                     "required": ["data", "approver_id"]
@@ -1,6 +1,7 @@
-import json
 from typing import Any, Dict
 from base import Tool
+from serialization import dumps
+from table_store import TableStore
 
 class LookupApprovalRequest(Tool):
     @staticmethod
@@ -8,12 +9,12 @@ class LookupApprovalRequest(Tool):
         """
         Retrieves a single approval request record by its unique ID.
         """
-        approvals = data.get("approvals", {})
+        approvals = TableStore.of(data).table("approvals")
         approval_record = approvals.get(approval_id)
         if approval_record:
-            return json.dumps({"success": True, "approval_request": approval_record})
+            return dumps({"success": True, "approval_request": approval_record})
         else:
-            return json.dumps({"success": False, "error": f"Approval request with ID {approval_id} not found."})
+            return dumps({"success": False, "error": f"Approval request with ID {approval_id} not found."})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -1,7 +1,9 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
 
 
 class LookupEmployeePay(Tool):
@@ -12,30 +14,18 @@ class LookupEmployeePay(Tool):
             return {"success": False, "error": "missing_pay_id"}
 
         if db is not None:
-            pays = db.get("employee_pays", [])
+            pays = TableStore.of(db).table("employee_pays")
         else:
             workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
             data_dir = os.path.join(workspace_root, "data")
-            path = os.path.join(data_dir, "employee_pays.json")
             try:
-                if os.path.exists(path):
-                    with open(path, "r", encoding="utf-8") as f:
-                        raw = json.load(f)
-                else:
-                    raw = []
+                pays = FileStore.at(data_dir).table("employee_pays")
             except Exception as e:
                 return {"success": False, "error": "read_error", "details": str(e)}
 
-            if isinstance(raw, list):
-                pays = raw
-            elif isinstance(raw, dict):
-                pays = list(raw.values())
-            else:
-                pays = []
-
-        for p in pays:
-            if p.get("pay_id") == pay_id:
-                return {"success": True, "pay": p}
+        p = pays.get(pay_id)
+        if p is not None:
+            return {"success": True, "pay": p}
         return {"success": False, "error": "not_found"}
 
     @staticmethod
@@ -43,8 +33,8 @@ class LookupEmployeePay(Tool):
         try:
             res = LookupEmployeePay._invoke_internal({"pay_id": pay_id}, db=data)
         except Exception as e:
-            return json.dumps({"success": False, "error": "internal_error", "details": str(e)})
-        return json.dumps(res)
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
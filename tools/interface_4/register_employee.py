@@ -1,24 +1,16 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from datetime import datetime
 from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import Table, TableStore
 
 
 class RegisterEmployee(Tool):
     @staticmethod
-    def _generate_employee_id(employees: list[dict]) -> str:
-        max_n = 0
-        for e in employees:
-            eid = e.get("employee_id", "")
-            if isinstance(eid, str) and eid.startswith("emp_"):
-                try:
-                    n = int(eid.split("emp_")[-1])
-                    if n > max_n:
-                        max_n = n
-                except Exception:
-                    continue
-        return f"emp_{(max_n + 1):03d}"
+    def _generate_employee_id(employees: Table) -> str:
+        return employees.next_id("emp")
 
     @staticmethod
     def _invoke_internal(payload: Dict[str, Any], db: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -40,10 +32,11 @@ class RegisterEmployee(Tool):
         ts = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
         if db is not None:
-            employees = db.setdefault("employees", [])
-            for emp in employees:
-                if emp.get("tax_id") == employee.get("tax_id"):
-                    return {"success": False, "error": "duplicate_tax_id"}
+            store = TableStore.of(db)
+            employees = store.table("employees", create=list)
+            clash = employees.conflict(employee)
+            if clash:
+                return {"success": False, "error": f"duplicate_{clash}"}
             employee_id = RegisterEmployee._generate_employee_id(employees)
             new_emp = {
                 "employee_id": employee_id,
@@ -58,8 +51,8 @@ class RegisterEmployee(Tool):
                 "updated_at": ts,
                 "status": "active",
             }
-            employees.append(new_emp)
-            db.setdefault("audit_log", []).append({
+            employees.insert(new_emp)
+            store.table("audit_log", create=list).insert({
                 "audit_id": f"audit_{employee_id}",
                 "entity_type": "employee",
                 "entity_id": employee_id,
@@ -71,91 +64,57 @@ class RegisterEmployee(Tool):
 
         workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
         data_dir = os.path.join(workspace_root, "data")
-        path = os.path.join(data_dir, "employees.json")
 
-        try:
-            if os.path.exists(path):
-                with open(path, "r", encoding="utf-8") as f:
-                    raw = json.load(f)
-            else:
-                raw = []
-        except Exception as e:
-            return {"success": False, "error": "read_error", "details": str(e)}
-
-        if isinstance(raw, list):
-            employees = raw
-        elif isinstance(raw, dict):
-            employees = list(raw.values())
-        else:
-            employees = []
-
-        for emp in employees:
-            if emp.get("tax_id") == employee.get("tax_id"):
-                return {"success": False, "error": "duplicate_tax_id"}
+        store = FileStore.at(data_dir)
+        with store.transaction():
+            try:
+                employees = store.table("employees", create=list)
+            except Exception as e:
+                return {"success": False, "error": "read_error", "details": str(e)}
 
-        employee_id = RegisterEmployee._generate_employee_id(employees)
-        new_emp = {
-            "employee_id": employee_id,
-            "name": employee["name"],
-            "role": employee["role"],
-            "salary": employee["salary"],
-            "tax_id": employee["tax_id"],
-            "bank_account_number": employee["bank_account_number"],
-            "bank_routing_number": employee["bank_routing_number"],
-            "department_id": employee["department_id"],
-            "created_at": ts,
-            "updated_at": ts,
-            "status": "active",
-        }
+            clash = employees.conflict(employee)
+            if clash:
+                return {"success": False, "error": f"duplicate_{clash}"}
 
-        try:
-            employees.append(new_emp)
-            tmp = path + ".tmp"
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(employees, f, indent=2)
-            os.replace(tmp, path)
-        except Exception as e:
-            return {"success": False, "error": "write_error", "details": str(e)}
+            employee_id = RegisterEmployee._generate_employee_id(employees)
+            new_emp = {
+                "employee_id": employee_id,
+                "name": employee["name"],
+                "role": employee["role"],
+                "salary": employee["salary"],
+                "tax_id": employee["tax_id"],
+                "bank_account_number": employee["bank_account_number"],
+                "bank_routing_number": employee["bank_routing_number"],
+                "department_id": employee["department_id"],
+                "created_at": ts,
+                "updated_at": ts,
+                "status": "active",
+            }
 
-        audit_entry = {
-            "audit_id": f"audit_{employee_id}",
-            "entity_type": "employee",
-            "entity_id": employee_id,
-            "action_performed": "employee_created",
-            "timestamp": ts,
-            "user_role": "HR",
-        }
-        try:
-            audit_path = os.path.join(data_dir, "audit_log.json")
-            if os.path.exists(audit_path):
-                with open(audit_path, "r", encoding="utf-8") as f:
-                    raw_a = json.load(f)
-            else:
-                raw_a = []
-            if isinstance(raw_a, list):
-                audit = raw_a
-            elif isinstance(raw_a, dict):
-                audit = list(raw_a.values())
-            else:
-                audit = []
-            audit.append(audit_entry)
-            tmpa = audit_path + ".tmp"
-            with open(tmpa, "w", encoding="utf-8") as f:
-                json.dump(audit, f, indent=2)
-            os.replace(tmpa, audit_path)
-        except Exception:
-            pass
+            audit_entry = {
+                "audit_id": f"audit_{employee_id}",
+                "entity_type": "employee",
+                "entity_id": employee_id,
+                "action_performed": "employee_created",
+                "timestamp": ts,
+                "user_role": "HR",
+            }
+            try:
+                employees.insert(new_emp)
+                store.table("audit_log", create=list).insert(audit_entry)
+            except Exception as e:
+                store.abort()
+                return {"success": False, "error": "write_error", "details": str(e)}
 
-        return {"success": True, "employee": new_emp, "audit_entry": audit_entry}
+            return {"success": True, "employee": new_emp, "audit_entry": audit_entry}
 
     @staticmethod
     def invoke(data: Dict[str, Any], employee_record: Dict[str, Any]) -> str:
         try:
             res = RegisterEmployee._invoke_internal({"data": employee_record}, db=data)
         except Exception as e:
-            return json.dumps({"success": False, "error": "internal_error", "details": str(e)})
-        return json.dumps(res)
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
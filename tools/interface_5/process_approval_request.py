@@ -1,32 +1,34 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from datetime import datetime, timezone
 from base import Tool
+from serialization import dumps
+from table_store import TableStore
 
 
-class ProcessApprovalRequest:
+class ProcessApprovalRequest(Tool):
     @staticmethod
     def invoke(data: Dict[str, Any], approval_id: str, decision: str, comments: Optional[str], performed_by: str) -> str:
         """
         Submits a decision for a pending approval request.
         """
-        approvals = data.get("approvals", {})
-        
-        if approval_id not in approvals:
-            return json.dumps({"success": False, "error": "Request Not Found"})
+        approvals = TableStore.of(data).table("approvals")
+        record = approvals.get(approval_id)
+
+        if record is None:
+            return dumps({"success": False, "error": "Request Not Found"})
             
         allowed_decisions = ["approved", "rejected", "escalated"]
         if decision not in allowed_decisions:
-            return json.dumps({"success": False, "error": "Invalid Decision"})
+            return dumps({"success": False, "error": "Invalid Decision"})
             
-        record = approvals[approval_id]
-        
-        record["decision"] = decision
-        record["comments"] = comments
-        record["updated_at"] = datetime.now(timezone.utc).isoformat()
+        record = approvals.update(record, {
+            "decision": decision,
+            "comments": comments,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        })
         
-        return json.dumps({"success": True, "updated_record": record})
+        return dumps({"success": True, "updated_record": record})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -1,7 +1,9 @@
-import json
 import os
 from typing import Any, Dict, Optional
 from base import Tool
+from persistence import FileStore
+from serialization import dumps
+from table_store import TableStore
 
 
 class ReadOrderRecord(Tool):
@@ -12,30 +14,18 @@ class ReadOrderRecord(Tool):
             return {"success": False, "error": "missing_order_id"}
 
         if db is not None:
-            orders = db.get("orders", [])
+            orders = TableStore.of(db).table("orders")
         else:
             workspace_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
             data_dir = os.path.join(workspace_root, "data")
-            path = os.path.join(data_dir, "orders.json")
             try:
-                if os.path.exists(path):
-                    with open(path, "r", encoding="utf-8") as f:
-                        raw = json.load(f)
-                else:
-                    raw = []
+                orders = FileStore.at(data_dir).table("orders")
             except Exception as e:
                 return {"success": False, "error": "read_error", "details": str(e)}
 
-            if isinstance(raw, list):
-                orders = raw
-            elif isinstance(raw, dict):
-                orders = list(raw.values())
-            else:
-                orders = []
-
-        for o in orders:
-            if o.get("order_id") == order_id:
-                return {"success": True, "order": o}
+        o = orders.get(order_id)
+        if o is not None:
+            return {"success": True, "order": o}
         return {"success": False, "error": "not_found"}
 
     @staticmethod
@@ -43,8 +33,8 @@ class ReadOrderRecord(Tool):
         try:
             res = ReadOrderRecord._invoke_internal({"order_id": order_id}, db=data)
         except Exception as e:
-            return json.dumps({"success": False, "error": "internal_error", "details": str(e)})
-        return json.dumps(res)
+            return dumps({"success": False, "error": "internal_error", "details": str(e)})
+        return dumps(res)
 
     @staticmethod
     def get_info() -> Dict[str, Any]: